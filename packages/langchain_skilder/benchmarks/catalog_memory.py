@@ -0,0 +1,159 @@
+"""Benchmark: RSS of large tool catalogs shared by many clients.
+
+Simulates `clients` MCPClient instances connected to the same skill exposing
+`tools` tools, each calling `get_langchain_tools()` `calls` times. Every
+`list_tools` response is a freshly parsed catalog, as it would be over stdio.
+
+Two modes are measured, each in its own subprocess so RSS is not polluted:
+- naive: one fresh `MCPTool` (with its own schema copy) per tool per call,
+  which is how `get_langchain_tools()` behaved before catalog interning.
+- interned: the real `MCPClient` code path (shared entries and tool reuse).
+
+Usage:
+    python benchmarks/catalog_memory.py [--tools 1000] [--clients 100] [--calls 3]
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+import argparse
+import asyncio
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+
+from langchain_skilder.loadtest import stub_server_parameters
+from langchain_skilder.mcp_only import MCPClient, MCPTool
+
+DISTINCT_SCHEMAS = 50
+
+
+def _rss_bytes() -> int:
+    """Current resident set size (Linux /proc, falls back to peak RSS)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _schema(i: int) -> dict:
+    return {
+        "type": "object",
+        "properties": {
+            f"field_{j}": {"type": "string", "description": f"Field {j} of schema family {i}"}
+            for j in range(8)
+        },
+        "required": ["field_0"],
+    }
+
+
+def _list_tools_result(tool_count: int) -> SimpleNamespace:
+    """A freshly "parsed" catalog: new dicts and strings on every call."""
+    templates = [json.dumps(_schema(i)) for i in range(DISTINCT_SCHEMAS)]
+    return SimpleNamespace(tools=[
+        SimpleNamespace(
+            name=f"tool_{i}",
+            description="".join(["Performs operation ", str(i % 100), " on the remote service and returns a report."]),
+            inputSchema=json.loads(templates[i % DISTINCT_SCHEMAS]),
+            annotations=None,
+            meta=None,
+        )
+        for i in range(tool_count)
+    ])
+
+
+def _bench_client() -> MCPClient:
+    # No installed runtime needed: the interned mode patches the session and
+    # the naive mode never starts one
+    return MCPClient.with_skill_key(skill_key="SKL_bench", server_params=stub_server_parameters())
+
+
+async def _run_interned(args) -> list:
+    session = AsyncMock()
+    session.initialize = AsyncMock()
+    session.list_tools = AsyncMock(side_effect=lambda *a, **k: _list_tools_result(args.tools))
+    stdio_ctx = AsyncMock()
+    stdio_ctx.__aenter__.return_value = (AsyncMock(), AsyncMock())
+    client_ctx = AsyncMock()
+    client_ctx.__aenter__.return_value = session
+    held = []
+    with patch("langchain_skilder.mcp_only.stdio_client", return_value=stdio_ctx), \
+         patch("langchain_skilder.mcp_only.ClientSession", return_value=client_ctx):
+        clients = [_bench_client() for _ in range(args.clients)]
+        for client in clients:
+            for _ in range(args.calls):
+                # Simulate a catalog refresh between calls
+                client._catalog_stale = True
+                held.append(await client.get_langchain_tools())
+        for client in clients:
+            await client.stop()
+    return held
+
+
+async def _run_naive(args) -> list:
+    held = []
+    for _ in range(args.clients):
+        client = _bench_client()
+        for _ in range(args.calls):
+            result = _list_tools_result(args.tools)
+            held.append([
+                MCPTool(name=t.name, description=t.description, input_schema=t.inputSchema, mcp_instance=client)
+                for t in result.tools
+            ])
+    return held
+
+
+def _measure(mode: str, args) -> dict:
+    gc.collect()
+    before = _rss_bytes()
+    started = time.perf_counter()
+    runner = _run_interned if mode == "interned" else _run_naive
+    held = asyncio.run(runner(args))
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    after = _rss_bytes()
+    distinct_objects = len({id(tool) for tools in held for tool in tools})
+    return {
+        "mode": mode,
+        "tools": args.tools,
+        "clients": args.clients,
+        "calls": args.calls,
+        "rss_delta_mb": round((after - before) / 1024 / 1024, 1),
+        "tool_objects": distinct_objects,
+        "seconds": round(elapsed, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tools", type=int, default=1000)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--calls", type=int, default=3)
+    parser.add_argument("--mode", choices=["naive", "interned"])
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(_measure(args.mode, args)))
+        return
+
+    results = []
+    for mode in ("naive", "interned"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--mode", mode,
+             "--tools", str(args.tools), "--clients", str(args.clients), "--calls", str(args.calls)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(output))
+    for result in results:
+        print(f"{result['mode']:>9}: {result['rss_delta_mb']:>8} MB RSS, "
+              f"{result['tool_objects']:>7} tool objects, {result['seconds']}s")
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,24 @@
 from .mcp import MCPSkill
 from .mcp_only import MCPClient
+from .budget import ContinuationTool, ResultBudget
+from .catalog import CatalogDiff
+from .coalescing import CallCoalescer
+from .tool_index import ToolIndex
+from .tool_node import SkilderToolNode
+from .tracing import CallTracer, ToolCallSpan, trace_context
+from .errors import RuntimeNotFoundError, SkilderDrainingError, SkilderRateLimitError, SkilderRuntimeError
+from .daemon import DaemonConnector, RuntimeDaemon
+from .heartbeat import Heartbeat
+from .nats_transport import NatsTransport
+from .profiling import CallProfiler
+from .runtime import RuntimeLocator, install_runtime
+from .replay import ReplayTransport, SessionRecorder
+from .ratelimit import RateLimitConfig, RateLimiter, TokenBucket
+from .retry import RetryBudget, RetryPolicy
+from .scheduling import CallScheduler, LaneConfig
+from .stderr import StderrCapture
+from .streaming import EarlyToolDispatcher
+from .startup import StartupProbe, StartupTrace
 
 __version__ = "0.1.0"
-__all__ = ["MCPSkill", "MCPClient"]
+__all__ = ["MCPSkill", "MCPClient", "CatalogDiff", "ToolIndex", "SkilderToolNode", "EarlyToolDispatcher", "ResultBudget", "ContinuationTool", "SkilderRuntimeError", "SkilderDrainingError", "SkilderRateLimitError", "RuntimeNotFoundError", "RuntimeLocator", "install_runtime", "ReplayTransport", "SessionRecorder", "NatsTransport", "RuntimeDaemon", "DaemonConnector", "RateLimiter", "RateLimitConfig", "TokenBucket", "RetryPolicy", "RetryBudget", "CallScheduler", "LaneConfig", "Heartbeat", "CallProfiler", "CallCoalescer", "StderrCapture", "StartupProbe", "StartupTrace", "CallTracer", "ToolCallSpan", "trace_context"]
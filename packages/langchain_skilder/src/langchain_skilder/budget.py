@@ -0,0 +1,209 @@
+"""Budgeted tool results with continuation handles.
+
+Tools such as file reads or search dumps can return hundreds of kilobytes.
+Handed to the model whole, such a result inflates the context of every
+following turn: more latency and more tokens for text the agent rarely
+needs in full.
+
+`ResultBudget` caps the text a tool call hands to the model, per tool, in
+characters or estimated tokens. The overflow is kept client-side and the
+truncated result ends with a continuation handle; the companion tool
+`skilder_read_more` (`ContinuationTool`, added to the client's LangChain
+tools) returns the next chunk of a handle, so the agent pulls more only when
+it needs it.
+
+Handles name a position in a held result (`"<id>:<offset>"`): reading one
+twice returns the same chunk, so retried or coalesced calls stay consistent.
+Held results are bounded in number (least recently read first out) and
+expire after `ttl_seconds`.
+"""
+
+from typing import Callable, Dict, Optional, Tuple, Type, TypedDict
+from collections import OrderedDict
+import secrets
+import time
+
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel, Field
+
+CONTINUATION_TOOL_NAME = "skilder_read_more"
+
+
+class ResultBudgetConfig(TypedDict, total=False):
+    """Size limit of one tool's results (the smaller limit wins).
+
+    - max_chars: Characters handed to the model per result or chunk
+    - max_tokens: Estimated tokens per result or chunk (see `chars_per_token`)
+    """
+    max_chars: int
+    max_tokens: int
+
+
+class _HeldResult:
+    __slots__ = ("tool_name", "text", "limit", "expires_at")
+
+    def __init__(self, tool_name: str, text: str, limit: int, expires_at: float):
+        self.tool_name = tool_name
+        self.text = text
+        self.limit = limit
+        self.expires_at = expires_at
+
+
+class ResultBudget:
+    """Per-tool result budgets applied to the text returned to the model."""
+
+    def __init__(
+        self,
+        max_chars: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        tools: Optional[Dict[str, ResultBudgetConfig]] = None,
+        chars_per_token: float = 4.0,
+        max_held_results: int = 100,
+        ttl_seconds: float = 1800.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Configure the budgets.
+
+        Args:
+            max_chars: Default limit in characters for every tool
+            max_tokens: Default limit in estimated tokens for every tool
+            tools: Limits by tool name, replacing the default (`{}` disables
+                the budget for that tool)
+            chars_per_token: Characters per token used to estimate tokens
+            max_held_results: Overflowing results kept for continuation;
+                the least recently read are dropped first
+            ttl_seconds: How long a held result can be continued
+            clock: Monotonic clock (for tests)
+
+        Raises:
+            ValueError: If a limit is not positive
+        """
+        if chars_per_token <= 0 or max_held_results < 1:
+            raise ValueError("chars_per_token and max_held_results must be positive")
+        self.chars_per_token = chars_per_token
+        self.max_held_results = max_held_results
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._default = self._chars({"max_chars": max_chars, "max_tokens": max_tokens})  # type: ignore[typeddict-item]
+        self._tools = {name: self._chars(config) for name, config in (tools or {}).items()}
+        self._held: "OrderedDict[str, _HeldResult]" = OrderedDict()
+        self.truncated = 0
+        self.continued = 0
+        self.expired = 0
+
+    def _chars(self, config: ResultBudgetConfig) -> Optional[int]:
+        limits = []
+        if config.get("max_chars") is not None:
+            limits.append(int(config["max_chars"]))
+        if config.get("max_tokens") is not None:
+            limits.append(int(config["max_tokens"] * self.chars_per_token))
+        if any(limit <= 0 for limit in limits):
+            raise ValueError(f"Result budget {dict(config)} must be positive")
+        return min(limits) if limits else None
+
+    def limit(self, tool_name: str) -> Optional[int]:
+        """Characters handed to the model per result of `tool_name` (None: unlimited)."""
+        return self._tools[tool_name] if tool_name in self._tools else self._default
+
+    def shape(self, tool_name: str, text: str) -> str:
+        """Return `text` within the budget of `tool_name`, holding the overflow.
+
+        Text over the limit is cut (at a line break when one is close) and
+        followed by a note with the continuation handle.
+        """
+        limit = self.limit(tool_name)
+        if limit is None or len(text) <= limit:
+            return text
+        self._expire()
+        result_id = secrets.token_hex(6)
+        self._held[result_id] = _HeldResult(tool_name, text, limit, self._clock() + self.ttl_seconds)
+        while len(self._held) > self.max_held_results:
+            self._held.popitem(last=False)
+        self.truncated += 1
+        return self._chunk(result_id, self._held[result_id], 0)
+
+    def read(self, handle: str) -> str:
+        """Return the chunk of a held result at `handle`.
+
+        Raises:
+            KeyError: If the handle is malformed, unknown or expired
+        """
+        result_id, _, offset = handle.strip().partition(":")
+        self._expire()
+        held = self._held.get(result_id)
+        if held is None or not offset.isdigit() or int(offset) >= len(held.text):
+            raise KeyError(handle)
+        self._held.move_to_end(result_id)
+        self.continued += 1
+        return self._chunk(result_id, held, int(offset))
+
+    def continuation(self, handle: object) -> Tuple[str, bool]:
+        """Answer a `skilder_read_more` call as `(content, is_error)`."""
+        if not isinstance(handle, str):
+            return f"Error: {CONTINUATION_TOOL_NAME} requires a string 'handle'", True
+        try:
+            return self.read(handle), False
+        except KeyError:
+            return f"Error: continuation handle {handle!r} is unknown or expired; call the original tool again", True
+
+    def _chunk(self, result_id: str, held: _HeldResult, start: int) -> str:
+        end = self._cut(held.text, start, held.limit)
+        chunk = held.text[start:end]
+        total = len(held.text)
+        if end >= total:
+            return chunk
+        return (
+            f"{chunk.rstrip(chr(10))}\n\n[Result truncated: characters {start + 1}-{end} of {total} shown. "
+            f"Call {CONTINUATION_TOOL_NAME} with handle \"{result_id}:{end}\" for the next part.]"
+        )
+
+    @staticmethod
+    def _cut(text: str, start: int, limit: int) -> int:
+        end = start + limit
+        if end >= len(text):
+            return len(text)
+        # Prefer ending on a line break in the last quarter of the chunk
+        newline = text.rfind("\n", start + (limit * 3) // 4, end)
+        return newline + 1 if newline >= 0 else end
+
+    def _expire(self) -> None:
+        now = self._clock()
+        for result_id in [key for key, held in self._held.items() if held.expires_at <= now]:
+            del self._held[result_id]
+            self.expired += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return the truncation counters and the held results."""
+        return {
+            "truncated": self.truncated,
+            "continued": self.continued,
+            "expired": self.expired,
+            "held": len(self._held),
+            "held_chars": sum(len(held.text) for held in self._held.values()),
+        }
+
+
+class _ContinuationInput(BaseModel):
+    handle: str = Field(description="Continuation handle from a truncated tool result")
+
+
+class ContinuationTool(BaseTool):
+    """Companion tool returning the next chunk of a truncated tool result."""
+
+    name: str = CONTINUATION_TOOL_NAME
+    description: str = (
+        "Read the next part of a truncated tool result. Pass the handle given at the "
+        "end of the truncated result; only call it when the rest is needed."
+    )
+    args_schema: Type[BaseModel] = _ContinuationInput
+    budget: ResultBudget
+
+    def __init__(self, budget: ResultBudget, **kwargs: object):
+        super().__init__(budget=budget, **kwargs)
+
+    def _run(self, handle: str) -> str:
+        return self.budget.continuation(handle)[0]
+
+    async def _arun(self, handle: str) -> str:
+        return self._run(handle)
+
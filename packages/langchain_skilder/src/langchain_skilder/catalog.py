@@ -0,0 +1,308 @@
+"""Interned, shared representation of MCP tool catalogs.
+
+Every `list_tools` response is parsed into fresh objects: each tool carries
+its own `inputSchema` dict and description string, and every client holds its
+own copy of the same skill's catalog. With many clients and large skills this
+adds up to a lot of identical data.
+
+This module keeps one canonical copy of each distinct piece of metadata:
+- `CatalogEntry`: a compact, slotted view of one tool (name, description,
+  input schema, annotations, meta). Identical tools resolve to the same entry
+  across refreshes and across clients.
+- Schemas, annotations and meta dicts are deduplicated by content hash, so two
+  tools with the same schema share one dict.
+- Names and descriptions are interned strings.
+
+Interned values are shared: treat `CatalogEntry` attributes as read-only.
+Entries and schemas are held weakly and are released once no client
+references them anymore.
+
+Because an entry's signature hashes all of its metadata, two catalogs are
+compared by name and signature alone (`diff_catalogs`): a refresh yields the
+tools that were added, removed or changed without walking any schema.
+
+`CatalogLoad` walks a paginated `tools/list` (following `nextCursor`) in a
+background task: consumers can use each page as soon as it arrives, while
+the full catalog is assembled for the client cache.
+"""
+
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import sys
+import weakref
+
+
+class _SharedDict(dict):
+    """`dict` subclass that supports weak references (plain dicts do not)."""
+
+    __slots__ = ("__weakref__",)
+
+
+_shared_dicts: "weakref.WeakValueDictionary[str, _SharedDict]" = weakref.WeakValueDictionary()
+_shared_entries: "weakref.WeakValueDictionary[str, CatalogEntry]" = weakref.WeakValueDictionary()
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _intern_dict(value: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], str]:
+    """Return the shared copy of `value` together with its content hash."""
+    key = _digest(_canonical(value or {}))
+    shared = _shared_dicts.get(key)
+    if shared is None:
+        shared = _SharedDict(value or {})
+        _shared_dicts[key] = shared
+    return shared, key
+
+
+def intern_schema(schema: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Return the shared copy of a JSON schema (deduplicated by content)."""
+    return _intern_dict(schema)[0]
+
+
+def _intern_text(text: Optional[str]) -> str:
+    return sys.intern(text) if text else ""
+
+
+def _as_dict(value: Any) -> Optional[Dict[str, Any]]:
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        return value
+    model_dump = getattr(value, "model_dump", None)
+    if model_dump is not None:
+        return model_dump(exclude_none=True, by_alias=True)
+    return dict(value)
+
+
+class CatalogEntry:
+    """Compact, shared metadata for one MCP tool.
+
+    Exposes the same attribute names as `mcp.types.Tool` (`name`,
+    `description`, `inputSchema`, `annotations`, `meta`) so it can be used
+    wherever a tool descriptor is expected (e.g. `ToolIndex`). `annotations`
+    and `meta` are plain dicts (or None).
+    """
+
+    __slots__ = ("name", "description", "inputSchema", "annotations", "meta", "signature", "__weakref__")
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        input_schema: Dict[str, Any],
+        annotations: Optional[Dict[str, Any]],
+        meta: Optional[Dict[str, Any]],
+        signature: str,
+    ):
+        self.name = name
+        self.description = description
+        self.inputSchema = input_schema
+        self.annotations = annotations
+        self.meta = meta
+        self.signature = signature
+
+    def __repr__(self) -> str:
+        return f"CatalogEntry(name={self.name!r}, signature={self.signature[:8]!r})"
+
+
+def intern_tool(tool: Any) -> CatalogEntry:
+    """Return the shared `CatalogEntry` for an MCP tool descriptor.
+
+    Accepts `mcp.types.Tool` or any object with `name`, `description` and
+    `inputSchema` attributes.
+    """
+    schema, schema_key = _intern_dict(getattr(tool, "inputSchema", None))
+    annotations_value = _as_dict(getattr(tool, "annotations", None))
+    meta_value = _as_dict(getattr(tool, "meta", None))
+    annotations, annotations_key = _intern_dict(annotations_value) if annotations_value else (None, "")
+    meta, meta_key = _intern_dict(meta_value) if meta_value else (None, "")
+    name = _intern_text(tool.name)
+    description = _intern_text(getattr(tool, "description", None))
+    signature = _digest("\x00".join((name, description, schema_key, annotations_key, meta_key)))
+
+    entry = _shared_entries.get(signature)
+    if entry is None:
+        entry = CatalogEntry(name, description, schema, annotations, meta, signature)
+        _shared_entries[signature] = entry
+    return entry
+
+
+def intern_catalog(tools: Iterable[Any]) -> List[CatalogEntry]:
+    """Intern every tool of a `list_tools` result, preserving order."""
+    return [intern_tool(tool) for tool in tools]
+
+
+class CatalogDiff:
+    """Delta between two catalog snapshots, compared by name and signature.
+
+    `added` and `changed` hold the new entries, `removed` the entries that
+    went away; each list keeps catalog order. A diff is falsy when the two
+    snapshots are identical.
+    """
+
+    __slots__ = ("added", "removed", "changed")
+
+    def __init__(
+        self,
+        added: Optional[List[CatalogEntry]] = None,
+        removed: Optional[List[CatalogEntry]] = None,
+        changed: Optional[List[CatalogEntry]] = None,
+    ):
+        self.added = added or []
+        self.removed = removed or []
+        self.changed = changed or []
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        """Return the `added`, `removed` and `changed` tool names."""
+        return {
+            "added": [entry.name for entry in self.added],
+            "removed": [entry.name for entry in self.removed],
+            "changed": [entry.name for entry in self.changed],
+        }
+
+    def __repr__(self) -> str:
+        return f"CatalogDiff({self.to_dict()!r})"
+
+
+def diff_catalogs(old: Iterable[CatalogEntry], new: Iterable[CatalogEntry]) -> CatalogDiff:
+    """Compare two catalog snapshots by tool name and signature.
+
+    Args:
+        old: Previous catalog (empty on the first listing)
+        new: Refreshed catalog
+
+    Returns:
+        `CatalogDiff` of the tools added, removed and changed in `new`
+    """
+    previous = {entry.name: entry for entry in old}
+    diff = CatalogDiff()
+    for entry in new:
+        before = previous.pop(entry.name, None)
+        if before is None:
+            diff.added.append(entry)
+        elif before.signature != entry.signature:
+            diff.changed.append(entry)
+    diff.removed.extend(previous.values())
+    return diff
+
+
+class CatalogLoad:
+    """One paginated `tools/list` walk, shared by everyone waiting for the catalog.
+
+    The walk runs in its own task, so a consumer that stops iterating (or is
+    cancelled) does not interrupt it. Pages are interned as they arrive.
+
+    Args:
+        fetch_page: Coroutine function returning one `ListToolsResult` (or
+            any object with `tools` and `nextCursor`) for a cursor, None for
+            the first page
+        on_complete: Called with the full catalog before waiters are woken
+            (e.g. to install it in a cache)
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[Optional[str]], Awaitable[Any]],
+        on_complete: Optional[Callable[[List[CatalogEntry]], None]] = None,
+    ):
+        self._fetch_page = fetch_page
+        self._on_complete = on_complete
+        self.pages: List[List[CatalogEntry]] = []
+        self.error: Optional[BaseException] = None
+        self.catalog: Optional[List[CatalogEntry]] = None
+        self._progress = asyncio.Event()
+        self._done = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def start(self) -> "CatalogLoad":
+        """Start the walk in a background task (idempotent)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    def cancel(self) -> None:
+        """Stop the walk; waiters fail with `RuntimeError`."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    async def _run(self) -> None:
+        cursor: Optional[str] = None
+        seen = set()
+        try:
+            while True:
+                result = await self._fetch_page(cursor)
+                self.pages.append(intern_catalog(result.tools))
+                self._signal()
+                cursor = getattr(result, "nextCursor", None)
+                if not cursor:
+                    break
+                if cursor in seen:
+                    raise RuntimeError(f"tools/list returned the cursor {cursor!r} twice")
+                seen.add(cursor)
+            catalog = [entry for page in self.pages for entry in page]
+            if self._on_complete is not None:
+                self._on_complete(catalog)
+            self.catalog = catalog
+        except asyncio.CancelledError:
+            self.error = RuntimeError("The tool catalog load was interrupted")
+            raise
+        except Exception as error:
+            # Reported to the consumers, not to the event loop
+            self.error = error
+        finally:
+            self._done.set()
+            self._signal()
+
+    def _signal(self) -> None:
+        progress, self._progress = self._progress, asyncio.Event()
+        progress.set()
+
+    async def iter_pages(self) -> AsyncIterator[List[CatalogEntry]]:
+        """Yield every page (already received ones first) as it arrives.
+
+        Raises:
+            Exception: The failure of the walk, after the pages received before it
+        """
+        index = 0
+        while True:
+            progress = self._progress
+            while index < len(self.pages):
+                yield self.pages[index]
+                index += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await progress.wait()
+
+    async def result(self) -> List[CatalogEntry]:
+        """Wait for the full catalog.
+
+        Raises:
+            Exception: The failure of the walk
+        """
+        await self._done.wait()
+        if self.error is not None:
+            raise self.error
+        assert self.catalog is not None
+        return self.catalog
+
+
+def shared_catalog_stats() -> Dict[str, int]:
+    """Return the number of live shared entries and dicts (for diagnostics)."""
+    return {"entries": len(_shared_entries), "dicts": len(_shared_dicts)}
@@ -0,0 +1,145 @@
+"""Single-flight coalescing of identical concurrent tool calls.
+
+Parallel agents often issue the same call within milliseconds of each other
+(several sub-agents listing the same directory, reading the same file...).
+Without coalescing each of them is a separate round trip through the runtime.
+
+A `CallCoalescer` attached to `MCPClient` keys every eligible call by tool
+name and canonical arguments (JSON with sorted keys). While a call for a key
+is in flight, identical callers attach to it instead of sending a duplicate
+request, and all of them get its outcome (result or exception).
+
+Only calls that are safe to share are coalesced:
+- `"read_only"` (default): tools annotated `readOnlyHint`;
+- `"idempotent"`: tools annotated `readOnlyHint` or `idempotentHint`;
+- `"all"`: every tool, whatever its annotations.
+`tools` and `never_tools` override the annotations by tool name. Calls are
+shared while in flight only: a later identical call sends a new request.
+
+The shared request runs in its own task: a cancelled caller leaves the
+others waiting, and the request is cancelled with its last caller.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
+import asyncio
+import json
+
+COALESCE_MODES = ("read_only", "idempotent", "all")
+
+T = TypeVar("T")
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[Any]"):
+        self.task = task
+        self.waiters = 0
+
+
+class CallCoalescer:
+    """Share one in-flight request between identical concurrent tool calls."""
+
+    def __init__(
+        self,
+        mode: str = "read_only",
+        tools: Iterable[str] = (),
+        never_tools: Iterable[str] = (),
+    ):
+        """Configure which calls are coalesced.
+
+        Args:
+            mode: "read_only", "idempotent" or "all" (see module docstring)
+            tools: Tool names coalesced whatever their annotations
+            never_tools: Tool names never coalesced
+
+        Raises:
+            ValueError: If `mode` is unknown
+        """
+        if mode not in COALESCE_MODES:
+            raise ValueError(f"Unknown coalesce mode '{mode}'; expected one of {list(COALESCE_MODES)}")
+        self.mode = mode
+        self.tools = frozenset(tools)
+        self.never_tools = frozenset(never_tools)
+        self._flights: Dict[str, _Flight] = {}
+        # Tool name -> [requests sent, calls answered by another caller's request]
+        self._counts: Dict[str, List[int]] = {}
+
+    def coalesces(self, tool_name: str, annotations: Optional[Dict[str, Any]]) -> bool:
+        """True when identical calls of `tool_name` may share one request."""
+        if tool_name in self.never_tools:
+            return False
+        if tool_name in self.tools or self.mode == "all":
+            return True
+        annotations = annotations or {}
+        if self.mode == "idempotent" and annotations.get("idempotentHint"):
+            return True
+        return bool(annotations.get("readOnlyHint"))
+
+    @staticmethod
+    def key(tool_name: str, arguments: Dict[str, Any]) -> Optional[str]:
+        """Canonical key of a call, or None when its arguments are not JSON."""
+        try:
+            return tool_name + "\n" + json.dumps(arguments, sort_keys=True, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return None
+
+    async def run(self, tool_name: str, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        """Await the in-flight request for `key`, starting it with `call()` if none.
+
+        Args:
+            tool_name: Tool name, for the per-tool counters
+            key: Key of the call (see `key`)
+            call: Sends the request; only invoked by the first caller
+        """
+        counts = self._counts.setdefault(tool_name, [0, 0])
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(call()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _task: self._landed(key, flight))
+            counts[0] += 1
+        else:
+            counts[1] += 1
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller gave up: nobody needs the response
+                flight.task.cancel()
+
+    def _landed(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.task.cancelled():
+            flight.task.exception()  # retrieved: raised to the waiters, if any
+
+    def reset(self) -> None:
+        """Forget the requests of a previous event loop (e.g. in a forked child)."""
+        self._flights = {}
+
+    def stats(self) -> Dict[str, Any]:
+        """Requests sent, calls coalesced and coalesce ratio, overall and per tool.
+
+        The ratio is the share of eligible calls answered by another caller's
+        request.
+        """
+        def ratio(sent: int, coalesced: int) -> float:
+            total = sent + coalesced
+            return coalesced / total if total else 0.0
+
+        sent = sum(counts[0] for counts in self._counts.values())
+        coalesced = sum(counts[1] for counts in self._counts.values())
+        return {
+            "mode": self.mode,
+            "in_flight": len(self._flights),
+            "sent": sent,
+            "coalesced": coalesced,
+            "ratio": ratio(sent, coalesced),
+            "tools": {
+                name: {"sent": counts[0], "coalesced": counts[1], "ratio": ratio(counts[0], counts[1])}
+                for name, counts in self._counts.items()
+            },
+        }
@@ -0,0 +1,547 @@
+"""Host-local runtime daemon shared by worker processes over a Unix socket.
+
+Pre-forked servers (gunicorn, Celery) run many Python workers per host; with
+one runtime child per `MCPClient` per worker, a host carries dozens of Node
+processes and NATS connections. With `MCPClient(daemon=True)`, workers
+instead connect to one `RuntimeDaemon` per host, which owns a single runtime
+per distinct configuration (command, arguments and environment, so per skill
+key) and multiplexes the sessions of every worker onto it: the runtime count
+goes from O(workers) to O(skills).
+
+Protocol: the worker sends one JSON line describing the runtime it wants
+(`StdioServerParameters`), the daemon answers `{"ok": true}` once the runtime
+session is initialized (or `{"error": ..., "stderr": [...]}`), then the
+connection carries newline-delimited MCP JSON-RPC, like stdio:
+
+- `initialize` is answered from the shared session's initialize result;
+- other requests are forwarded on the shared session (the daemon assigns
+  its own request ids) and their responses routed back;
+- server notifications (`tools/list_changed`, `resources/updated`...) are
+  sent to every worker of that runtime.
+
+When a runtime exits, its worker connections are closed; each worker's
+`MCPClient` then reconnects and the daemon spawns a fresh runtime. Runtimes
+without workers are stopped after `idle_timeout_seconds`.
+
+`DaemonConnector` is the worker side. It starts the daemon
+(`python -m langchain_skilder.daemon`) when no daemon listens on the socket,
+under a file lock so concurrent workers start only one. The socket lives in a
+directory only the current user can access, since the handshake carries the
+runtime environment (keys): both sides refuse to bind or connect when the
+directory is a symlink, belongs to another user or is open to group or others
+(e.g. a `/tmp/skilder-<uid>` created first by someone else).
+"""
+
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple, Union
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+
+import anyio
+import mcp.types as types
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.shared.exceptions import McpError
+from mcp.shared.message import SessionMessage
+
+from .errors import SkilderRuntimeError
+from .stderr import StderrCapture
+
+logger = logging.getLogger(__name__)
+
+DAEMON_SOCKET_ENV = "SKILDER_DAEMON_SOCKET"
+PROTOCOL_VERSION = 1
+# Stream reader limit: a JSON-RPC line can carry a large tool result
+_LINE_LIMIT = 64 * 1024 * 1024
+
+
+def default_socket_path() -> str:
+    """Daemon socket: `SKILDER_DAEMON_SOCKET`, else a per-user runtime directory."""
+    override = os.environ.get(DAEMON_SOCKET_ENV)
+    if override:
+        return override
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        directory = os.path.join(runtime_dir, "skilder")
+    else:
+        directory = os.path.join(tempfile.gettempdir(), f"skilder-{os.getuid()}")
+    return os.path.join(directory, "runtime.sock")
+
+
+def _private_dir(socket_path: str) -> None:
+    """Create the socket directory and check that only the current user controls it.
+
+    Raises:
+        PermissionError: If the directory is a symlink, is owned by another
+            user or grants any access to group or others
+    """
+    directory = os.path.dirname(os.path.abspath(socket_path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    if stat.S_ISLNK(info.st_mode) or not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"Daemon socket directory {directory} is not a plain directory")
+    if info.st_uid != os.getuid():
+        raise PermissionError(f"Daemon socket directory {directory} is owned by uid {info.st_uid}, not {os.getuid()}")
+    if info.st_mode & 0o077:
+        raise PermissionError(
+            f"Daemon socket directory {directory} is accessible to other users "
+            f"(mode {oct(stat.S_IMODE(info.st_mode))}); it must be 0700"
+        )
+
+
+def _hello(params: StdioServerParameters) -> Dict[str, Any]:
+    return {
+        "version": PROTOCOL_VERSION,
+        "command": params.command,
+        "args": list(params.args),
+        "env": dict(params.env or {}),
+        "cwd": str(params.cwd) if params.cwd is not None else None,
+    }
+
+
+def _runtime_key(hello: Dict[str, Any]) -> str:
+    identity = {key: hello.get(key) for key in ("command", "args", "env", "cwd")}
+    return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+
+
+def _line(message: Union[types.JSONRPCMessage, Dict[str, Any]]) -> bytes:
+    if isinstance(message, types.JSONRPCMessage):
+        return (message.model_dump_json(by_alias=True, exclude_none=True) + "\n").encode()
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+
+class _Connection:
+    """A worker session attached to a shared runtime."""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.tasks: Dict[Any, asyncio.Task] = {}
+        self._write_lock = asyncio.Lock()
+
+    async def send(self, message: Union[types.JSONRPCMessage, Dict[str, Any]]) -> None:
+        async with self._write_lock:
+            self.writer.write(_line(message))
+            await self.writer.drain()
+
+    def close(self) -> None:
+        for task in self.tasks.values():
+            task.cancel()
+        self.writer.close()
+
+
+class _SharedRuntime:
+    """One runtime process and its MCP session, shared by worker connections."""
+
+    def __init__(self, key: str, params: StdioServerParameters, startup_timeout_seconds: float):
+        self.key = key
+        self.params = params
+        self.startup_timeout_seconds = startup_timeout_seconds
+        self.connections: Set[_Connection] = set()
+        self.stderr = StderrCapture()
+        self.session: Optional[ClientSession] = None
+        self.init_result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.ready = asyncio.Event()
+        self.closed = asyncio.Event()
+        self.idle_since: Optional[float] = time.monotonic()
+        self.task: Optional[asyncio.Task] = None
+
+    async def run(self) -> None:
+        errlog = self.stderr.open()
+        try:
+            async with stdio_client(self.params, errlog=errlog) as (read, write):
+                self.stderr.attached()
+                relay_write, relay_read = anyio.create_memory_object_stream[Union[SessionMessage, Exception]](0)
+
+                async def relay() -> None:
+                    # The runtime exited when its output ends
+                    async with relay_write:
+                        async for item in read:
+                            await relay_write.send(item)
+                    self.closed.set()
+
+                async with anyio.create_task_group() as group:
+                    group.start_soon(relay)
+                    async with ClientSession(relay_read, write, message_handler=self._broadcast) as session:
+                        with anyio.fail_after(self.startup_timeout_seconds):
+                            result = await session.initialize()
+                        self.init_result = result.model_dump(by_alias=True, mode="json", exclude_none=True)
+                        self.session = session
+                        self.ready.set()
+                        await self.closed.wait()
+                    group.cancel_scope.cancel()
+        except Exception as error:
+            # Unwrap task group errors down to the actual failure
+            while len(getattr(error, "exceptions", ())) == 1:
+                error = error.exceptions[0]  # type: ignore[attr-defined]
+            self.error = f"{type(error).__name__}: {error}" if str(error) else type(error).__name__
+            logger.warning("Runtime %s failed: %s", self.key[:12], self.error)
+        finally:
+            self.stderr.attached()
+            self.session = None
+            self.closed.set()
+            self.ready.set()
+            for connection in list(self.connections):
+                connection.close()
+
+    async def _broadcast(self, message: Any) -> None:
+        if not isinstance(message, types.ServerNotification):
+            return
+        notification = {"jsonrpc": "2.0", **message.root.model_dump(by_alias=True, mode="json", exclude_none=True)}
+        for connection in list(self.connections):
+            with contextlib.suppress(Exception):
+                await connection.send(notification)
+
+    async def forward(self, connection: _Connection, request: types.JSONRPCRequest) -> None:
+        """Run a worker request on the shared session and send back the answer."""
+        try:
+            if request.method == "initialize":
+                result: Dict[str, Any] = dict(self.init_result or {})
+            else:
+                session = self.session
+                if session is None:
+                    raise McpError(types.ErrorData(code=types.CONNECTION_CLOSED, message="Runtime exited"))
+                outgoing = types.ClientRequest.model_validate({"method": request.method, "params": request.params})
+                response = await session.send_request(outgoing, types.EmptyResult)
+                result = response.model_dump(by_alias=True, mode="json", exclude_none=True)
+        except McpError as error:
+            answer: Dict[str, Any] = {
+                "jsonrpc": "2.0", "id": request.id,
+                "error": error.error.model_dump(by_alias=True, mode="json", exclude_none=True),
+            }
+        except Exception as error:
+            answer = {
+                "jsonrpc": "2.0", "id": request.id,
+                "error": {"code": types.INTERNAL_ERROR, "message": str(error) or type(error).__name__},
+            }
+        else:
+            answer = {"jsonrpc": "2.0", "id": request.id, "result": result}
+        finally:
+            connection.tasks.pop(request.id, None)
+        with contextlib.suppress(Exception):
+            await connection.send(answer)
+
+
+class RuntimeDaemon:
+    """Serve shared runtime sessions to local worker processes."""
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        idle_timeout_seconds: float = 300.0,
+        exit_when_idle_seconds: Optional[float] = None,
+        startup_timeout_seconds: float = 60.0,
+    ):
+        """Configure the daemon.
+
+        Args:
+            socket_path: Unix socket to listen on. Defaults to `default_socket_path()`.
+            idle_timeout_seconds: Stop a runtime once it has had no worker for this long
+            exit_when_idle_seconds: Stop the daemon once it has had no runtime
+                for this long (None: run until stopped)
+            startup_timeout_seconds: Max time to initialize a runtime session
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.exit_when_idle_seconds = exit_when_idle_seconds
+        self.startup_timeout_seconds = startup_timeout_seconds
+        self._runtimes: Dict[str, _SharedRuntime] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._stopped = asyncio.Event()
+        self._idle_since = time.monotonic()
+
+    async def start(self) -> None:
+        """Listen on the socket, replacing a stale socket file.
+
+        Raises:
+            RuntimeError: If another daemon already listens on the socket
+            PermissionError: If the socket directory is not private to the user
+        """
+        _private_dir(self.socket_path)
+        if os.path.exists(self.socket_path):
+            try:
+                _, writer = await asyncio.open_unix_connection(self.socket_path)
+            except OSError:
+                os.unlink(self.socket_path)
+            else:
+                writer.close()
+                raise RuntimeError(f"A runtime daemon already listens on {self.socket_path}")
+        self._server = await asyncio.start_unix_server(self._handle, path=self.socket_path, limit=_LINE_LIMIT)
+        os.chmod(self.socket_path, 0o600)
+        logger.info("Runtime daemon listening on %s", self.socket_path)
+
+    async def serve(self) -> None:
+        """Start and serve until `stop()` (or idle exit)."""
+        if self._server is None:
+            await self.start()
+        try:
+            while not self._stopped.is_set():
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._stopped.wait(), timeout=min(1.0, self.idle_timeout_seconds))
+                self._reap()
+        finally:
+            await self.stop()
+
+    def _reap(self) -> None:
+        """Stop idle runtimes, and the daemon itself when idle for long enough."""
+        now = time.monotonic()
+        for runtime in list(self._runtimes.values()):
+            if runtime.idle_since is not None and now - runtime.idle_since >= self.idle_timeout_seconds:
+                logger.info("Stopping idle runtime %s", runtime.key[:12])
+                runtime.closed.set()
+                self._runtimes.pop(runtime.key, None)
+        if self._runtimes:
+            self._idle_since = now
+        elif self.exit_when_idle_seconds is not None and now - self._idle_since >= self.exit_when_idle_seconds:
+            self._stopped.set()
+
+    async def stop(self) -> None:
+        """Close the socket, the worker connections and every runtime."""
+        self._stopped.set()
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            with contextlib.suppress(OSError):
+                os.unlink(self.socket_path)
+        runtimes = list(self._runtimes.values())
+        self._runtimes.clear()
+        for runtime in runtimes:
+            runtime.closed.set()
+        tasks = [runtime.task for runtime in runtimes if runtime.task is not None]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Runtimes and worker connections currently served."""
+        return {
+            "socket": self.socket_path,
+            "pid": os.getpid(),
+            "runtimes": [
+                {"key": runtime.key[:12], "connections": len(runtime.connections), "ready": runtime.session is not None}
+                for runtime in self._runtimes.values()
+            ],
+        }
+
+    async def _runtime(self, hello: Dict[str, Any]) -> _SharedRuntime:
+        key = _runtime_key(hello)
+        runtime = self._runtimes.get(key)
+        if runtime is None or runtime.closed.is_set():
+            params = StdioServerParameters(
+                command=hello["command"], args=hello.get("args") or [], env=hello.get("env") or None, cwd=hello.get("cwd"),
+            )
+            runtime = _SharedRuntime(key, params, self.startup_timeout_seconds)
+            self._runtimes[key] = runtime
+            runtime.task = asyncio.create_task(runtime.run())
+
+            def forget(_: asyncio.Task, runtime: _SharedRuntime = runtime) -> None:
+                if self._runtimes.get(runtime.key) is runtime:
+                    del self._runtimes[runtime.key]
+
+            runtime.task.add_done_callback(forget)
+        runtime.idle_since = None  # claimed before awaiting, so it is not reaped
+        return runtime
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection = _Connection(writer)
+        runtime: Optional[_SharedRuntime] = None
+        try:
+            hello = json.loads(await reader.readline() or b"{}")
+            if hello.get("op") == "stats":
+                await connection.send(self.stats())
+                return
+            if hello.get("version") != PROTOCOL_VERSION or not hello.get("command"):
+                await connection.send({"error": f"Unsupported handshake (daemon protocol {PROTOCOL_VERSION})"})
+                return
+            runtime = await self._runtime(hello)
+            runtime.connections.add(connection)
+            await runtime.ready.wait()
+            if runtime.session is None:
+                await connection.send({"error": runtime.error or "Runtime exited", "stderr": runtime.stderr.tail(20)})
+                return
+            await connection.send({"ok": True})
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                message = types.JSONRPCMessage.model_validate_json(line).root
+                if isinstance(message, types.JSONRPCRequest):
+                    connection.tasks[message.id] = asyncio.create_task(runtime.forward(connection, message))
+                elif isinstance(message, types.JSONRPCNotification) and message.method == "notifications/cancelled":
+                    task = connection.tasks.get((message.params or {}).get("requestId"))
+                    if task is not None:
+                        task.cancel()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError) as error:
+            logger.debug("Worker connection closed: %s", error)
+        finally:
+            connection.close()
+            if runtime is not None:
+                runtime.connections.discard(connection)
+                if not runtime.connections:
+                    runtime.idle_since = time.monotonic()
+
+
+class DaemonConnector:
+    """Connect `MCPClient` sessions to the host's runtime daemon, starting it if needed."""
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        auto_start: bool = True,
+        start_timeout_seconds: float = 10.0,
+        exit_when_idle_seconds: float = 600.0,
+    ):
+        """Configure the connector.
+
+        Args:
+            socket_path: Daemon socket. Defaults to `default_socket_path()`.
+            auto_start: Start a daemon when none listens on the socket
+            start_timeout_seconds: Max time to wait for a started daemon
+            exit_when_idle_seconds: Idle lifetime of an auto-started daemon
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.auto_start = auto_start
+        self.start_timeout_seconds = start_timeout_seconds
+        self.exit_when_idle_seconds = exit_when_idle_seconds
+
+    async def _open(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        # The hello carries the runtime environment: never to a socket another user controls
+        _private_dir(self.socket_path)
+        try:
+            return await asyncio.open_unix_connection(self.socket_path, limit=_LINE_LIMIT)
+        except OSError:
+            if not self.auto_start:
+                raise SkilderRuntimeError(f"No runtime daemon listens on {self.socket_path}") from None
+        await asyncio.to_thread(self._spawn_daemon)
+        return await asyncio.open_unix_connection(self.socket_path, limit=_LINE_LIMIT)
+
+    def _spawn_daemon(self) -> None:
+        """Start a daemon unless another worker did; returns once it accepts connections."""
+        import fcntl  # Unix only, like the daemon itself
+
+        _private_dir(self.socket_path)
+        with open(self.socket_path + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if self._accepts():
+                return
+            with open(self.socket_path + ".log", "ab") as log:
+                subprocess.Popen(
+                    [
+                        sys.executable, "-m", "langchain_skilder.daemon",
+                        "--socket", self.socket_path,
+                        "--exit-when-idle", str(self.exit_when_idle_seconds),
+                    ],
+                    stdin=subprocess.DEVNULL, stdout=log, stderr=log,
+                    start_new_session=True, close_fds=True,
+                )
+            deadline = time.monotonic() + self.start_timeout_seconds
+            while not self._accepts():
+                if time.monotonic() > deadline:
+                    raise SkilderRuntimeError(
+                        f"Runtime daemon did not start on {self.socket_path} (see {self.socket_path}.log)"
+                    )
+                time.sleep(0.05)
+
+    def _accepts(self) -> bool:
+        import socket
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(self.socket_path)
+            except OSError:
+                return False
+        return True
+
+    async def stats(self) -> Dict[str, Any]:
+        """Stats of the running daemon (see `RuntimeDaemon.stats()`)."""
+        reader, writer = await asyncio.open_unix_connection(self.socket_path)
+        try:
+            writer.write(_line({"op": "stats"}))
+            await writer.drain()
+            return json.loads(await reader.readline())
+        finally:
+            writer.close()
+
+    @contextlib.asynccontextmanager
+    async def connect(self, params: StdioServerParameters) -> AsyncIterator[Tuple[Any, Any]]:
+        """Open MCP session streams on the daemon's runtime for `params`.
+
+        Raises:
+            SkilderRuntimeError: If the daemon cannot start the runtime
+        """
+        reader, writer = await self._open()
+        try:
+            writer.write(_line(_hello(params)))
+            await writer.drain()
+            reply = json.loads(await reader.readline() or b"{}")
+            if not reply.get("ok"):
+                raise SkilderRuntimeError(
+                    f"Runtime daemon could not start the runtime: {reply.get('error', 'connection closed')}",
+                    reply.get("stderr"),
+                )
+            read_writer, read_stream = anyio.create_memory_object_stream[Union[SessionMessage, Exception]](0)
+            write_stream, write_reader = anyio.create_memory_object_stream[SessionMessage](0)
+
+            async def pump_incoming() -> None:
+                async with read_writer:
+                    while True:
+                        line = await reader.readline()
+                        if not line:
+                            # Runtime or daemon gone: `MCPClient` marks the session
+                            # lost, and closing the stream fails pending requests
+                            await read_writer.send(SkilderRuntimeError("Runtime daemon closed the session"))
+                            return
+                        try:
+                            message = types.JSONRPCMessage.model_validate_json(line)
+                        except ValueError as error:
+                            await read_writer.send(error)
+                            continue
+                        await read_writer.send(SessionMessage(message))
+
+            async def pump_outgoing() -> None:
+                async with write_reader:
+                    async for item in write_reader:
+                        writer.write(_line(item.message))
+                        await writer.drain()
+
+            async with anyio.create_task_group() as group:
+                group.start_soon(pump_incoming)
+                group.start_soon(pump_outgoing)
+                try:
+                    yield read_stream, write_stream
+                finally:
+                    group.cancel_scope.cancel()
+        finally:
+            writer.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Host-local Skilder runtime daemon")
+    parser.add_argument("--socket", default=None, help=f"Unix socket path (default: ${DAEMON_SOCKET_ENV} or per-user)")
+    parser.add_argument("--idle-timeout", type=float, default=300.0, help="Stop runtimes unused for this long (s)")
+    parser.add_argument("--exit-when-idle", type=float, default=None, help="Exit once no runtime ran for this long (s)")
+    parser.add_argument("--status", action="store_true", help="Print the stats of the running daemon and exit")
+    options = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    if options.status:
+        print(json.dumps(asyncio.run(DaemonConnector(options.socket, auto_start=False).stats()), indent=2))
+        return
+    daemon = RuntimeDaemon(options.socket, options.idle_timeout, options.exit_when_idle)
+    try:
+        asyncio.run(daemon.serve())
+    except RuntimeError as error:
+        # Lost a start race: the other daemon serves the socket
+        logger.info("%s", error)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Exceptions raised by langchain_skilder clients."""
+
+from typing import List, Optional
+
+
+class SkilderRuntimeError(RuntimeError):
+    """The runtime process failed to start, timed out or exited unexpectedly.
+
+    `stderr_tail` holds the last lines the runtime wrote to stderr (when
+    captured), which usually explain the failure (bad key, NATS unreachable...).
+    They are also appended to the message.
+    """
+
+    def __init__(self, message: str, stderr_tail: Optional[List[str]] = None):
+        self.stderr_tail: List[str] = list(stderr_tail or [])
+        if self.stderr_tail:
+            message = (
+                f"{message}\n--- runtime stderr (last {len(self.stderr_tail)} lines) ---\n"
+                + "\n".join(self.stderr_tail)
+            )
+        super().__init__(message)
+
+
+class SkilderDrainingError(SkilderRuntimeError):
+    """The client is shutting down (draining) and did not run the call.
+
+    Raised for calls made after `stop()` began draining, and for in-flight
+    calls abandoned when the drain deadline expired. Callers may retry on
+    another client instance.
+    """
+
+
+class SkilderRateLimitError(SkilderRuntimeError):
+    """A tool call exceeded a client-side rate limit and was not sent.
+
+    `retry_after_seconds` tells when a token becomes available.
+    """
+
+    def __init__(self, message: str, retry_after_seconds: float = 0.0):
+        super().__init__(message)
+        self.retry_after_seconds = retry_after_seconds
+
+
+class RuntimeNotFoundError(SkilderRuntimeError):
+    """The runtime entry point (or Node.js) could not be found.
+
+    Raised when the client is created, not when the runtime is spawned.
+    """
@@ -0,0 +1,99 @@
+"""Fork safety of clients created or started before `os.fork()`.
+
+Pre-fork servers (gunicorn, uWSGI) and `multiprocessing` pools with the
+`fork` start method copy the parent's memory into each child, including
+started `MCPClient` / `MCPSkill` objects: the pipes of the parent's runtime,
+its runner task and its asyncio locks. Used from several processes, calls
+would interleave on one runtime or deadlock on a lock held at fork time.
+
+Every client registers here. In the child, an `os.register_at_fork` hook
+resets each client's session state, so its next call lazily starts a session
+owned by the child; the parent's runtime is left to the parent. Clients also
+compare their pid on `start()`, covering forks that bypass the hooks.
+
+The child also holds copies of the parent's runtime stdio pipes. Left open,
+they keep the runtime's stdin from reaching end-of-file when the parent stops
+it, so the parent waits out the SDK's termination timeout before killing the
+runtime. A client records the pipe descriptors of the runtime it spawns
+(`pipe_fds()`), and the child points them at
+`/dev/null` (`release_fds()`): the pipes are released while the descriptor
+numbers stay taken by the stale transport objects that still refer to them.
+
+What survives the fork is what stays valid: the configuration and the tool
+catalog of `MCPClient`, so a child skips the `tools/list` round trip of its
+first session (a change notified to the parent after the fork is missed until
+the child's catalog is refreshed, e.g. with `refresh_tools()`).
+"""
+
+from typing import Any, Iterable, Tuple
+import inspect
+import os
+import threading
+import weakref
+
+_clients: "weakref.WeakSet[Any]" = weakref.WeakSet()
+_registered = False
+_register_lock = threading.Lock()
+
+
+def pipe_fds(stdio: Any) -> Tuple[int, ...]:
+    """Return the descriptors of the runtime's stdin and stdout pipes.
+
+    The SDK does not expose the process it spawned: it is read from the
+    suspended `stdio_client` generator, and its pipes from the asyncio
+    backend of anyio. Anything else (another SDK version or backend, a test
+    double) yields no descriptors, leaving the parent's stop to the SDK's
+    termination timeout.
+
+    Args:
+        stdio: The entered `stdio_client(...)` context of the runtime
+    """
+    generator = getattr(stdio, "gen", None)
+    if not inspect.isasyncgen(generator) or generator.ag_frame is None:
+        return ()
+    try:
+        transport = generator.ag_frame.f_locals["process"]._transport
+        fds = []
+        for number in (0, 1):
+            pipe = transport.get_pipe_transport(number)
+            fds.append(pipe.get_extra_info("pipe").fileno())
+    except Exception:
+        return ()
+    return tuple(fd for fd in fds if isinstance(fd, int))
+
+
+def release_fds(fds: Iterable[int]) -> None:
+    """Point inherited pipe descriptors at `/dev/null`, releasing the pipes."""
+    fds = tuple(fds)
+    if not fds:
+        return
+    devnull = os.open(os.devnull, os.O_RDWR)
+    try:
+        for fd in fds:
+            try:
+                os.dup2(devnull, fd, inheritable=False)
+            except OSError:
+                pass
+    finally:
+        os.close(devnull)
+
+
+def track(client: Any) -> None:
+    """Reset `client` in forked children by calling its `_after_fork()`."""
+    global _registered
+    with _register_lock:
+        if not _registered and hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=_after_fork_in_child)
+            _registered = True
+        _clients.add(client)
+
+
+def _after_fork_in_child() -> None:
+    global _register_lock
+    _register_lock = threading.Lock()  # may have been held by another thread at fork time
+    for client in list(_clients):
+        try:
+            client._after_fork()
+        except Exception:
+            # Never break the fork; the pid check in `start()` retries it
+            pass
@@ -0,0 +1,86 @@
+"""Liveness heartbeat of an MCP session.
+
+A runtime wedged without exiting (e.g. on a stuck NATS connection) looks
+healthy until a real tool call hangs. With a `Heartbeat`, `MCPClient` sends
+MCP `ping` requests every `interval_seconds` and:
+
+- tracks the round-trip latency as an exponentially weighted moving average
+  (`latency_seconds`), so routers can prefer fast sessions;
+- marks the session unhealthy after `max_misses` consecutive pings failed or
+  took longer than `timeout_seconds`;
+- with `recycle=True`, replaces an unhealthy session with a new runtime
+  before user traffic reaches it.
+
+A `Heartbeat` holds the state of one client; do not share it between clients.
+"""
+
+from typing import Any, Dict, Optional
+
+
+class Heartbeat:
+    """Ping schedule and liveness state of a session."""
+
+    def __init__(
+        self,
+        interval_seconds: float = 15.0,
+        timeout_seconds: float = 5.0,
+        max_misses: int = 3,
+        alpha: float = 0.2,
+        recycle: bool = True,
+    ):
+        """Configure the heartbeat.
+
+        Args:
+            interval_seconds: Delay between pings
+            timeout_seconds: A ping slower than this counts as missed
+            max_misses: Consecutive misses marking the session unhealthy
+            alpha: EWMA weight of the latest latency sample (0-1]
+            recycle: Restart the runtime once the session is unhealthy
+
+        Raises:
+            ValueError: If a setting is out of range
+        """
+        if interval_seconds <= 0 or timeout_seconds <= 0 or max_misses < 1 or not 0 < alpha <= 1:
+            raise ValueError("Heartbeat intervals must be positive, max_misses >= 1 and 0 < alpha <= 1")
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.max_misses = max_misses
+        self.alpha = alpha
+        self.recycle = recycle
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the state of the previous session."""
+        self.latency_seconds: Optional[float] = None
+        self.last_latency_seconds: Optional[float] = None
+        self.misses = 0
+        self.healthy = True
+        self.pings = 0
+
+    def record_success(self, latency_seconds: float) -> None:
+        self.pings += 1
+        self.misses = 0
+        self.healthy = True
+        self.last_latency_seconds = latency_seconds
+        if self.latency_seconds is None:
+            self.latency_seconds = latency_seconds
+        else:
+            self.latency_seconds += self.alpha * (latency_seconds - self.latency_seconds)
+
+    def record_miss(self) -> bool:
+        """Count a missed ping; True when it just made the session unhealthy."""
+        self.pings += 1
+        self.misses += 1
+        if self.healthy and self.misses >= self.max_misses:
+            self.healthy = False
+            return True
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "healthy": self.healthy,
+            "latency_seconds": self.latency_seconds,
+            "last_latency_seconds": self.last_latency_seconds,
+            "misses": self.misses,
+            "pings": self.pings,
+        }
@@ -0,0 +1,8 @@
+"""Load testing tools for `MCPClient`.
+
+Run `python -m langchain_skilder.loadtest --help` for the command line.
+"""
+
+from .runner import LoadTestConfig, format_report, parse_script, percentiles, run_load_test, stub_server_parameters
+
+__all__ = ["LoadTestConfig", "format_report", "parse_script", "percentiles", "run_load_test", "stub_server_parameters"]
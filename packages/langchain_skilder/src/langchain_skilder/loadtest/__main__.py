@@ -0,0 +1,130 @@
+"""Command line entry point: `python -m langchain_skilder.loadtest`.
+
+Examples:
+    # 20 agents against the bundled stub server, 5 ms simulated tool latency
+    python -m langchain_skilder.loadtest --agents 20 --iterations 50 --stub-latency-ms 5
+
+    # Real runtime, credentials from SKILL_KEY, JSON report for tracking
+    python -m langchain_skilder.loadtest --target runtime --agents 4 \\
+        --script "list_tools,call_tool:list_allowed_directories" --json report.json
+
+    # Record one real session, then replay it offline 10x faster
+    python -m langchain_skilder.loadtest --target runtime --agents 1 --iterations 1 --record session.jsonl.gz
+    python -m langchain_skilder.loadtest --target replay --replay session.jsonl.gz --replay-speed 10 --agents 50
+"""
+
+from typing import List, Optional
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+from .runner import DEFAULT_SCRIPT, dump_report, format_report, parse_script, run_load_test
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m langchain_skilder.loadtest",
+        description="Simulate concurrent agents running list_tools/call_tool against a Skilder runtime or a stub server.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("--agents", type=int, default=10, help="Concurrent simulated agents (default: 10)")
+    parser.add_argument("--iterations", type=int, default=10, help="Script repetitions per agent (default: 10)")
+    parser.add_argument("--script", default=DEFAULT_SCRIPT,
+                        help=f"Comma separated steps: list_tools, call_tool:<tool> (default: {DEFAULT_SCRIPT})")
+    parser.add_argument("--tool-args", default="{}",
+                        help='JSON object mapping tool names to call arguments, e.g. \'{"echo": {"message": "hi"}}\'')
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds over which agents are started")
+    parser.add_argument("--target", choices=["stub", "runtime", "replay"], default="stub", help="What to load (default: stub)")
+    parser.add_argument("--json", metavar="PATH", help="Write the JSON report to PATH ('-' for stdout)")
+
+    stub = parser.add_argument_group("stub server")
+    stub.add_argument("--stub-tools", type=int, default=10, help="Tools in the stub catalog")
+    stub.add_argument("--stub-latency-ms", type=float, default=0.0, help="Stub latency per call")
+    stub.add_argument("--stub-jitter-ms", type=float, default=0.0, help="Random stub latency per call")
+    stub.add_argument("--stub-error-rate", type=float, default=0.0, help="Probability of stub error results")
+    stub.add_argument("--stub-payload-bytes", type=int, default=0, help="Padding added to stub results")
+    stub.add_argument("--stub-seed", type=int, default=None, help="Random seed for the stub")
+    stub.add_argument("--stub-page-size", type=int, default=0, help="Tools per stub tools/list page (0: no pagination)")
+
+    replay = parser.add_argument_group("record / replay")
+    replay.add_argument("--record", metavar="PATH", help="Record the first agent's session to PATH (.gz to compress)")
+    replay.add_argument("--replay", metavar="PATH", help="Recorded session served by --target replay")
+    replay.add_argument("--replay-speed", type=float, default=1.0,
+                        help="Replay speed factor, 0 for no delay (default: 1.0)")
+
+    runtime = parser.add_argument_group("runtime (defaults from environment)")
+    runtime.add_argument("--skill-key", default=os.environ.get("SKILL_KEY"), help="Skill key (env: SKILL_KEY)")
+    runtime.add_argument("--workspace-key", default=os.environ.get("WORKSPACE_KEY"), help="Workspace key (env: WORKSPACE_KEY)")
+    runtime.add_argument("--name", default=os.environ.get("SKILL_NAME"), help="Skill name with --workspace-key (env: SKILL_NAME)")
+    runtime.add_argument("--nats-servers", default=os.environ.get("NATS_SERVERS", "nats://localhost:4222"),
+                         help="NATS servers (env: NATS_SERVERS)")
+    runtime.add_argument("--version", default="latest", help="@skilder-ai/runtime version")
+    runtime.add_argument("--startup-timeout", type=float, default=20.0, help="Startup timeout in seconds")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    try:
+        tool_arguments = json.loads(args.tool_args)
+        script = parse_script(args.script, tool_arguments)
+    except ValueError as error:
+        parser.error(str(error))
+
+    config = {
+        "agents": args.agents,
+        "iterations": args.iterations,
+        "script": script,
+        "ramp_up_seconds": args.ramp_up,
+        "target": args.target,
+        "stub_options": {
+            "tools": args.stub_tools,
+            "latency_ms": args.stub_latency_ms,
+            "jitter_ms": args.stub_jitter_ms,
+            "error_rate": args.stub_error_rate,
+            "payload_bytes": args.stub_payload_bytes,
+            "seed": args.stub_seed,
+            "page_size": args.stub_page_size,
+        },
+    }
+    if args.record:
+        config["record_file"] = args.record
+    if args.target == "replay":
+        if not args.replay:
+            parser.error("--target replay requires --replay PATH")
+        config["replay_file"] = args.replay
+        config["replay_speed"] = args.replay_speed
+    if args.target == "runtime":
+        if args.skill_key:
+            auth = {"skill_key": args.skill_key}
+        else:
+            auth = {"workspace_key": args.workspace_key, "name": args.name}
+        config["client_options"] = {
+            **auth,
+            "nats_servers": args.nats_servers,
+            "version": args.version,
+            "startup_timeout_seconds": args.startup_timeout,
+        }
+
+    try:
+        report = asyncio.run(run_load_test(config))  # type: ignore[arg-type]
+    except ValueError as error:
+        # Invalid authentication configuration surfaces here
+        parser.error(str(error))
+
+    if args.json == "-":
+        print(dump_report(report))
+    else:
+        print(format_report(report))
+        if args.json:
+            with open(args.json, "w") as output:
+                output.write(dump_report(report) + "\n")
+    return 1 if report["startup"]["count"] == 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
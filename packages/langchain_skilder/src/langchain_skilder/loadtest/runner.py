@@ -0,0 +1,318 @@
+"""Concurrent simulated agents driving `MCPClient` for capacity planning.
+
+Each simulated agent owns one `MCPClient` (hence one runtime process), starts
+it, then replays a scripted sequence of `list_tools` / `call_tool` steps for a
+number of iterations. Timings are aggregated into throughput, latency
+percentiles, error rates and startup times, together with client-side CPU and
+memory usage of the Python process.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, TypedDict
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+
+from mcp import StdioServerParameters
+
+from ..mcp_only import MCPClient
+from ..replay import ReplayTransport, SessionRecorder
+
+
+class LoadTestConfig(TypedDict, total=False):
+    """Configuration of a load test run.
+
+    - agents: Number of concurrent simulated agents (one client each)
+    - iterations: How many times each agent replays the script
+    - script: Steps, as returned by `parse_script()`
+    - ramp_up_seconds: Agents are started evenly over this period
+    - target: "stub" (bundled stub server), "runtime" (real Skilder runtime)
+      or "replay" (recorded session, see `replay_file`)
+    - stub_options: Stub server options (tools, latency_ms, jitter_ms, error_rate, payload_bytes, seed,
+      page_size, list_latency_ms)
+    - client_options: Keyword arguments for `MCPClient` (auth, nats_servers, ...) when targeting the runtime
+    - replay_file: Session recorded with `SessionRecorder`, served to every agent by the "replay" target
+    - replay_speed: Replay speed factor (None or 0: no delay)
+    - record_file: Record the session of the first agent to this file
+    """
+    agents: int
+    iterations: int
+    script: List[Dict[str, Any]]
+    ramp_up_seconds: float
+    target: str
+    stub_options: Dict[str, Any]
+    client_options: Dict[str, Any]
+    replay_file: str
+    replay_speed: Optional[float]
+    record_file: str
+
+
+DEFAULT_SCRIPT = "list_tools,call_tool:echo,call_tool:echo"
+
+
+def parse_script(text: str, tool_arguments: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """Parse a comma separated script such as `list_tools,call_tool:echo`.
+
+    Args:
+        text: Steps separated by commas. `call_tool` steps name their tool after a colon.
+        tool_arguments: Optional arguments per tool name used by `call_tool` steps
+
+    Raises:
+        ValueError: If a step is not recognized
+    """
+    steps: List[Dict[str, Any]] = []
+    for raw in text.split(","):
+        raw = raw.strip()
+        if not raw:
+            continue
+        if raw == "list_tools":
+            steps.append({"op": "list_tools", "label": "list_tools"})
+            continue
+        op, _, tool = raw.partition(":")
+        if op != "call_tool" or not tool:
+            raise ValueError(f"Invalid script step '{raw}': expected 'list_tools' or 'call_tool:<tool name>'")
+        steps.append({
+            "op": "call_tool",
+            "label": f"call_tool:{tool}",
+            "tool": tool,
+            "arguments": dict((tool_arguments or {}).get(tool, {})),
+        })
+    if not steps:
+        raise ValueError("Load test script is empty")
+    return steps
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Summarize latency samples (seconds) as milliseconds: mean, p50, p90, p95, p99, max."""
+    if not samples:
+        return {"mean": 0.0, "p50": 0.0, "p90": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+
+    def rank(q: float) -> float:
+        # Nearest-rank percentile
+        index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[index] * 1000.0
+
+    return {
+        "mean": round(sum(ordered) / len(ordered) * 1000.0, 3),
+        "p50": round(rank(0.50), 3),
+        "p90": round(rank(0.90), 3),
+        "p95": round(rank(0.95), 3),
+        "p99": round(rank(0.99), 3),
+        "max": round(ordered[-1] * 1000.0, 3),
+    }
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def _peak_rss_bytes() -> int:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - not available on Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _cpu_seconds() -> float:
+    times = os.times()
+    return times.user + times.system
+
+
+def stub_server_parameters(stub_options: Optional[Dict[str, Any]] = None) -> StdioServerParameters:
+    """Return the parameters spawning the bundled stub server with `stub_options`."""
+    args = ["-m", "langchain_skilder.loadtest.stub_server"]
+    for key, value in (stub_options or {}).items():
+        if value is not None:
+            args.extend([f"--{key.replace('_', '-')}", str(value)])
+    env = {}
+    if os.environ.get("PYTHONPATH"):
+        env["PYTHONPATH"] = os.environ["PYTHONPATH"]
+    return StdioServerParameters(command=sys.executable, args=args, env=env)
+
+
+def _client_factory(config: LoadTestConfig) -> Callable[[], MCPClient]:
+    target = config.get("target", "stub")
+    record_file = config.get("record_file")
+    created = 0
+
+    def recorder() -> Optional[SessionRecorder]:
+        nonlocal created
+        created += 1
+        return SessionRecorder(record_file) if record_file and created == 1 else None
+
+    if target == "replay":
+        if not config.get("replay_file"):
+            raise ValueError("The replay target requires a replay_file")
+        transport = ReplayTransport(config["replay_file"], speed=config.get("replay_speed", 1.0))
+        # Neither the runtime nor authentication is involved; a placeholder key satisfies validation.
+        return lambda: MCPClient.with_skill_key(skill_key="SKL_loadtest_replay", transport=transport, recorder=recorder())
+
+    if target == "stub":
+        params = stub_server_parameters(config.get("stub_options"))
+        # The stub ignores authentication; a placeholder key satisfies validation.
+        return lambda: MCPClient.with_skill_key(skill_key="SKL_loadtest_stub", server_params=params, recorder=recorder())
+
+    client_options = dict(config.get("client_options") or {})
+    return lambda: MCPClient(**client_options, recorder=recorder())
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.error_samples: List[str] = []
+        self.startup: List[float] = []
+        self.startup_failures = 0
+
+    def record(self, label: str, elapsed: float, error: Optional[str]) -> None:
+        self.latencies.setdefault(label, []).append(elapsed)
+        if error is not None:
+            self.errors[label] = self.errors.get(label, 0) + 1
+            if len(self.error_samples) < 10:
+                self.error_samples.append(f"{label}: {error}")
+
+
+async def _run_agent(index: int, config: LoadTestConfig, factory: Callable[[], MCPClient], recorder: _Recorder) -> None:
+    agents = max(1, config.get("agents", 1))
+    ramp_up = config.get("ramp_up_seconds", 0.0)
+    if ramp_up > 0:
+        await asyncio.sleep(ramp_up * index / agents)
+
+    client = factory()
+    started = time.perf_counter()
+    try:
+        await client.start()
+    except Exception as error:
+        recorder.startup_failures += 1
+        recorder.record("startup", time.perf_counter() - started, str(error))
+        await client.stop()
+        return
+    recorder.startup.append(time.perf_counter() - started)
+
+    try:
+        for _ in range(config.get("iterations", 1)):
+            for step in config["script"]:
+                step_started = time.perf_counter()
+                error: Optional[str] = None
+                try:
+                    if step["op"] == "list_tools":
+                        await client.refresh_tools()
+                    else:
+                        result = await client.call_tool(step["tool"], step["arguments"])
+                        if result.get("isError"):
+                            error = "tool returned isError"
+                except Exception as exc:
+                    error = f"{type(exc).__name__}: {exc}"
+                recorder.record(step["label"], time.perf_counter() - step_started, error)
+    finally:
+        await client.stop()
+
+
+async def run_load_test(config: LoadTestConfig) -> Dict[str, Any]:
+    """Run a load test and return the report as a JSON-serializable dict."""
+    config = dict(config)  # type: ignore[assignment]
+    config.setdefault("script", parse_script(DEFAULT_SCRIPT))
+    factory = _client_factory(config)
+    recorder = _Recorder()
+
+    rss_before = _rss_bytes()
+    cpu_before = _cpu_seconds()
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _run_agent(index, config, factory, recorder) for index in range(config.get("agents", 1))
+    ))
+    duration = time.perf_counter() - started
+    cpu_used = _cpu_seconds() - cpu_before
+
+    operations: Dict[str, Any] = {}
+    total_ops = 0
+    total_errors = 0
+    all_latencies: List[float] = []
+    for label, samples in recorder.latencies.items():
+        if label == "startup":
+            continue
+        errors = recorder.errors.get(label, 0)
+        total_ops += len(samples)
+        total_errors += errors
+        all_latencies.extend(samples)
+        operations[label] = {
+            "count": len(samples),
+            "errors": errors,
+            "error_rate": round(errors / len(samples), 4),
+            "throughput_ops_per_second": round(len(samples) / duration, 2) if duration else 0.0,
+            "latency_ms": percentiles(samples),
+        }
+
+    stub_options = config.get("stub_options")
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {
+            "target": config.get("target", "stub"),
+            "agents": config.get("agents", 1),
+            "iterations": config.get("iterations", 1),
+            "ramp_up_seconds": config.get("ramp_up_seconds", 0.0),
+            "script": [step["label"] for step in config["script"]],
+            "stub_options": stub_options if config.get("target", "stub") == "stub" else None,
+            "replay_file": config.get("replay_file") if config.get("target") == "replay" else None,
+        },
+        "duration_seconds": round(duration, 3),
+        "totals": {
+            "operations": total_ops,
+            "errors": total_errors,
+            "error_rate": round(total_errors / total_ops, 4) if total_ops else 0.0,
+            "throughput_ops_per_second": round(total_ops / duration, 2) if duration else 0.0,
+            "latency_ms": percentiles(all_latencies),
+        },
+        "operations": operations,
+        "startup": {
+            "count": len(recorder.startup),
+            "failures": recorder.startup_failures,
+            "latency_ms": percentiles(recorder.startup),
+        },
+        "client": {
+            "cpu_seconds": round(cpu_used, 3),
+            "cpu_percent": round(cpu_used / duration * 100.0, 1) if duration else 0.0,
+            "rss_delta_mb": round((_rss_bytes() - rss_before) / 1024 / 1024, 1),
+            "rss_peak_mb": round(_peak_rss_bytes() / 1024 / 1024, 1),
+        },
+        "error_samples": recorder.error_samples,
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render a report as a short human-readable summary."""
+    lines = [
+        f"target={report['config']['target']} agents={report['config']['agents']} "
+        f"iterations={report['config']['iterations']} duration={report['duration_seconds']}s",
+        f"startup: ok={report['startup']['count']} failed={report['startup']['failures']} "
+        f"p50={report['startup']['latency_ms']['p50']}ms p99={report['startup']['latency_ms']['p99']}ms",
+    ]
+    for label, stats in [("total", report["totals"])] + sorted(report["operations"].items()):
+        latency = stats["latency_ms"]
+        count = stats.get("count", stats.get("operations"))
+        lines.append(
+            f"{label:<24} n={count:<7} {stats['throughput_ops_per_second']:>9} ops/s "
+            f"err={stats['error_rate']:.2%} p50={latency['p50']}ms p90={latency['p90']}ms "
+            f"p99={latency['p99']}ms max={latency['max']}ms"
+        )
+    client = report["client"]
+    lines.append(
+        f"client: cpu={client['cpu_seconds']}s ({client['cpu_percent']}%) "
+        f"rss_delta={client['rss_delta_mb']}MB rss_peak={client['rss_peak_mb']}MB"
+    )
+    for sample in report["error_samples"]:
+        lines.append(f"error: {sample}")
+    return "\n".join(lines)
+
+
+def dump_report(report: Dict[str, Any]) -> str:
+    return json.dumps(report, indent=2, sort_keys=True)
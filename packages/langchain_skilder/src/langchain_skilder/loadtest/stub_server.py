@@ -0,0 +1,207 @@
+"""Stub MCP server speaking stdio, used to load test clients without a runtime.
+
+It mimics the surface of the Skilder runtime that `MCPClient` relies on
+(`initialize`, `tools/list`, `tools/call`) with configurable latency, error
+rate, payload size and `tools/list` pagination, so client-side overhead can be measured without NATS,
+the backend or the Node runtime.
+
+Tools:
+- `echo`: returns its arguments as JSON text; with an `updated_uri` argument
+  it first notifies `notifications/resources/updated` for that URI.
+- `sleep`: waits `seconds` (argument) before answering.
+- `fail`: always returns an error result.
+- `tool_<n>`: filler tools padding the catalog to `--tools` entries.
+
+Resources (subscribable): `stub://text`, `stub://blob` (binary) and
+`stub://counter` (text counting its reads). Prompts: `greet` (argument `name`).
+
+Run:
+    python -m langchain_skilder.loadtest.stub_server --tools 50 --latency-ms 5
+"""
+
+from typing import Any, Dict, List, Optional
+import argparse
+import asyncio
+import json
+import random
+
+import mcp.types as types
+from mcp.server.lowlevel import Server
+from mcp.server.lowlevel.helper_types import ReadResourceContents
+from pydantic import AnyUrl
+from mcp.server.stdio import stdio_server
+
+_BUILTIN_TOOLS = ("echo", "sleep", "fail")
+
+STUB_BLOB = bytes(range(256)) * 64
+
+
+def build_tools(tool_count: int) -> List[types.Tool]:
+    """Return the stub catalog: the builtin tools padded with filler tools."""
+    tools = [
+        types.Tool(
+            name="echo",
+            description="Echo the provided arguments back as JSON text",
+            inputSchema={"type": "object", "properties": {"message": {"type": "string"}}},
+            annotations=types.ToolAnnotations(readOnlyHint=True, idempotentHint=True),
+        ),
+        types.Tool(
+            name="sleep",
+            description="Wait for the given number of seconds, then answer",
+            inputSchema={"type": "object", "properties": {"seconds": {"type": "number"}}},
+            annotations=types.ToolAnnotations(readOnlyHint=True, idempotentHint=True),
+        ),
+        types.Tool(
+            name="fail",
+            description="Always return an error result",
+            inputSchema={"type": "object", "properties": {}},
+        ),
+    ]
+    for index in range(max(0, tool_count - len(tools))):
+        tools.append(types.Tool(
+            name=f"tool_{index}",
+            description=f"Filler tool number {index} of the stub catalog",
+            inputSchema={"type": "object", "properties": {"value": {"type": "string"}}},
+        ))
+    return tools
+
+
+def create_server(
+    tool_count: int = 10,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    error_rate: float = 0.0,
+    payload_bytes: int = 0,
+    seed: Optional[int] = None,
+    page_size: int = 0,
+    list_latency_ms: float = 0.0,
+) -> Server:
+    """Create the stub `Server` with the given behavior.
+
+    Args:
+        tool_count: Total number of tools in the catalog (at least the builtins)
+        latency_ms: Base latency added to every tool call
+        jitter_ms: Uniform random latency added on top of `latency_ms`
+        error_rate: Probability (0-1) that a call returns an error result
+        payload_bytes: Size of the padding text appended to every result
+        seed: Optional random seed for reproducible jitter and errors
+        page_size: Tools per `tools/list` page (0 returns the whole catalog)
+        list_latency_ms: Latency added to every `tools/list` page
+    """
+    server: Server = Server("skilder-stub")
+    tools = build_tools(tool_count)
+    rng = random.Random(seed)
+    padding = "x" * payload_bytes
+
+    @server.list_tools()
+    async def list_tools(request: types.ListToolsRequest) -> types.ListToolsResult:
+        if list_latency_ms > 0:
+            await asyncio.sleep(list_latency_ms / 1000.0)
+        if page_size <= 0:
+            return types.ListToolsResult(tools=tools)
+        cursor = request.params.cursor if request.params is not None else None
+        start = int(cursor) if cursor else 0
+        end = start + page_size
+        return types.ListToolsResult(tools=tools[start:end], nextCursor=str(end) if end < len(tools) else None)
+
+    @server.call_tool(validate_input=False)
+    async def call_tool(name: str, arguments: Dict[str, Any]) -> types.CallToolResult:
+        delay = (latency_ms + rng.uniform(0.0, jitter_ms)) / 1000.0
+        if name == "sleep":
+            delay += float(arguments.get("seconds", 0.0))
+        if name == "echo" and arguments.get("updated_uri"):
+            await server.request_context.session.send_resource_updated(AnyUrl(arguments["updated_uri"]))
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if name == "fail" or (error_rate > 0 and rng.random() < error_rate):
+            return types.CallToolResult(
+                content=[types.TextContent(type="text", text=f"stub error from {name}")],
+                isError=True,
+            )
+        text = json.dumps(arguments, sort_keys=True) if name in _BUILTIN_TOOLS else f"{name} ok"
+        return types.CallToolResult(content=[types.TextContent(type="text", text=text + padding)], isError=False)
+
+    reads = {"count": 0}
+
+    @server.list_resources()
+    async def list_resources() -> List[types.Resource]:
+        return [
+            types.Resource(uri=AnyUrl("stub://text"), name="text", mimeType="text/plain"),
+            types.Resource(uri=AnyUrl("stub://blob"), name="blob", mimeType="application/octet-stream"),
+            types.Resource(uri=AnyUrl("stub://counter"), name="counter", mimeType="text/plain"),
+        ]
+
+    @server.read_resource()
+    async def read_resource(uri: AnyUrl) -> List[ReadResourceContents]:
+        if str(uri) == "stub://blob":
+            return [ReadResourceContents(content=STUB_BLOB, mime_type="application/octet-stream")]
+        if str(uri) == "stub://counter":
+            reads["count"] += 1
+            return [ReadResourceContents(content=str(reads["count"]), mime_type="text/plain")]
+        if str(uri) == "stub://text":
+            return [ReadResourceContents(content="stub resource" + padding, mime_type="text/plain")]
+        raise ValueError(f"Unknown resource {uri}")
+
+    @server.subscribe_resource()
+    async def subscribe_resource(uri: AnyUrl) -> None:
+        return None
+
+    @server.list_prompts()
+    async def list_prompts() -> List[types.Prompt]:
+        return [types.Prompt(
+            name="greet",
+            description="Greet someone",
+            arguments=[types.PromptArgument(name="name", required=True)],
+        )]
+
+    @server.get_prompt()
+    async def get_prompt(name: str, arguments: Optional[Dict[str, str]]) -> types.GetPromptResult:
+        who = (arguments or {}).get("name", "you")
+        return types.GetPromptResult(
+            description="Greet someone",
+            messages=[types.PromptMessage(role="user", content=types.TextContent(type="text", text=f"Hello {who}"))],
+        )
+
+    return server
+
+
+def initialization_options(server: Server) -> Any:
+    """Server options, advertising resource subscriptions (the low-level server never does)."""
+    options = server.create_initialization_options()
+    if options.capabilities.resources is not None:
+        options.capabilities.resources.subscribe = True
+    return options
+
+
+async def serve(**options: Any) -> None:
+    """Serve the stub over stdio until stdin closes."""
+    server = create_server(**options)
+    async with stdio_server() as (read, write):
+        await server.run(read, write, initialization_options(server))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Stub MCP server for langchain_skilder load tests")
+    parser.add_argument("--tools", type=int, default=10, help="Number of tools in the catalog")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Base latency per tool call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random latency added per tool call")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of an error result")
+    parser.add_argument("--payload-bytes", type=int, default=0, help="Padding added to every result")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    parser.add_argument("--page-size", type=int, default=0, help="Tools per tools/list page (0: no pagination)")
+    parser.add_argument("--list-latency-ms", type=float, default=0.0, help="Latency per tools/list page")
+    args = parser.parse_args(argv)
+    asyncio.run(serve(
+        tool_count=args.tools,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        payload_bytes=args.payload_bytes,
+        seed=args.seed,
+        page_size=args.page_size,
+        list_latency_ms=args.list_latency_ms,
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,28 @@
-from typing import Optional, TypedDict, List
-import asyncio
-import contextlib
+"""LangChain MCP adapter tools on the `MCPClient` session core.
+
+`MCPSkill` exposes the tools built by `langchain-mcp-adapters` while the
+session itself is run by an internal `MCPClient`: runtime lifecycle, restart
+after a crash, draining shutdown, catalog cache, priority lanes, retries,
+rate limits, tracing and fork safety are shared by both entry points.
+
+Adapter tools are built once per catalog version. They talk to the client
+through `_AdapterSession`, a minimal stand-in for `ClientSession` that lists
+the cached catalog and routes every `tools/call` through
+`MCPClient.call_tool`.
+"""
+
+from typing import Any, Dict, Optional, TypedDict, List, Tuple
 from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
+import mcp.types as types
 from langchain_mcp_adapters.tools import load_mcp_tools
 from langchain_core.tools import BaseTool
 
+from .catalog import CatalogEntry
+from .mcp_only import MCPClient
+from .profiling import CallProfiler
+from .replay import SessionRecorder, TransportFactory
+from .runtime import RuntimeLocator
+
 class TwolyOptions(TypedDict, total=False):
     workspace_key: str
     skill_key: str
@@ -52,6 +69,32 @@ def _validate_auth(name: Optional[str], workspace_key: Optional[str], skill_key:
             "The skill is identified by the key itself."
         )
 
+class _AdapterSession:
+    """The part of `ClientSession` used by adapter tools, served by an `MCPClient`."""
+
+    def __init__(self, client: MCPClient):
+        self._client = client
+
+    async def list_tools(self, cursor: Optional[str] = None, **kwargs: Any) -> types.ListToolsResult:
+        """Return the client's cached catalog as a single page."""
+        catalog = await self._client._get_catalog()
+        return types.ListToolsResult(tools=[_mcp_tool(entry) for entry in catalog])
+
+    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None, **kwargs: Any) -> types.CallToolResult:
+        """Call the tool through `MCPClient.call_tool` (progress callbacks are not supported)."""
+        result = await self._client.call_tool(name, arguments or {})
+        return types.CallToolResult(content=result["content"], isError=result["isError"])
+
+
+def _mcp_tool(entry: CatalogEntry) -> types.Tool:
+    tool: Dict[str, Any] = {"name": entry.name, "description": entry.description, "inputSchema": entry.inputSchema}
+    if entry.annotations is not None:
+        tool["annotations"] = entry.annotations
+    if entry.meta is not None:
+        tool["_meta"] = entry.meta
+    return types.Tool.model_validate(tool)
+
+
 class MCPSkill:
     """Connect to Skilder skills and access MCP tools via LangChain.
 
@@ -66,6 +109,8 @@ class MCPSkill:
     See factory methods for convenient initialization:
     - MCPSkill.with_workspace_key(name, workspace_key)
     - MCPSkill.with_skill_key(skill_key)
+
+    The session is run by an internal `MCPClient` (see `client`).
     """
 
     def __init__(
@@ -75,7 +120,13 @@ class MCPSkill:
         skill_key: Optional[str] = None,
         nats_servers: str = "nats://localhost:4222",
         version: str = "latest",
-        startup_timeout_seconds: float = 20.0
+        startup_timeout_seconds: float = 20.0,
+        runtime_locator: Optional[RuntimeLocator] = None,
+        transport: Optional[TransportFactory] = None,
+        recorder: Optional[SessionRecorder] = None,
+        profiler: Optional[CallProfiler] = None,
+        max_concurrent_calls: int = 16,
+        **client_options: Any
     ):
         """Initialize MCPSkill with authentication.
 
@@ -86,9 +137,21 @@ class MCPSkill:
             nats_servers: NATS connection URL
             version: npm version for @skilder-ai/runtime
             startup_timeout_seconds: Max time to wait for session initialization
+            runtime_locator: Optional `RuntimeLocator` resolving the runtime
+                command. Defaults to the process-wide locator.
+            transport: Optional factory of session streams replacing the
+                runtime process (e.g. a `ReplayTransport`)
+            recorder: Optional `SessionRecorder` logging every JSON-RPC
+                message of the session
+            profiler: Optional `CallProfiler` profiling a sample of the
+                `start`, `call_tool` and `get_langchain_tools` executions
+            max_concurrent_calls: Tool calls in flight at once on the session
+            **client_options: Other `MCPClient` options (`retry_policy`,
+                `lanes`, `rate_limiter`, `tracer`, `heartbeat`, `daemon`...)
 
         Raises:
             ValueError: If authentication configuration is invalid
+            RuntimeNotFoundError: If the configured runtime cannot be found
         """
         # Validate authentication
         _validate_auth(name, workspace_key, skill_key)
@@ -102,32 +165,24 @@ class MCPSkill:
             "startup_timeout_seconds": startup_timeout_seconds
         }
         self.options = _opts
-
-        # Build environment variables
-        env = {
-            "NATS_SERVERS": nats_servers,
-        }
-
-        if workspace_key:
-            env["WORKSPACE_KEY"] = workspace_key
-            env["SKILL_NAME"] = name  # type: ignore (validated above)
-        elif skill_key:
-            env["SKILL_KEY"] = skill_key
-
-        self.serverParams = StdioServerParameters(
-            # command="npx",
-            # args=["@skilder-ai/runtime@" + version],
-            command="node",
-            args=["/Users/ben/web/alpinai/Skilder/packages/runtime/dist/index.js"],
-            env=env,
+        self._client = MCPClient(
+            name=name,
+            workspace_key=workspace_key,
+            skill_key=skill_key,
+            nats_servers=nats_servers,
+            version=version,
+            startup_timeout_seconds=startup_timeout_seconds,
+            runtime_locator=runtime_locator,
+            transport=transport,
+            recorder=recorder,
+            profiler=profiler,
+            max_concurrent_calls=max_concurrent_calls,
+            **client_options
         )
-        self._session: Optional[ClientSession] = None
-        self._runner_task: Optional[asyncio.Task] = None
-        self._started_future: Optional[asyncio.Future] = None
-        self._stop_requested: bool = False
-        self._runner_exception: Optional[BaseException] = None
-        self._started = False
-        self._startup_timeout_seconds = startup_timeout_seconds
+        self._adapter_session = _AdapterSession(self._client)
+        # Adapter tools and the catalog entries they were built from
+        self._adapter_tools: Optional[List[BaseTool]] = None
+        self._adapter_entries: Tuple[CatalogEntry, ...] = ()
 
     @classmethod
     def with_workspace_key(
@@ -136,7 +191,8 @@ class MCPSkill:
         workspace_key: str,
         nats_servers: str = "nats://localhost:4222",
         version: str = "latest",
-        startup_timeout_seconds: float = 20.0
+        startup_timeout_seconds: float = 20.0,
+        **options: Any
     ) -> "MCPSkill":
         """Create MCPSkill with workspace key for auto-discovery.
 
@@ -149,6 +205,7 @@ class MCPSkill:
             nats_servers: NATS connection URL
             version: npm version for @skilder-ai/runtime
             startup_timeout_seconds: Max time to wait for session initialization
+            **options: Other `MCPSkill` options
 
         Returns:
             MCPSkill instance configured with workspace authentication
@@ -165,7 +222,8 @@ class MCPSkill:
             workspace_key=workspace_key,
             nats_servers=nats_servers,
             version=version,
-            startup_timeout_seconds=startup_timeout_seconds
+            startup_timeout_seconds=startup_timeout_seconds,
+            **options
         )
 
     @classmethod
@@ -174,7 +232,8 @@ class MCPSkill:
         skill_key: str,
         nats_servers: str = "nats://localhost:4222",
         version: str = "latest",
-        startup_timeout_seconds: float = 20.0
+        startup_timeout_seconds: float = 20.0,
+        **options: Any
     ) -> "MCPSkill":
         """Create MCPSkill with skill-specific key (recommended).
 
@@ -187,6 +246,7 @@ class MCPSkill:
             nats_servers: NATS connection URL
             version: npm version for @skilder-ai/runtime
             startup_timeout_seconds: Max time to wait for session initialization
+            **options: Other `MCPSkill` options
 
         Returns:
             MCPSkill instance configured with skill authentication
@@ -201,9 +261,59 @@ class MCPSkill:
             skill_key=skill_key,
             nats_servers=nats_servers,
             version=version,
-            startup_timeout_seconds=startup_timeout_seconds
+            startup_timeout_seconds=startup_timeout_seconds,
+            **options
         )
 
+    @property
+    def client(self) -> MCPClient:
+        """The `MCPClient` running the session (metrics, resources, `call_tool`...)."""
+        return self._client
+
+    @property
+    def serverParams(self) -> Optional[StdioServerParameters]:
+        return self._client.serverParams
+
+    @serverParams.setter
+    def serverParams(self, value: Optional[StdioServerParameters]) -> None:
+        self._client.serverParams = value
+
+    @property
+    def transport(self) -> Optional[TransportFactory]:
+        return self._client.transport
+
+    @transport.setter
+    def transport(self, value: Optional[TransportFactory]) -> None:
+        self._client.transport = value
+
+    @property
+    def recorder(self) -> Optional[SessionRecorder]:
+        return self._client.recorder
+
+    @recorder.setter
+    def recorder(self, value: Optional[SessionRecorder]) -> None:
+        self._client.recorder = value
+
+    @property
+    def profiler(self) -> Optional[CallProfiler]:
+        return self._client.profiler
+
+    @profiler.setter
+    def profiler(self, value: Optional[CallProfiler]) -> None:
+        self._client.profiler = value
+
+    @property
+    def _session(self) -> Optional[ClientSession]:
+        return self._client._session
+
+    @property
+    def _runner_task(self) -> Any:
+        return self._client._runner_task
+
+    @property
+    def _started(self) -> bool:
+        return self._client._started
+
     async def __aenter__(self) -> "MCPSkill":
         await self.start()
         return self
@@ -211,86 +321,30 @@ class MCPSkill:
     async def __aexit__(self, exc_type, exc, tb) -> None:
         await self.stop()
 
-    def __del__(self) -> None:
-        try:
-            self._stop_requested = True
-            if self._runner_task is not None:
-                self._runner_task.cancel()
-        except Exception:
-            pass
-
     async def start(self) -> None:
-        if self._started:
-            return
-        self._runner_exception = None
-        self._started_future = asyncio.get_running_loop().create_future()
-        self._stop_requested = False
-        self._runner_task = asyncio.create_task(self._run_session())
-        try:
-            assert self._started_future is not None
-            await asyncio.wait_for(self._started_future, timeout=self._startup_timeout_seconds)
-        except asyncio.TimeoutError as error:
-            self._stop_requested = True
-            if self._runner_task is not None:
-                self._runner_task.cancel()
-                with contextlib.suppress(Exception, asyncio.CancelledError):
-                    await self._runner_task
-            self._runner_task = None
-            self._started_future = None
-            self._session = None
-            self._started = False
-            raise RuntimeError("MCP runtime startup timed out. Ensure runtime can start and dependencies are reachable.") from error
-        if self._runner_exception is not None:
-            await self.stop()
-            raise RuntimeError("MCP runtime failed to start") from self._runner_exception
-        self._started = True
+        """Start the runtime and initialize the session (see `MCPClient.start`)."""
+        await self._client.start()
 
     async def stop(self) -> None:
-        if not self._started and self._runner_task is None:
-            return
-        try:
-            self._stop_requested = True
-            if self._runner_task is not None:
-                try:
-                    await asyncio.wait_for(self._runner_task, timeout=self._startup_timeout_seconds)
-                except asyncio.TimeoutError:
-                    self._runner_task.cancel()
-                    with contextlib.suppress(Exception, asyncio.CancelledError):
-                        await self._runner_task
-                except asyncio.CancelledError:
-                    pass
-        finally:
-            self._runner_task = None
-            self._started_future = None
-            self._session = None
-            self._started = False
-
-    async def _run_session(self) -> None:
-        try:
-            async with stdio_client(self.serverParams) as (read, write):
-                async with ClientSession(read, write) as session:
-                    self._session = session
-                    await session.initialize()
-                    if self._started_future is not None and not self._started_future.done():
-                        self._started_future.set_result(None)
-                    while not self._stop_requested:
-                        await asyncio.sleep(0.01)
-        except BaseException as error:
-            self._runner_exception = error
-            if self._started_future is not None and not self._started_future.done():
-                self._started_future.set_result(None)
-            raise
-        finally:
-            self._session = None
+        """Drain in-flight calls and stop the runtime (see `MCPClient.stop`)."""
+        await self._client.stop()
 
     async def get_langchain_tools(self) -> List[BaseTool]:
-        await self.start()
-        assert self._session is not None
-        tools = await load_mcp_tools(self._session)
-        return tools
+        """Return the adapter tools, rebuilt only when the catalog changed."""
+        profiler = self._client.profiler
+        if profiler is not None and profiler.sampled("get_langchain_tools"):
+            return await profiler.profile("get_langchain_tools", self._langchain_tools(), client=self.name)
+        return await self._langchain_tools()
+
+    async def _langchain_tools(self) -> List[BaseTool]:
+        entries = tuple(await self._client._get_catalog())
+        if self._adapter_tools is None or entries != self._adapter_entries:
+            self._adapter_tools = await load_mcp_tools(self._adapter_session)  # type: ignore[arg-type]
+            self._adapter_entries = entries
+        return list(self._adapter_tools)
 
     async def list_tools(self) -> List[BaseTool]:
         return await self.get_langchain_tools()
 
     async def tools(self) -> List[BaseTool]:
-        return await self.get_langchain_tools()
\ No newline at end of file
+        return await self.get_langchain_tools()
@@ -10,21 +10,70 @@ Lifecycle overview:
   MCP process and establishes a `ClientSession`.
 - You may call multiple tools; they reuse the same session.
 - If not using a context manager, call `await mcp.stop()` before exit.
+- `stop()` drains: new calls are rejected with `SkilderDrainingError` while
+  in-flight calls get `drain_timeout_seconds` to finish before the runtime
+  is closed.
 
 Under the hood:
-- We use `mcp.client.stdio.stdio_client` to spawn the runtime via `npx` and
-  manage stdio-based JSON-RPC.
+- We use `mcp.client.stdio.stdio_client` to spawn the runtime (`node` on a
+  locally resolved entry point, see `runtime.py`) and manage
+  stdio-based JSON-RPC.
 - We keep a background task alive while `_stop_requested` is False.
 - A short startup future is awaited so that API calls only proceed after
-  `session.initialize()` finishes or a timeout occurs.
+  `session.initialize()` finishes, the runtime reports a fatal startup error
+  on stderr, or a timeout occurs. Each startup phase is timestamped in
+  `startup_trace` (see `startup.py`).
 """
 
-from typing import Optional, TypedDict, List, Dict, Any
+from typing import TYPE_CHECKING, Optional, TypedDict, List, Dict, Any, Set, AsyncIterator, Tuple, Union, Callable
 import contextlib
+import jsonschema
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from mcp.shared.exceptions import McpError
+import mcp.types as types
+from pydantic import AnyUrl
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import BaseTool
 import asyncio
+import logging
+import os
+import time
+
+from . import forking
+from .budget import ContinuationTool, ResultBudget
+from .catalog import CatalogDiff, CatalogEntry, CatalogLoad, diff_catalogs
+from .coalescing import CallCoalescer
+from .errors import SkilderDrainingError, SkilderRateLimitError, SkilderRuntimeError
+from .heartbeat import Heartbeat
+from .metrics import ClientMetrics
+from .nats_transport import NatsTransport
+from .profiling import CallProfiler
+from .ratelimit import RateLimiter
+from .resources import DEFAULT_CHUNK_SIZE, ResourceCache, iter_contents, normalize_uri
+from .replay import SessionRecorder, TransportFactory
+from .retry import RetryPolicy
+from .runtime import RuntimeLocator, default_locator
+from .scheduling import DEFAULT_PRIORITY, CallScheduler, LaneConfig
+from .startup import StartupProbe, StartupTrace
+from .stderr import StderrCapture
+from .tool_index import ToolIndex
+from .tracing import CallTracer, ToolCallSpan, parse_traceparent
+
+if TYPE_CHECKING:
+    from .daemon import DaemonConnector
+    from .streaming import EarlyToolDispatcher
+
+logger = logging.getLogger(__name__)
+
+# Number of runtime stderr lines attached to startup and crash errors
+_ERROR_TAIL_LINES = 20
+
+# Run config keys (in `configurable` or `metadata`) read by `MCPTool`: the
+# priority lane, the caller's request id and W3C parent trace context of a call
+PRIORITY_CONFIG_KEY = "skilder_priority"
+REQUEST_ID_CONFIG_KEY = "skilder_request_id"
+TRACEPARENT_CONFIG_KEY = "traceparent"
 
 class TwolyOptions(TypedDict, total=False):
     """Configuration for the MCP runtime process.
@@ -32,8 +81,9 @@ class TwolyOptions(TypedDict, total=False):
     - workspace_key: Workspace key (requires name parameter)
     - skill_key: Skill-specific key (standalone)
     - nats_servers: NATS connection URL used by the runtime. Defaults to local.
-    - version: npm version/range for `@skilder-ai/runtime` when executed via `npx`.
+    - version: npm version/range for `@skilder-ai/runtime` (cached install, see `install_runtime()`).
     - startup_timeout_seconds: Max time to wait for session initialization.
+    - drain_timeout_seconds: Max time `stop()` waits for in-flight calls.
     - log_level: Optional runtime log level forwarded via env var (info, debug, warn)
     """
     workspace_key: str
@@ -41,6 +91,7 @@ class TwolyOptions(TypedDict, total=False):
     nats_servers: str
     version: str
     startup_timeout_seconds: float
+    drain_timeout_seconds: float
     log_level: str
 
 def _validate_auth(name: Optional[str], workspace_key: Optional[str], skill_key: Optional[str]) -> None:
@@ -82,15 +133,41 @@ def _validate_auth(name: Optional[str], workspace_key: Optional[str], skill_key:
             "The skill is identified by the key itself."
         )
 
+def format_tool_result(tool_name: str, result: Dict[str, Any]) -> str:
+    """Render a `call_tool` result as the text handed to the model."""
+    if result.get("isError", False):
+        return f"Error executing {tool_name}: {result.get('content', 'Unknown error')}"
+
+    # Format the content for return
+    content = result.get("content", [])
+    if isinstance(content, list) and content:
+        # Handle different content types
+        formatted_content = []
+        for item in content:
+            if isinstance(item, dict):
+                if item.get("type") == "text":
+                    formatted_content.append(item.get("text", ""))
+                else:
+                    formatted_content.append(str(item))
+            else:
+                formatted_content.append(str(item))
+        return "\n".join(formatted_content)
+    else:
+        return str(content)
+
 class MCPTool(BaseTool):
     """Light wrapper that adapts MCP tools to LangChain's `BaseTool`.
 
     Each instance holds a reference to the shared `MCPClient`
     instance to execute calls over the same MCP session. Input validation is
     not enforced here; tool schemas are provided to the agent for planning.
+    Instances built by `MCPClient` share their schema with the interned
+    catalog entry; do not mutate it.
     """
     _mcp_instance: Any
     _input_schema: Dict[str, Any]
+    _entry: Optional[CatalogEntry]
+    _priority: str
 
     def __init__(self, name: str, description: str, input_schema: Dict[str, Any], mcp_instance: 'MCPClient'):
         super().__init__(
@@ -99,33 +176,65 @@ class MCPTool(BaseTool):
             args_schema=None
         )
         self._mcp_instance = mcp_instance
-        self._input_schema = input_schema or {}
+        self._input_schema = input_schema if input_schema is not None else {}
+        self._entry = None
+        self._priority = mcp_instance.tool_priority
+
+    @classmethod
+    def from_entry(cls, entry: CatalogEntry, mcp_instance: 'MCPClient') -> "MCPTool":
+        """Build a tool sharing the interned name, description and schema of `entry`."""
+        tool = cls(
+            name=entry.name,
+            description=entry.description,
+            input_schema=entry.inputSchema,
+            mcp_instance=mcp_instance
+        )
+        tool._entry = entry
+        return tool
+
+    @property
+    def entry(self) -> Optional[CatalogEntry]:
+        """Shared catalog entry this tool was built from, if any."""
+        return self._entry
+
+    def _update_entry(self, entry: CatalogEntry) -> None:
+        """Point this tool at a changed entry of the same name, in place.
+
+        Agents and tool nodes holding this object see the new description
+        and schema without rebinding.
+        """
+        self.description = entry.description
+        self._input_schema = entry.inputSchema
+        self._entry = entry
     
-    async def _arun(self, **kwargs) -> str:
-        """Execute the tool asynchronously using the shared MCP session."""
+    @staticmethod
+    def _config_value(config: Optional[RunnableConfig], key: str) -> Optional[str]:
+        """Value of `key` in the run config `configurable`, else `metadata`."""
+        if config:
+            for section in ("configurable", "metadata"):
+                value = (config.get(section) or {}).get(key)
+                if value:
+                    return value
+        return None
+
+    async def _arun(self, skilder_run_config: RunnableConfig = None, **kwargs) -> str:  # type: ignore[assignment]
+        """Execute the tool asynchronously using the shared MCP session.
+
+        LangChain injects the run config through the exact `RunnableConfig`
+        annotation (not `Optional`), so `tool.ainvoke(args, config={"configurable":
+        {"skilder_priority": "interactive"}})` selects the priority lane;
+        `skilder_request_id` and `traceparent` are propagated in the request `_meta`.
+        """
+        config = skilder_run_config
         try:
-            result = await self._mcp_instance.call_tool(self.name, kwargs)
-            
-            if result.get("isError", False):
-                return f"Error executing {self.name}: {result.get('content', 'Unknown error')}"
-            
-            # Format the content for return
-            content = result.get("content", [])
-            if isinstance(content, list) and content:
-                # Handle different content types
-                formatted_content = []
-                for item in content:
-                    if isinstance(item, dict):
-                        if item.get("type") == "text":
-                            formatted_content.append(item.get("text", ""))
-                        else:
-                            formatted_content.append(str(item))
-                    else:
-                        formatted_content.append(str(item))
-                return "\n".join(formatted_content)
-            else:
-                return str(content)
-                
+            result = await self._mcp_instance.call_tool(
+                self.name,
+                kwargs,
+                priority=self._config_value(config, PRIORITY_CONFIG_KEY) or self._priority,
+                traceparent=self._config_value(config, TRACEPARENT_CONFIG_KEY),
+                request_id=self._config_value(config, REQUEST_ID_CONFIG_KEY),
+            )
+            return self._mcp_instance._shape_result(self.name, format_tool_result(self.name, result))
         except Exception as e:
             return f"Error calling {self.name}: {str(e)}"
     
@@ -165,6 +274,8 @@ class MCPClient:
       on first use). Compatible with LangChain/LangGraph agents.
     - tools(): Get a list of dicts describing available tools (name,
       description, inputSchema).
+    - get_relevant_tools(query, k): Only the top-k tools relevant to a query,
+      ranked by the client's `ToolIndex`.
     - call_tool(tool_name, arguments): Execute a specific tool using the shared
       session.
     - stop(): Gracefully shutdowns the background process and clears state.
@@ -183,7 +294,28 @@ class MCPClient:
         nats_servers: str = "nats://localhost:4222",
         version: str = "latest",
         startup_timeout_seconds: float = 20.0,
-        log_level: Optional[str] = None
+        log_level: Optional[str] = None,
+        tool_index: Optional[ToolIndex] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        stderr_capture: Optional[StderrCapture] = None,
+        startup_probe: Optional[StartupProbe] = None,
+        drain_timeout_seconds: float = 10.0,
+        runtime_locator: Optional[RuntimeLocator] = None,
+        transport: Optional[TransportFactory] = None,
+        recorder: Optional[SessionRecorder] = None,
+        max_concurrent_calls: int = 16,
+        lanes: Optional[Dict[str, LaneConfig]] = None,
+        tool_priority: str = DEFAULT_PRIORITY,
+        rate_limiter: Optional[RateLimiter] = None,
+        tracer: Optional[CallTracer] = None,
+        resource_cache_max_bytes: int = 1024 * 1024,
+        heartbeat: Optional[Heartbeat] = None,
+        native_nats: bool = False,
+        daemon: Union[bool, str] = False,
+        result_budget: Optional[ResultBudget] = None,
+        profiler: Optional[CallProfiler] = None,
+        coalescer: Optional[CallCoalescer] = None,
+        server_params: Optional[StdioServerParameters] = None
     ):
         """Initialize MCPClient with authentication.
 
@@ -195,9 +327,63 @@ class MCPClient:
             version: npm version for @skilder-ai/runtime
             startup_timeout_seconds: Max time to wait for session initialization
             log_level: Optional runtime log level (info, debug, warn)
+            tool_index: Optional `ToolIndex` used by `get_relevant_tools()`
+                (e.g. configured with an embedding function). Defaults to BM25.
+            retry_policy: Optional `RetryPolicy` for transient `call_tool`
+                failures. Defaults to up to 3 attempts for tools annotated
+                idempotent or read-only; `RetryPolicy(max_attempts=1)` disables it.
+            stderr_capture: Optional `StderrCapture` draining the runtime stderr.
+                Defaults to a 200-line ring buffer forwarded to the
+                `langchain_skilder.runtime` logger (rate limited).
+            startup_probe: Optional `StartupProbe` recognizing startup phases
+                and fatal errors in the runtime stderr. Defaults to the
+                runtime's own log messages.
+            drain_timeout_seconds: Max time `stop()` waits for in-flight
+                tool calls before closing the runtime
+            runtime_locator: Optional `RuntimeLocator` resolving the runtime
+                command. Defaults to the process-wide locator.
+            transport: Optional factory of session streams replacing the
+                runtime process (e.g. a `ReplayTransport`). No runtime is
+                resolved and `serverParams` is None, as with `native_nats`.
+            recorder: Optional `SessionRecorder` logging every JSON-RPC
+                message of the session
+            max_concurrent_calls: Tool calls in flight at once on the shared
+                session, so the calls of one agent step run side by side
+                (1 serializes them)
+            lanes: Priority lanes by name (see `CallScheduler`). Defaults to
+                `interactive`, `default` and `background`, weighted 8:4:1.
+            tool_priority: Lane used by LangChain tools unless the run config
+                sets `skilder_priority`
+            rate_limiter: Optional `RateLimiter` pacing calls per tool and per
+                skill. Defaults to limits advertised in the tool catalog only.
+            tracer: Optional `CallTracer` recording a span per tool call
+                (e.g. with an exporter). Defaults to keeping the latest 1000 spans.
+            resource_cache_max_bytes: Largest resource body kept in the
+                subscription-backed resource cache
+            heartbeat: Optional `Heartbeat` pinging the session to detect a
+                wedged runtime and track its latency. Disabled by default.
+            native_nats: Speak the skill protocol over NATS from Python
+                (`NatsTransport`) instead of spawning the Node runtime.
+                Requires the `nats` extra.
+            daemon: Share runtimes with the other processes of the host
+                through the runtime daemon (see `daemon.py`), started on
+                demand. True uses the default socket; a string is the socket path.
+            result_budget: Optional `ResultBudget` capping the tool results
+                handed to the model; the overflow is read back with the
+                `skilder_read_more` tool added to the LangChain tools.
+                Disabled by default.
+            profiler: Optional `CallProfiler` profiling a sample of the
+                `start`, `call_tool` and `get_langchain_tools` executions.
+                Disabled by default.
+            coalescer: Optional `CallCoalescer` sharing one request between
+                identical concurrent calls of read-only tools. Disabled by default.
+            server_params: Optional parameters spawning another stdio server
+                in place of the Skilder runtime (e.g. the load test stub
+                server), used as given: no runtime is resolved.
 
         Raises:
-            ValueError: If authentication configuration is invalid
+            ValueError: If authentication or lane configuration is invalid
+            RuntimeNotFoundError: If the configured runtime cannot be found
         """
         # Validate authentication
         _validate_auth(name, workspace_key, skill_key)
@@ -218,13 +404,35 @@ class MCPClient:
         if log_level:
             env["LOG_LEVEL"] = log_level
 
-        self.serverParams = StdioServerParameters(
-            # command="npx",
-            # args=["@skilder-ai/runtime@" + version],
-            command="node",
-            args=["/Users/ben/web/alpinai/Skilder/packages/runtime/dist/index.js"],
-            env=env,
-        )
+        if native_nats:
+            if transport is not None:
+                raise ValueError("native_nats and transport are mutually exclusive")
+            transport = NatsTransport(nats_servers, workspace_key=workspace_key, name=name, skill_key=skill_key)
+        if server_params is not None and transport is not None:
+            raise ValueError("server_params cannot be combined with transport or native_nats")
+        if transport is not None:
+            # No runtime is spawned: nothing to resolve
+            self.serverParams: Optional[StdioServerParameters] = None
+        elif server_params is not None:
+            self.serverParams = server_params
+        else:
+            # Resolved once per version (see `runtime.py`); fails fast when an
+            # override points to a missing runtime.
+            locator = runtime_locator if runtime_locator is not None else default_locator()
+            command, args = locator.resolve(version)
+            self.serverParams = StdioServerParameters(
+                command=command,
+                args=args,
+                env=env,
+            )
+        if daemon and transport is not None:
+            raise ValueError("daemon cannot be combined with transport or native_nats")
+        self.daemon: Optional["DaemonConnector"] = None
+        if daemon:
+            # Unix sockets only: imported when used
+            from .daemon import DaemonConnector
+
+            self.daemon = DaemonConnector(daemon if isinstance(daemon, str) else None)
 
         # Lazy-initialized MCP session and background runner state
         self._session: Optional[ClientSession] = None
@@ -233,8 +441,74 @@ class MCPClient:
         self._stop_requested: bool = False
         self._runner_exception: Optional[BaseException] = None
         self._started = False
-        self._lock = asyncio.Lock()
+        self._start_lock = asyncio.Lock()
+        self._session_lost = False
+        # Admission of tool calls through weighted priority lanes
+        self._scheduler = CallScheduler(max_concurrent_calls, lanes)
+        if tool_priority not in self._scheduler.lanes:
+            raise ValueError(f"tool_priority '{tool_priority}' is not one of the lanes {list(self._scheduler.lanes)}")
+        self.tool_priority = tool_priority
         self._startup_timeout_seconds = startup_timeout_seconds
+        self.stderr = stderr_capture if stderr_capture is not None else StderrCapture()
+        self.transport = transport
+        self.recorder = recorder
+        self.startup_probe = startup_probe if startup_probe is not None else StartupProbe()
+        self.startup_trace: Optional[StartupTrace] = None
+        self._startup_failure: Optional[str] = None
+        self._metrics = ClientMetrics()
+
+        # Draining shutdown: calls in flight (including those queued in
+        # `_scheduler`) are counted so `stop()` can wait for them.
+        self._drain_timeout_seconds = drain_timeout_seconds
+        self._draining = False
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.last_drain: Optional[Dict[str, Any]] = None
+        # Requests awaiting a response. The session never fails them when it
+        # closes, so `stop()` cancels whatever outlived the drain.
+        self._requests: Set[asyncio.Task] = set()
+        # Cancelled requests -> True when abandoned by a drain, False by a restart
+        self._abandoned: Dict[asyncio.Task, bool] = {}
+
+        # Cached tool catalog, invalidated by `notifications/tools/list_changed`.
+        # Entries are interned (see `catalog.py`); refreshes are diffed against
+        # the previous catalog and LangChain tool objects are kept (updated in
+        # place when their entry changed) until their tool is removed.
+        self._catalog: Optional[List[CatalogEntry]] = None
+        self._catalog_by_name: Dict[str, CatalogEntry] = {}
+        # Compiled input schema validators by entry signature (False: unusable schema)
+        self._validators: Dict[str, Any] = {}
+        self._tool_objects: Dict[str, MCPTool] = {}
+        self._index_stale = True
+        self._catalog_stale = True
+        # Paginated `tools/list` walk in flight, shared by its waiters
+        self._catalog_load: Optional[CatalogLoad] = None
+        self._catalog_listeners: List[Callable[[CatalogDiff], None]] = []
+        # Refresh triggered by a list change while listeners are registered
+        self._catalog_watch_task: Optional[asyncio.Task] = None
+        self.tool_index = tool_index if tool_index is not None else ToolIndex()
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.tracer = tracer if tracer is not None else CallTracer()
+        # Resources and prompts, invalidated by server notifications (see `resources.py`)
+        self._resources = ResourceCache(resource_cache_max_bytes)
+        # Liveness pings (see `heartbeat.py`); a wedged session is recycled by `_recycle_task`
+        self.heartbeat = heartbeat
+        self._recycle_task: Optional[asyncio.Task] = None
+        # Oversized results are truncated and continued on demand (see `budget.py`)
+        self.result_budget = result_budget
+        self._continuation_tool = ContinuationTool(result_budget) if result_budget is not None else None
+        # Sampled profiles of client work (see `profiling.py`)
+        self.profiler = profiler
+        # Identical concurrent calls share one request (see `coalescing.py`)
+        self.coalescer = coalescer
+        # Calls started while the model streams, set by `EarlyToolDispatcher` (see `streaming.py`)
+        self.early_dispatcher: Optional["EarlyToolDispatcher"] = None
+        # Session state inherited by forked children is reset (see `forking.py`)
+        self._pid = os.getpid()
+        self._runtime_fds: Tuple[int, ...] = ()
+        forking.track(self)
 
     @classmethod
     def with_workspace_key(
@@ -244,7 +518,8 @@ class MCPClient:
         nats_servers: str = "nats://localhost:4222",
         version: str = "latest",
         startup_timeout_seconds: float = 20.0,
-        log_level: Optional[str] = None
+        log_level: Optional[str] = None,
+        **options: Any
     ) -> "MCPClient":
         """Create MCPClient with workspace key for auto-discovery.
 
@@ -258,6 +533,7 @@ class MCPClient:
             version: npm version for @skilder-ai/runtime
             startup_timeout_seconds: Max time to wait for session initialization
             log_level: Optional runtime log level (info, debug, warn)
+            **options: Additional keyword arguments forwarded to the constructor
 
         Returns:
             MCPClient instance configured with workspace authentication
@@ -275,7 +551,8 @@ class MCPClient:
             nats_servers=nats_servers,
             version=version,
             startup_timeout_seconds=startup_timeout_seconds,
-            log_level=log_level
+            log_level=log_level,
+            **options
         )
 
     @classmethod
@@ -285,7 +562,8 @@ class MCPClient:
         nats_servers: str = "nats://localhost:4222",
         version: str = "latest",
         startup_timeout_seconds: float = 20.0,
-        log_level: Optional[str] = None
+        log_level: Optional[str] = None,
+        **options: Any
     ) -> "MCPClient":
         """Create MCPClient with skill-specific key (recommended).
 
@@ -299,6 +577,7 @@ class MCPClient:
             version: npm version for @skilder-ai/runtime
             startup_timeout_seconds: Max time to wait for session initialization
             log_level: Optional runtime log level (info, debug, warn)
+            **options: Additional keyword arguments forwarded to the constructor
 
         Returns:
             MCPClient instance configured with skill authentication
@@ -314,7 +593,8 @@ class MCPClient:
             nats_servers=nats_servers,
             version=version,
             startup_timeout_seconds=startup_timeout_seconds,
-            log_level=log_level
+            log_level=log_level,
+            **options
         )
 
     async def __aenter__(self) -> "MCPClient":
@@ -336,37 +616,197 @@ class MCPClient:
         """Start the MCP runtime and initialize the session if not already started.
 
         Safe to call multiple times; subsequent calls are no-ops. This method
-        waits until `ClientSession.initialize()` completes or times out.
+        waits until `ClientSession.initialize()` completes, the runtime reports
+        an unrecoverable startup error, or `startup_timeout_seconds` elapses.
+        Phase timings are recorded in `startup_trace`.
+
+        Raises:
+            SkilderRuntimeError: If the runtime fails to start or times out
         """
-        if self._started:
+        if self._pid != os.getpid():
+            self._after_fork()
+        if self._started and not self._session_gone():
             return
+        async with self._start_lock:
+            if self._started:
+                if not self._session_gone():
+                    return
+                # The session was lost (e.g. the runtime exited): start a new one
+                self._metrics.increment("runtime.restarts")
+                await self._teardown()
+            if self.profiler is not None and self.profiler.sampled("start"):
+                await self.profiler.profile("start", self._start(), client=self.name)
+            else:
+                await self._start()
+
+    def _after_fork(self) -> None:
+        """Drop the session state inherited from the parent process.
+
+        The parent's runtime, runner task and asyncio primitives belong to the
+        parent: they are forgotten, not closed. The child's copies of the
+        runtime stdio pipes are released so that the runtime sees end-of-file
+        as soon as the parent stops it. The tool catalog is kept so the
+        child's first session skips `tools/list`.
+        """
+        if self._pid == os.getpid():
+            return
+        forking.release_fds(self._runtime_fds)
+        self._runtime_fds = ()
+        inherited = self._started or self._runner_task is not None
+        self._session = None
+        self._runner_task = None
+        self._started_future = None
+        self._stop_requested = False
         self._runner_exception = None
-        self._started_future = asyncio.get_running_loop().create_future()
+        self._started = False
+        self._session_lost = False
+        self._start_lock = asyncio.Lock()
+        self._catalog_load = None
+        self._scheduler.reset()
+        self._draining = False
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._requests = set()
+        self._abandoned = {}
+        self._recycle_task = None
+        self._catalog_watch_task = None
+        self._resources.clear()
+        if self.coalescer is not None:
+            self.coalescer.reset()
+        if self.early_dispatcher is not None:
+            self.early_dispatcher.reset()
+        self.stderr.after_fork()
+        if self.heartbeat is not None:
+            self.heartbeat.reset()
+        self._metrics = ClientMetrics()
+        if inherited:
+            self._metrics.increment("runtime.forked")
+        self._pid = os.getpid()
+
+    def _session_gone(self) -> bool:
+        return self._session_lost or self._runner_task is None or self._runner_task.done()
+
+    async def _start(self) -> None:
+        loop = asyncio.get_running_loop()
+        trace = StartupTrace()
+        self.startup_trace = trace
+        self._startup_failure = None
+        self._runner_exception = None
+        self._started_future = loop.create_future()
         self._stop_requested = False
+
+        def on_stderr_line(line: str) -> None:
+            with contextlib.suppress(RuntimeError):  # loop closed
+                loop.call_soon_threadsafe(self._probe_startup_line, trace, line, time.monotonic())
+
+        self.stderr.add_listener(on_stderr_line)
         self._runner_task = asyncio.create_task(self._run_session())
         try:
             assert self._started_future is not None
             await asyncio.wait_for(self._started_future, timeout=self._startup_timeout_seconds)
         except asyncio.TimeoutError as error:
-            self._stop_requested = True
-            if self._runner_task is not None:
-                self._runner_task.cancel()
-                with contextlib.suppress(Exception, asyncio.CancelledError):
-                    await self._runner_task
-            self._runner_task = None
-            self._started_future = None
-            self._session = None
-            self._started = False
-            raise RuntimeError("MCP runtime startup timed out. Ensure runtime can start and dependencies (e.g., NATS) are reachable.") from error
+            await self._abort_startup()
+            self._finish_startup(trace, "timeout", f"timed out after {self._startup_timeout_seconds}s in phase {trace.last_phase}")
+            raise SkilderRuntimeError(
+                "MCP runtime startup timed out. Ensure runtime can start and dependencies (e.g., NATS) are reachable. "
+                f"Last startup phase: {trace.last_phase}.",
+                self.stderr.tail(_ERROR_TAIL_LINES)
+            ) from error
+        finally:
+            self.stderr.remove_listener(on_stderr_line)
+        if self._startup_failure is not None:
+            failure = self._startup_failure
+            await self._abort_startup()
+            self._finish_startup(trace, "failed", failure)
+            raise SkilderRuntimeError(f"MCP runtime failed to start: {failure}", self.stderr.tail(_ERROR_TAIL_LINES))
         if self._runner_exception is not None:
+            runner_exception = self._runner_exception
             await self.stop()
-            raise RuntimeError("MCP runtime failed to start") from self._runner_exception
+            self._finish_startup(trace, "failed", f"{type(runner_exception).__name__}: {runner_exception}")
+            raise SkilderRuntimeError("MCP runtime failed to start", self.stderr.tail(_ERROR_TAIL_LINES)) from runner_exception
+        trace.mark("ready")
+        self._finish_startup(trace, "ready")
         self._started = True
 
-    async def stop(self) -> None:
-        """Stop the background task, close the session, and clear internal state."""
-        if not self._started and self._runner_task is None:
+    async def _abort_startup(self) -> None:
+        """Kill a runtime that did not finish starting and reset the runner state."""
+        self._stop_requested = True
+        if self._runner_task is not None:
+            self._runner_task.cancel()
+            with contextlib.suppress(Exception, asyncio.CancelledError):
+                await self._runner_task
+        self._runner_task = None
+        self._started_future = None
+        self._session = None
+        self._started = False
+        self.stderr.close()
+
+    def _finish_startup(self, trace: StartupTrace, outcome: str, error: Optional[str] = None) -> None:
+        trace.finish(outcome, error)
+        self._metrics.increment(f"startup.{outcome}")
+        if trace.total_seconds is not None:
+            self._metrics.observe("startup.total", trace.total_seconds)
+        for phase, seconds in trace.durations().items():
+            if phase != "spawn":
+                self._metrics.observe(f"startup.phase.{phase}", seconds)
+
+    def _probe_startup_line(self, trace: StartupTrace, line: str, at: float) -> None:
+        """Record startup phases announced on stderr and fail fast on fatal errors.
+
+        Runs on the event loop (scheduled by the stderr drain thread).
+        """
+        future = self._started_future
+        if trace is not self.startup_trace or future is None or future.done():
             return
+        phase = self.startup_probe.phase(line)
+        if phase is not None:
+            trace.mark(phase, at)
+        failure: Optional[str] = None
+        if self.startup_probe.is_fatal(line):
+            failure = line.strip()
+        else:
+            delay = self.startup_probe.retry_delay(line)
+            if delay is not None:
+                trace.mark("reconnecting", at)
+                remaining = self._startup_timeout_seconds - (at - trace.origin)
+                if delay >= remaining:
+                    failure = (
+                        f"runtime could not connect and retries in {delay:.1f}s, "
+                        f"beyond the remaining startup budget ({max(0.0, remaining):.1f}s)"
+                    )
+        if failure is not None:
+            self._startup_failure = failure
+            future.set_result(None)
+
+    async def stop(self, drain_timeout_seconds: Optional[float] = None) -> None:
+        """Drain in-flight calls, stop the background task and clear internal state.
+
+        New calls are rejected with `SkilderDrainingError` as soon as draining
+        begins. Calls already in flight (or queued behind another call) get up
+        to `drain_timeout_seconds` to complete; those still running afterwards
+        are abandoned and fail with `SkilderDrainingError`. The outcome is
+        stored in `last_drain` and in `metrics()`.
+
+        Args:
+            drain_timeout_seconds: Override of the client's drain deadline;
+                0 closes the runtime without waiting.
+        """
+        if not self._started and self._runner_task is None and self._recycle_task is None:
+            return
+        self._draining = True
+        try:
+            if self._recycle_task is not None:
+                # Let an ongoing recycle finish so its runtime is stopped too
+                with contextlib.suppress(Exception):
+                    await self._recycle_task
+            await self._drain(self._drain_timeout_seconds if drain_timeout_seconds is None else drain_timeout_seconds)
+            await self._teardown()
+        finally:
+            self._draining = False
+
+    async def _teardown(self) -> None:
+        """Stop the runner, cancel requests left on its session and reset state."""
         try:
             self._stop_requested = True
             if self._runner_task is not None:
@@ -378,27 +818,81 @@ class MCPClient:
                         await self._runner_task
                 except asyncio.CancelledError:
                     pass
+                except Exception:
+                    # The runner already recorded it in `_runner_exception`
+                    pass
         finally:
+            watch = self._catalog_watch_task
+            if watch is not None and watch is not asyncio.current_task():
+                watch.cancel()
+            self._catalog_watch_task = None
+            if self._catalog_load is not None:
+                self._catalog_load.cancel()
+                self._catalog_load = None
+            for request in list(self._requests):
+                self._abandoned[request] = self._draining
+                request.cancel()
             self._runner_task = None
             self._started_future = None
             self._session = None
             self._started = False
+            self._catalog_stale = True
+            self._resources.clear()
+            self._session_lost = False
+            self.stderr.close()
+
+    async def _drain(self, timeout: float) -> None:
+        """Wait up to `timeout` seconds for in-flight calls, then record the outcome."""
+        started = time.monotonic()
+        pending = self._in_flight
+        if pending and timeout > 0:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+        abandoned = self._in_flight
+        duration = time.monotonic() - started
+        self.last_drain = {
+            "duration_seconds": round(duration, 4),
+            "in_flight": pending,
+            "completed": max(0, pending - abandoned),
+            "abandoned": abandoned,
+        }
+        self._metrics.observe("shutdown.drain", duration)
+        self._metrics.increment("calls.abandoned", abandoned)
+
+    def _check_accepting(self, operation: str) -> None:
+        if self._draining:
+            self._metrics.increment("calls.rejected")
+            raise SkilderDrainingError(f"MCP client is shutting down; {operation} rejected")
 
     async def _run_session(self) -> None:
         """Background task that owns the stdio client and MCP session.
 
         It sets `_started_future` once `initialize()` is done so callers waiting
         on `start()` can proceed. The loop idles until `_stop_requested`.
+        The runtime stderr goes to `self.stderr`, drained off the event loop.
         """
+        transport = self._open_transport()
+        if self.recorder is not None:
+            transport = self.recorder.record(transport)
         try:
-            async with stdio_client(self.serverParams) as (read, write):
-                async with ClientSession(read, write) as session:
+            async with transport as (read, write):
+                self._mark_startup("process_spawned")
+                async with ClientSession(read, write, message_handler=self._handle_message) as session:
                     self._session = session
                     await session.initialize()
+                    self._mark_startup("session_initialized")
                     if self._started_future is not None and not self._started_future.done():
                         self._started_future.set_result(None)
-                    while not self._stop_requested:
-                        await asyncio.sleep(0.01)
+                    heartbeat_task = None
+                    if self.heartbeat is not None:
+                        self.heartbeat.reset()
+                        heartbeat_task = asyncio.create_task(self._run_heartbeat(session, self.heartbeat))
+                    try:
+                        while not self._stop_requested and not self._session_lost:
+                            await asyncio.sleep(0.01)
+                    finally:
+                        if heartbeat_task is not None:
+                            heartbeat_task.cancel()
         except BaseException as error:
             self._runner_exception = error
             if self._started_future is not None and not self._started_future.done():
@@ -407,26 +901,324 @@ class MCPClient:
         finally:
             self._session = None
 
+    async def _run_heartbeat(self, session: ClientSession, heartbeat: Heartbeat) -> None:
+        """Ping `session` until it closes, tracking latency and liveness."""
+        while True:
+            await asyncio.sleep(heartbeat.interval_seconds)
+            if self._draining or self._stop_requested or self._session_lost:
+                return
+            started = time.monotonic()
+            try:
+                await asyncio.wait_for(session.send_ping(), timeout=heartbeat.timeout_seconds)
+            except Exception as error:
+                self._metrics.increment("heartbeat.missed")
+                if not heartbeat.record_miss():
+                    continue
+                self._metrics.increment("runtime.unhealthy")
+                logger.warning(
+                    "MCP session unhealthy: %d consecutive pings missed (last: %s)",
+                    heartbeat.misses, type(error).__name__,
+                )
+                if heartbeat.recycle:
+                    # The runner exits; a separate task restarts the runtime
+                    # since this one is cancelled when the runner stops.
+                    self._session_lost = True
+                    self._recycle_task = asyncio.create_task(self._recycle())
+                    return
+            else:
+                latency = time.monotonic() - started
+                heartbeat.record_success(latency)
+                self._metrics.observe("heartbeat.ping", latency)
+
+    async def _recycle(self) -> None:
+        """Replace an unhealthy session with a fresh runtime."""
+        try:
+            if not self._draining:
+                await self.start()
+        except Exception as error:
+            logger.warning("Recycling the MCP runtime failed: %s", error)
+        finally:
+            self._recycle_task = None
+
+    @property
+    def healthy(self) -> bool:
+        """False once the heartbeat marked the session unhealthy (always True without heartbeat)."""
+        return self.heartbeat is None or self.heartbeat.healthy
+
+    @property
+    def latency_seconds(self) -> Optional[float]:
+        """Smoothed ping round-trip time of the session, None until measured."""
+        return self.heartbeat.latency_seconds if self.heartbeat is not None else None
+
+    @contextlib.asynccontextmanager
+    async def _open_transport(self) -> AsyncIterator[Tuple[Any, Any]]:
+        """Open the session streams: the custom `transport`, the runtime daemon, or the runtime over stdio."""
+        if self.transport is not None:
+            async with self.transport() as streams:
+                yield streams
+            return
+        if self.serverParams is None:
+            raise ValueError("No runtime to spawn: serverParams is None (clients created with a transport need it)")
+        if self.daemon is not None:
+            async with self.daemon.connect(self.serverParams) as streams:
+                yield streams
+            return
+        errlog = self.stderr.open()
+        try:
+            stdio = stdio_client(self.serverParams, errlog=errlog)
+            async with stdio as streams:
+                self.stderr.attached()
+                # Released in forked children, see `_after_fork`
+                self._runtime_fds = forking.pipe_fds(stdio)
+                yield streams
+        finally:
+            self._runtime_fds = ()
+            self.stderr.attached()
+
+    def _mark_startup(self, phase: str) -> None:
+        if self.startup_trace is not None and self.startup_trace.outcome is None:
+            self.startup_trace.mark(phase)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return a JSON-serializable snapshot of the client metrics.
+
+        Includes startup outcome counters, total and per-phase startup timings
+        (`startup.phase.<name>`), the trace of the latest startup and the
+        per-lane call counts (`lanes`), the resource cache size (`resources`)
+        and the heartbeat state (`heartbeat`).
+        """
+        snapshot = self._metrics.snapshot()
+        snapshot["startup"] = self.startup_trace.to_dict() if self.startup_trace is not None else None
+        snapshot["lanes"] = self._scheduler.stats()
+        snapshot["resources"] = self._resources.stats()
+        snapshot["heartbeat"] = self.heartbeat.to_dict() if self.heartbeat is not None else None
+        snapshot["results"] = self.result_budget.stats() if self.result_budget is not None else None
+        snapshot["profiling"] = self.profiler.stats() if self.profiler is not None else None
+        snapshot["coalescing"] = self.coalescer.stats() if self.coalescer is not None else None
+        snapshot["early_dispatch"] = self.early_dispatcher.stats() if self.early_dispatcher is not None else None
+        return snapshot
+
+    def _runtime_exited(self) -> bool:
+        """True when the runtime process or the session runner is gone."""
+        return self.stderr.eof or (self._runner_task is not None and self._runner_task.done())
+
+    async def _handle_message(self, message: Any) -> None:
+        """Session message handler reacting to server notifications.
+
+        Runs inside the session receive loop, so it must not issue requests;
+        a list change or resource update only invalidates the cached data and
+        the next access refreshes it. With catalog listeners registered, a
+        tool list change is refreshed right away by a separate task.
+        """
+        if isinstance(message, SkilderRuntimeError):
+            # A transport reporting that its connection is gone (e.g. the
+            # runtime daemon): the runner exits and the next call reconnects
+            logger.warning("MCP session lost: %s", message)
+            self._session_lost = True
+            return
+        if not isinstance(message, types.ServerNotification):
+            return
+        notification = message.root
+        if isinstance(notification, types.ToolListChangedNotification):
+            self._catalog_stale = True
+            if self._catalog_listeners and self._catalog_watch_task is None and not self._draining:
+                self._catalog_watch_task = asyncio.create_task(self._watch_catalog())
+        elif isinstance(notification, types.ResourceUpdatedNotification):
+            self._resources.invalidate(normalize_uri(notification.params.uri))
+            self._metrics.increment("resources.updated")
+        elif isinstance(notification, types.ResourceListChangedNotification):
+            self._resources.resources = None
+        elif isinstance(notification, types.PromptListChangedNotification):
+            self._resources.invalidate_prompts()
+
+    async def _get_catalog(self) -> List[CatalogEntry]:
+        """Return the cached tool catalog, refreshing it when stale."""
+        self._check_accepting("list_tools")
+        await self.start()
+        load = self._ensure_catalog_load()
+        if load is not None:
+            return await load.result()
+        assert self._catalog is not None
+        return self._catalog
+
+    def _ensure_catalog_load(self) -> Optional[CatalogLoad]:
+        """Return the catalog load in flight, starting one when the cache is missing or stale."""
+        load = self._catalog_load
+        if load is not None and load.done:
+            if load.error is not None:
+                self._catalog_stale = True  # retried by this access
+            load = self._catalog_load = None
+        if load is None and (self._catalog is None or self._catalog_stale):
+            load = self._catalog_load = self._start_catalog_load()
+        return load
+
+    def _start_catalog_load(self) -> CatalogLoad:
+        """Walk every `tools/list` page in the background, then install the catalog."""
+        session = self._session
+        assert session is not None
+        # Clear the flag first so a change notified during the walk triggers
+        # another refresh.
+        self._catalog_stale = False
+        self._metrics.increment("catalog.refreshes")
+        started = time.monotonic()
+
+        async def fetch_page(cursor: Optional[str]) -> types.ListToolsResult:
+            params = types.PaginatedRequestParams(cursor=cursor) if cursor else None
+            result = await session.list_tools(params=params)
+            if cursor is None:
+                self._metrics.observe("catalog.first_page", time.monotonic() - started)
+            self._metrics.increment("catalog.pages")
+            return result
+
+        def on_complete(catalog: List[CatalogEntry]) -> None:
+            self._metrics.observe("catalog.load", time.monotonic() - started)
+            diff = self._apply_catalog(catalog)
+            if diff:
+                self._notify_catalog_listeners(diff)
+
+        return CatalogLoad(fetch_page, on_complete).start()
+
+    def _apply_catalog(self, catalog: List[CatalogEntry]) -> CatalogDiff:
+        """Install a new catalog, updating only the tools that differ.
+
+        Tool objects of removed tools are dropped and those of changed tools
+        are updated in place; all others are kept as they are.
+
+        Returns:
+            The `CatalogDiff` against the previous catalog
+        """
+        diff = diff_catalogs(self._catalog or [], catalog)
+        self._catalog = catalog
+        self._catalog_by_name = {entry.name: entry for entry in catalog}
+        for entry in diff.removed:
+            self._tool_objects.pop(entry.name, None)
+        for entry in diff.changed:
+            tool = self._tool_objects.get(entry.name)
+            if tool is not None:
+                tool._update_entry(entry)
+        for kind, entries in (("added", diff.added), ("removed", diff.removed), ("changed", diff.changed)):
+            if entries:
+                self._metrics.increment(f"catalog.tools_{kind}", len(entries))
+        if diff:
+            # The relevance index is only synchronized when a query needs it
+            self._index_stale = True
+        return diff
+
+    def _notify_catalog_listeners(self, diff: CatalogDiff) -> None:
+        for listener in self._catalog_listeners:
+            try:
+                listener(diff)
+            except Exception:
+                logger.exception("Catalog listener %r failed", listener)
+
+    async def _watch_catalog(self) -> None:
+        """Refresh the catalog until it is current, so listeners see the change."""
+        try:
+            while self._catalog_stale and self._catalog_listeners and not self._draining:
+                await self._get_catalog()
+        except Exception as error:
+            logger.warning("Refreshing the tool catalog failed: %s", error)
+        finally:
+            self._catalog_watch_task = None
+
+    def add_catalog_listener(self, listener: Callable[[CatalogDiff], None]) -> None:
+        """Call `listener(diff)` whenever a refresh changes the tool catalog.
+
+        The first listing reports every tool as added. While a listener is
+        registered, a `notifications/tools/list_changed` refreshes the catalog
+        right away instead of on the next access. `diff` holds the added,
+        removed and changed `CatalogEntry` objects; tool objects already
+        returned by `get_langchain_tools()` stay valid (changed ones are
+        updated in place), so only added tools need binding.
+
+        Listeners run on the event loop and must not block (schedule a task
+        for async work). Exceptions they raise are logged and ignored.
+        """
+        self._catalog_listeners = self._catalog_listeners + [listener]
+
+    def remove_catalog_listener(self, listener: Callable[[CatalogDiff], None]) -> None:
+        self._catalog_listeners = [registered for registered in self._catalog_listeners if registered is not listener]
+
+    def _build_tool(self, entry: CatalogEntry) -> "MCPTool":
+        """Return the cached `MCPTool` for an entry, creating it on first use."""
+        tool = self._tool_objects.get(entry.name)
+        if tool is None:
+            tool = MCPTool.from_entry(entry, self)
+            self._tool_objects[entry.name] = tool
+        elif tool.entry is not entry:
+            tool._update_entry(entry)
+        return tool
+
     async def get_langchain_tools(self) -> List[BaseTool]:
         """Return LangChain tools. Starts the session on first use.
 
         Use with LangChain/LangGraph agents. Tools reuse the same MCP session.
         """
+        if self.profiler is not None and self.profiler.sampled("get_langchain_tools"):
+            return await self.profiler.profile("get_langchain_tools", self._langchain_tools(), client=self.name)
+        return await self._langchain_tools()
+
+    async def _langchain_tools(self) -> List[BaseTool]:
+        catalog = await self._get_catalog()
+        return self._with_companions([self._build_tool(tool) for tool in catalog])
+
+    def _with_companions(self, tools: List[BaseTool]) -> List[BaseTool]:
+        """Append the client-side tools (`skilder_read_more`) to MCP tools."""
+        if self._continuation_tool is not None:
+            tools.append(self._continuation_tool)
+        return tools
+
+    def _shape_result(self, tool_name: str, text: str) -> str:
+        """Apply the result budget of `tool_name` to the text handed to the model."""
+        if self.result_budget is None:
+            return text
+        return self.result_budget.shape(tool_name, text)
+
+    async def iter_langchain_tools(self) -> AsyncIterator[List[BaseTool]]:
+        """Yield LangChain tools page by page as the catalog loads.
+
+        Large skills paginate `tools/list`; each page is yielded as soon as it
+        arrives, so an agent can start with the first tools while the rest of
+        the catalog is fetched. The walk runs in the background and fills the
+        cache even if iteration stops early. A cached catalog is yielded as a
+        single page.
+
+        Raises:
+            Exception: The `tools/list` failure, after the pages received before it
+        """
+        self._check_accepting("list_tools")
         await self.start()
-        assert self._session is not None
-        tools_result = await self._session.list_tools()
-        
-        langchain_tools = []
-        for tool in tools_result.tools:
-            mcp_tool = MCPTool(
-                name=tool.name,
-                description=tool.description or "",
-                input_schema=tool.inputSchema or {},
-                mcp_instance=self
-            )
-            langchain_tools.append(mcp_tool)
-        
-        return langchain_tools
+        load = self._ensure_catalog_load()
+        if load is None:
+            assert self._catalog is not None
+            yield self._with_companions([self._build_tool(entry) for entry in self._catalog])
+            return
+        first = True
+        async for page in load.iter_pages():
+            tools = [self._build_tool(entry) for entry in page]
+            yield self._with_companions(tools) if first else tools
+            first = False
+
+    async def refresh_tools(self) -> List[BaseTool]:
+        """Force a `list_tools` round trip and return the refreshed LangChain tools."""
+        self._catalog_stale = True
+        return await self.get_langchain_tools()
+
+    async def get_relevant_tools(self, query: str, k: int = 5) -> List[BaseTool]:
+        """Return only the `k` tools most relevant to `query`.
+
+        Ranking runs locally against the cached catalog (see `ToolIndex`), so
+        binding a small tool subset to an agent costs no extra round trip
+        once the catalog is loaded.
+        """
+        catalog = await self._get_catalog()
+        if self._index_stale:
+            self.tool_index.update(catalog)
+            self._index_stale = False
+        by_name = {tool.name: tool for tool in catalog}
+        return self._with_companions(
+            [self._build_tool(by_name[name]) for name in self.tool_index.search(query, k) if name in by_name]
+        )
 
     async def list_tools(self) -> List[BaseTool]:
         """Alias for `get_langchain_tools()` for symmetry with adapter variant."""
@@ -444,21 +1236,362 @@ class MCPClient:
             for tool in langchain_tools
         ]
     
-    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    async def call_tool(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        priority: str = DEFAULT_PRIORITY,
+        rate_limit_mode: Optional[str] = None,
+        traceparent: Optional[str] = None,
+        request_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Call a specific tool on the shared session.
 
         Arguments are passed as-is to the MCP tool. The return structure mirrors
-        MCP responses with `content` and `isError` keys.
+        MCP responses with `content` and `isError` keys. Transient failures of
+        idempotent or read-only tools are retried according to `retry_policy`
+        (a lost runtime is restarted before the next attempt).
+
+        Calls wait for a slot in the `priority` lane; with several lanes
+        waiting, slots are shared according to the lane weights. Each attempt
+        first takes a token from `rate_limiter`; over the limit it waits, or
+        fails fast when `rate_limit_mode` (default: the limiter's mode) is "fail".
+
+        Every attempt is recorded as a span by `tracer` and carries its W3C
+        trace context, child of `traceparent` (or of the ambient context, see
+        `tracing.py`), and `request_id` in the request `_meta`.
+
+        With a `coalescer`, a call identical to one in flight (same tool, same
+        arguments) waits for that request instead of sending its own, and
+        gets its result; it is then traced by the first caller's span only.
+        Likewise, a call already started by the `early_dispatcher` while the
+        model was streaming is awaited instead of sent again.
+
+        Raises:
+            ValueError: If `priority` is not a configured lane or `traceparent`
+                is invalid
+            SkilderRateLimitError: If the call is over a rate limit and may not wait
+            SkilderDrainingError: If the client is shutting down, or the call
+                was abandoned at the drain deadline
+            SkilderRuntimeError: If the runtime exited during the call
         """
-        await self.start()
-        assert self._session is not None
-        async with self._lock:
-            result = await self._session.call_tool(tool_name, arguments)
+        if self.early_dispatcher is not None:
+            early = self.early_dispatcher.claim(tool_name, arguments)
+            if early is not None:
+                return await early
+        if self.profiler is not None and self.profiler.sampled("call_tool"):
+            return await self.profiler.profile(
+                "call_tool",
+                self._call_tool(tool_name, arguments, priority, rate_limit_mode, traceparent, request_id),
+                client=self.name,
+                tool=tool_name,
+            )
+        return await self._call_tool(tool_name, arguments, priority, rate_limit_mode, traceparent, request_id)
+
+    async def _call_tool(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        priority: str,
+        rate_limit_mode: Optional[str],
+        traceparent: Optional[str],
+        request_id: Optional[str]
+    ) -> Dict[str, Any]:
+        self._scheduler.check_priority(priority)
+        if traceparent is not None and parse_traceparent(traceparent) is None:
+            raise ValueError(f"Invalid traceparent '{traceparent}'")
+        self._check_accepting(f"call to {tool_name}")
+        coalescer = self.coalescer
+        if coalescer is not None:
+            entry = self._catalog_by_name.get(tool_name)
+            key = CallCoalescer.key(tool_name, arguments)
+            if key is not None and coalescer.coalesces(tool_name, entry.annotations if entry is not None else None):
+                return await coalescer.run(
+                    tool_name,
+                    key,
+                    lambda: self._send_call(tool_name, arguments, priority, rate_limit_mode, traceparent, request_id),
+                )
+        return await self._send_call(tool_name, arguments, priority, rate_limit_mode, traceparent, request_id)
+
+    async def _send_call(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        priority: str,
+        rate_limit_mode: Optional[str],
+        traceparent: Optional[str],
+        request_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Run a call with retries, counted as in flight for the drain."""
+        self._in_flight += 1
+        self._idle.clear()
+        try:
+            policy = self.retry_policy
+            entry = self._catalog_by_name.get(tool_name)
+            retryable = policy.is_retryable_tool(tool_name, entry.annotations if entry is not None else None)
+            policy.budget.deposit()
+            attempt = 1
+            while True:
+                # Startup failures are not retried: they already waited for the timeout
+                await self.start()
+                span = self.tracer.start_span(tool_name, traceparent, request_id=request_id, attempt=attempt)
+                span.attributes["priority"] = priority
+                try:
+                    await self._rate_limit(tool_name, rate_limit_mode)
+                    result = await self._call_once(tool_name, arguments, priority, span)
+                except asyncio.CancelledError as error:
+                    self.tracer.end_span(span, "cancelled", error)
+                    raise
+                except Exception as error:
+                    self.tracer.end_span(span, "error", error)
+                    if not (retryable and attempt < policy.max_attempts and policy.is_transient(error)):
+                        raise
+                    outcome: Any = error
+                else:
+                    self.tracer.end_span(span, "tool_error" if result["isError"] else "ok")
+                    if not (retryable and result["isError"] and policy.retry_error_results and attempt < policy.max_attempts):
+                        return result
+                    outcome = result
+                if self._draining:
+                    break
+                if not policy.budget.withdraw():
+                    self._metrics.increment("calls.retry_budget_exhausted")
+                    break
+                self._metrics.increment("calls.retried")
+                await asyncio.sleep(policy.backoff(attempt))
+                attempt += 1
+            if isinstance(outcome, BaseException):
+                raise outcome
+            return outcome
+        finally:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._idle.set()
+
+    async def _rate_limit(self, tool_name: str, mode: Optional[str]) -> None:
+        """Take a rate limit token for one attempt, recording waits and rejections."""
+        entry = self._catalog_by_name.get(tool_name)
+        try:
+            waited = await self.rate_limiter.acquire(tool_name, entry.meta if entry is not None else None, mode)
+        except SkilderRateLimitError:
+            self._metrics.increment("calls.rate_limited")
+            raise
+        if waited > 0:
+            self._metrics.observe("ratelimit.wait", waited)
+
+    async def _call_once(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        priority: str = DEFAULT_PRIORITY,
+        span: Optional[ToolCallSpan] = None
+    ) -> Dict[str, Any]:
+        """Send one `tools/call` request on the current session, propagating `span` in `_meta`."""
+        async with self._scheduler.slot(priority):
+            session = self._session
+            if session is None:
+                if self._draining or self._stop_requested:
+                    raise SkilderDrainingError(f"MCP client is shutting down; call to {tool_name} abandoned")
+                raise SkilderRuntimeError(f"MCP session closed before calling {tool_name}", self.stderr.tail(_ERROR_TAIL_LINES))
+            meta = None
+            if span is not None:
+                span.mark_sent()
+                meta = span.meta()
+            request = asyncio.ensure_future(session.call_tool(tool_name, arguments, meta=meta))
+            self._requests.add(request)
+            try:
+                result = await request
+            except asyncio.CancelledError:
+                if request not in self._abandoned:
+                    raise
+                if self._abandoned[request]:
+                    raise SkilderDrainingError(f"Call to {tool_name} abandoned: drain deadline expired") from None
+                raise SkilderRuntimeError(f"MCP session restarted while calling {tool_name}") from None
+            except Exception as error:
+                if self._draining or self._stop_requested:
+                    raise SkilderDrainingError(
+                        f"Call to {tool_name} abandoned: drain deadline expired"
+                    ) from error
+                if isinstance(error, McpError) and error.error.code == types.CONNECTION_CLOSED:
+                    # Let the runner exit so the next start() opens a new session
+                    self._session_lost = True
+                if self._session_lost or self._runtime_exited():
+                    raise SkilderRuntimeError(
+                        f"MCP runtime exited while calling {tool_name}",
+                        self.stderr.tail(_ERROR_TAIL_LINES)
+                    ) from error
+                raise
+            finally:
+                self._requests.discard(request)
+                self._abandoned.pop(request, None)
             return {
                 "content": result.content,
                 "isError": result.isError
             }
 
+    async def _active_session(self, operation: str) -> ClientSession:
+        """Start the session if needed and return it."""
+        await self.start()
+        session = self._session
+        if session is None:
+            raise SkilderRuntimeError(f"MCP session closed before {operation}", self.stderr.tail(_ERROR_TAIL_LINES))
+        return session
+
+    @staticmethod
+    def _dump(model: Any) -> Dict[str, Any]:
+        return model.model_dump(by_alias=True, mode="json", exclude_none=True)
+
+    async def list_resources(self) -> List[Dict[str, Any]]:
+        """Return the resources of the skill (uri, name, description, mimeType...).
+
+        Cached until the server notifies `notifications/resources/list_changed`.
+        """
+        self._check_accepting("list_resources")
+        cached = self._resources.resources
+        if cached is not None and self._session is not None:
+            return cached
+        session = await self._active_session("list_resources")
+        resources: List[Dict[str, Any]] = []
+        cursor: Optional[str] = None
+        while True:
+            result = await session.list_resources(cursor)
+            resources.extend(self._dump(resource) for resource in result.resources)
+            cursor = result.nextCursor
+            if not cursor:
+                break
+        self._resources.resources = resources
+        return resources
+
+    def _can_subscribe(self, session: ClientSession) -> bool:
+        capabilities = session.get_server_capabilities()
+        return bool(capabilities and capabilities.resources and capabilities.resources.subscribe)
+
+    async def read_resource(self, uri: str, refresh: bool = False) -> List[Dict[str, Any]]:
+        """Return the contents of a resource, each with `uri`, `mimeType` and `text` or base64 `blob`.
+
+        The first read subscribes to the resource (when the server supports
+        subscriptions) and the body is then served from the local cache until
+        the server notifies `notifications/resources/updated` for it.
+
+        Args:
+            uri: Resource URI
+            refresh: Bypass the cache for this read
+        """
+        self._check_accepting(f"read of {uri}")
+        key = normalize_uri(uri)
+        if not refresh and self._session is not None:
+            cached = self._resources.get(key)
+            if cached is not None:
+                self._metrics.increment("resources.cache_hit")
+                return cached
+        session = await self._active_session(f"read of {uri}")
+        self._metrics.increment("resources.cache_miss")
+        version = self._resources.version(key)
+        if not self._resources.is_subscribed(key) and self._can_subscribe(session):
+            # Subscribe before reading so an update in between is not missed
+            self._resources.mark_subscribed(key)
+            try:
+                await session.subscribe_resource(AnyUrl(key))
+            except McpError:
+                self._resources.mark_subscribed(key, False)
+        result = await session.read_resource(AnyUrl(key))
+        contents = [self._dump(item) for item in result.contents]
+        self._resources.put(key, contents, version)
+        return contents
+
+    async def iter_resource(self, uri: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[Union[str, bytes]]:
+        """Yield the body of a resource in chunks: `str` for text, `bytes` for blobs.
+
+        Blobs are decoded chunk by chunk rather than as a whole. Bodies larger
+        than `resource_cache_max_bytes` are not kept in the cache.
+        """
+        for chunk in iter_contents(await self.read_resource(uri), chunk_size):
+            yield chunk
+
+    async def list_prompts(self) -> List[Dict[str, Any]]:
+        """Return the prompts of the skill (name, description, arguments...).
+
+        Cached until the server notifies `notifications/prompts/list_changed`.
+        """
+        self._check_accepting("list_prompts")
+        cached = self._resources.prompts
+        if cached is not None and self._session is not None:
+            return cached
+        session = await self._active_session("list_prompts")
+        prompts: List[Dict[str, Any]] = []
+        cursor: Optional[str] = None
+        while True:
+            result = await session.list_prompts(cursor)
+            prompts.extend(self._dump(prompt) for prompt in result.prompts)
+            cursor = result.nextCursor
+            if not cursor:
+                break
+        self._resources.prompts = prompts
+        return prompts
+
+    async def get_prompt(
+        self, name: str, arguments: Optional[Dict[str, str]] = None, refresh: bool = False
+    ) -> Dict[str, Any]:
+        """Render a prompt and return its `description` and `messages`.
+
+        Rendered prompts are cached per arguments until the server notifies
+        `notifications/prompts/list_changed`.
+
+        Args:
+            name: Prompt name
+            arguments: Prompt arguments
+            refresh: Bypass the cache for this call
+        """
+        self._check_accepting(f"get_prompt {name}")
+        if not refresh and self._session is not None:
+            cached = self._resources.get_prompt(name, arguments)
+            if cached is not None:
+                return cached
+        session = await self._active_session(f"get_prompt {name}")
+        prompt = self._dump(await session.get_prompt(name, arguments))
+        self._resources.put_prompt(name, arguments, prompt)
+        return prompt
+
+    def catalog_entry(self, tool_name: str) -> Optional[CatalogEntry]:
+        """Return the cached catalog entry of `tool_name`.
+
+        Returns None when the tool is unknown or the catalog was not loaded
+        yet (see `get_langchain_tools()`).
+        """
+        return self._catalog_by_name.get(tool_name)
+
+    def validate_call(self, tool_name: str, arguments: Any) -> Optional[str]:
+        """Check a tool call against the cached catalog before sending it.
+
+        Args:
+            tool_name: Name of the called tool
+            arguments: Call arguments, which must match the tool's input schema
+
+        Returns:
+            Why the call cannot be sent (unknown tool, arguments that are not
+            an object or do not match the schema), or None when it is valid
+        """
+        entry = self._catalog_by_name.get(tool_name)
+        if entry is None:
+            return f"Error: {tool_name} is not a valid tool"
+        if not isinstance(arguments, dict):
+            return f"Error: arguments of {tool_name} must be an object"
+        validator = self._validators.get(entry.signature)
+        if validator is None:
+            schema = entry.inputSchema or {}
+            try:
+                validator_class = jsonschema.validators.validator_for(schema)
+                validator_class.check_schema(schema)
+                validator = validator_class(schema)
+            except jsonschema.SchemaError:
+                validator = False  # unusable schema: let the server decide
+            self._validators[entry.signature] = validator
+        if validator:
+            error = jsonschema.exceptions.best_match(validator.iter_errors(arguments))
+            if error is not None:
+                return f"Error: invalid arguments for {tool_name}: {error.message}"
+        return None
+
     async def get_tool_by_name(self, tool_name: str) -> Optional[BaseTool]:
         """Convenience helper to retrieve a tool object by name."""
         tools = await self.get_langchain_tools()
@@ -0,0 +1,40 @@
+"""In-process metrics for `MCPClient`.
+
+Counters, gauges and timing summaries are kept in plain dicts and exposed as a
+JSON-serializable snapshot via `MCPClient.metrics()`, ready to be exported to
+any monitoring system.
+"""
+
+from typing import Any, Dict
+
+
+class ClientMetrics:
+    """Counters, gauges and timing summaries (count, total, min, max)."""
+
+    def __init__(self) -> None:
+        self.counters: Dict[str, int] = {}
+        self.gauges: Dict[str, Any] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+
+    def increment(self, name: str, value: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name: str, value: Any) -> None:
+        self.gauges[name] = value
+
+    def observe(self, name: str, seconds: float) -> None:
+        timing = self.timings.get(name)
+        if timing is None:
+            self.timings[name] = {"count": 1, "total": seconds, "min": seconds, "max": seconds}
+            return
+        timing["count"] += 1
+        timing["total"] += seconds
+        timing["min"] = min(timing["min"], seconds)
+        timing["max"] = max(timing["max"], seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a copy of every metric; timings include their mean."""
+        timings = {}
+        for name, timing in self.timings.items():
+            timings[name] = {**timing, "mean": timing["total"] / timing["count"]}
+        return {"counters": dict(self.counters), "gauges": dict(self.gauges), "timings": timings}
@@ -0,0 +1,402 @@
+"""Native NATS transport: talk to Skilder without the Node runtime process.
+
+By default every tool call crosses two hops: JSON-RPC over stdio to the Node
+runtime, which then speaks the Skilder protocol over NATS. `NatsTransport`
+speaks that protocol from Python directly, as a transport factory for
+`MCPClient` (`native_nats=True`) or `MCPSkill`:
+
+- authentication is the runtime's handshake (request on `handshake`) with
+  the same keys: `WORKSPACE_KEY` + `SKILL_NAME`, or `SKILL_KEY`;
+- the tool list is watched in the `ephemeral` JetStream key-value bucket
+  (`<workspaceId>.<skillId>.list-tools`), prefixed with the `init_skill`
+  tool like the runtime does; later updates are surfaced as
+  `notifications/tools/list_changed`;
+- tool calls are `call-tool` requests on
+  `<workspaceId>.call-tool.<toolId>.<skillId>` (10s timeout, retried once
+  on timeout), smart skills included.
+
+The client still sees an MCP session (`initialize`, `ping`, `tools/list`,
+`tools/call`), served in process over memory streams, so everything built on
+`MCPClient` (retries, lanes, rate limits, heartbeat...) works unchanged.
+Errors are reported as JSON-RPC errors, as the runtime does. The caller's
+`traceparent` / `tracestate` are forwarded as NATS headers.
+
+Resources, prompts and roots are not part of the skill protocol and are not
+served. Requires the optional `nats` extra (`nats-py`).
+"""
+
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Tuple, Union
+import contextlib
+import json
+import logging
+import os
+import socket
+import uuid
+
+import anyio
+import mcp.types as types
+from mcp.shared.message import SessionMessage
+from mcp.shared.version import SUPPORTED_PROTOCOL_VERSIONS
+
+from .errors import SkilderRuntimeError
+
+logger = logging.getLogger(__name__)
+
+HANDSHAKE_SUBJECT = "handshake"
+EPHEMERAL_BUCKET = "ephemeral"
+# Timeouts of the runtime (`DEFAULT_REQUEST_TIMEOUT`, `MCP_CALL_TOOL_TIMEOUT`)
+REQUEST_TIMEOUT_SECONDS = 10.0
+CALL_TOOL_TIMEOUT_SECONDS = 10.0
+
+INIT_SKILL_TOOL_NAME = "init_skill"
+INIT_SKILL_TOOL: Dict[str, Any] = {
+    "name": INIT_SKILL_TOOL_NAME,
+    "title": INIT_SKILL_TOOL_NAME,
+    "description": "call this tool at the beginning of every conversation",
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "original_prompt": {"type": "string", "description": "Original user message"},
+        },
+        "required": ["original_prompt"],
+    },
+    "annotations": {},
+}
+SMART_SKILL_INPUT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "message": {"type": "string", "description": "Message to send to the smart skill"},
+    },
+    "required": ["message"],
+}
+
+# Headers forwarded from the `tools/call` `_meta` to the NATS request
+_FORWARDED_META = ("traceparent", "tracestate")
+
+
+def _import_nats() -> Any:
+    try:
+        import nats
+    except ImportError as error:
+        raise ImportError(
+            "The native NATS transport requires nats-py: pip install \"langchain_skilder[nats]\""
+        ) from error
+    return nats
+
+
+def _host_ip() -> str:
+    with contextlib.suppress(OSError):
+        return socket.gethostbyname(socket.gethostname())
+    return "127.0.0.1"
+
+
+def handshake_message(
+    workspace_key: Optional[str] = None, name: Optional[str] = None, skill_key: Optional[str] = None
+) -> Dict[str, Any]:
+    """Handshake request authenticating a skill, as the runtime sends it."""
+    data: Dict[str, Any] = {
+        "key": workspace_key or skill_key,
+        "pid": str(os.getpid()),
+        "hostIP": _host_ip(),
+        "hostname": socket.gethostname(),
+    }
+    if name:
+        data["nature"] = "skill"
+        data["name"] = name
+    return {"type": "handshake", "subject": HANDSHAKE_SUBJECT, "data": data}
+
+
+class SkillIdentity:
+    """Skill authenticated by the handshake."""
+
+    __slots__ = ("workspace_id", "skill_id", "name")
+
+    def __init__(self, workspace_id: str, skill_id: str, name: str):
+        self.workspace_id = workspace_id
+        self.skill_id = skill_id
+        self.name = name
+
+    @classmethod
+    def from_response(cls, message: Mapping[str, Any]) -> "SkillIdentity":
+        """Read a handshake response.
+
+        Raises:
+            SkilderRuntimeError: If the handshake failed or did not authenticate a skill
+        """
+        data = message.get("data") or {}
+        if message.get("type") == "error":
+            raise SkilderRuntimeError(f"NATS handshake failed: {data.get('error')}")
+        if message.get("type") != "handshake-response":
+            raise SkilderRuntimeError(f"Invalid handshake response: {message.get('type')}")
+        if data.get("nature") != "skill" or not data.get("workspaceId"):
+            raise SkilderRuntimeError("NATS handshake did not authenticate a skill; use a skill or workspace key")
+        return cls(data["workspaceId"], data["id"], data.get("name", ""))
+
+    @property
+    def list_tools_key(self) -> str:
+        return f"{self.workspace_id}.{self.skill_id}.list-tools"
+
+
+class SkillTools:
+    """Tool list of a skill (from a `list-tools` message) and call routing."""
+
+    def __init__(self, data: Mapping[str, Any]):
+        self.description: str = data.get("description") or ""
+        self.smart_tool: Optional[Dict[str, Any]] = data.get("smartSkillTool")
+        self._tools: Dict[str, Dict[str, Any]] = {}
+        if self.smart_tool is None:
+            for tool in data.get("mcpTools") or []:
+                self._tools[tool["name"]] = tool
+
+    def mcp_tools(self) -> List[Dict[str, Any]]:
+        """Tools as listed by the runtime: `init_skill` first."""
+        if self.smart_tool is not None:
+            return [INIT_SKILL_TOOL, {
+                "name": self.smart_tool["name"],
+                "title": self.smart_tool["name"],
+                "description": self.smart_tool.get("description"),
+                "inputSchema": SMART_SKILL_INPUT_SCHEMA,
+                "annotations": {},
+            }]
+        return [INIT_SKILL_TOOL] + [
+            {
+                "name": tool["name"],
+                "title": tool["name"],
+                "description": tool.get("description"),
+                "inputSchema": json.loads(tool.get("inputSchema") or "{}"),
+                "annotations": json.loads(tool.get("annotations") or "{}"),
+            }
+            for tool in self._tools.values()
+        ]
+
+    def call_message(self, identity: SkillIdentity, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """`call-tool` request for tool `name` (not `init_skill`).
+
+        Raises:
+            KeyError: If the skill has no such tool
+        """
+        if self.smart_tool is not None and name == self.smart_tool["name"]:
+            target = self.smart_tool["id"]
+            data: Dict[str, Any] = {"type": "smart-skill", "skillId": target}
+        elif name in self._tools:
+            target = self._tools[name]["id"]
+            data = {"type": "mcp-tool", "toolId": target}
+        else:
+            raise KeyError(name)
+        data.update({"workspaceId": identity.workspace_id, "from": identity.skill_id, "arguments": arguments})
+        subject = f"{identity.workspace_id}.call-tool.{target}.{identity.skill_id}"
+        return {"type": "call-tool", "subject": subject, "data": data}
+
+
+def call_result(message: Mapping[str, Any], name: str) -> Dict[str, Any]:
+    """`CallToolResult` of a `call-tool` response.
+
+    Raises:
+        RuntimeError: If the call failed
+    """
+    data = message.get("data") or {}
+    if message.get("type") == "agent-call-response":
+        return data.get("result") or {}
+    if message.get("type") == "error":
+        raise RuntimeError(f"Tool call ({name}) failed: {data.get('error')}")
+    raise RuntimeError(f"Invalid response: {json.dumps(message)}")
+
+
+class NatsTransport:
+    """Serve an MCP session backed by NATS, as a transport factory.
+
+    Pass an instance as `transport=` to `MCPClient` or `MCPSkill`, or create
+    the client with `native_nats=True`. Every call opens its own NATS
+    connection and handshake, so a restart re-authenticates.
+    """
+
+    def __init__(
+        self,
+        servers: Union[str, List[str]] = "nats://localhost:4222",
+        workspace_key: Optional[str] = None,
+        name: Optional[str] = None,
+        skill_key: Optional[str] = None,
+        call_timeout_seconds: float = CALL_TOOL_TIMEOUT_SECONDS,
+        tools_timeout_seconds: float = 20.0,
+        connect_options: Optional[Dict[str, Any]] = None,
+    ):
+        """Configure the transport.
+
+        Args:
+            servers: NATS server URL(s), comma separated like `NATS_SERVERS`
+            workspace_key: Workspace key (requires name parameter)
+            name: Skill name used with `workspace_key`
+            skill_key: Skill-specific key (standalone)
+            call_timeout_seconds: Timeout of each tool call request (retried
+                once on timeout, like the runtime)
+            tools_timeout_seconds: Max time `tools/list` waits for the tool
+                list to be published
+            connect_options: Extra keyword arguments of `nats.connect()`
+                (credentials, TLS...)
+
+        Raises:
+            ValueError: If authentication is invalid
+        """
+        from .mcp_only import _validate_auth
+
+        _validate_auth(name, workspace_key, skill_key)
+        if isinstance(servers, str):
+            servers = [server.strip() for server in servers.split(",") if server.strip()]
+        self.servers = servers
+        self.workspace_key = workspace_key
+        self.name = name
+        self.skill_key = skill_key
+        self.call_timeout_seconds = call_timeout_seconds
+        self.tools_timeout_seconds = tools_timeout_seconds
+        self.connect_options = dict(connect_options or {})
+        self.identity: Optional[SkillIdentity] = None
+
+    @classmethod
+    def from_env(cls, env: Optional[Mapping[str, str]] = None, **options: Any) -> "NatsTransport":
+        """Create a transport from the runtime's environment variables.
+
+        Reads `NATS_SERVERS` and `SKILL_KEY`, or `WORKSPACE_KEY` + `SKILL_NAME`.
+        """
+        env = os.environ if env is None else env
+        return cls(
+            servers=env.get("NATS_SERVERS", "nats://localhost:4222"),
+            workspace_key=env.get("WORKSPACE_KEY"),
+            name=env.get("SKILL_NAME"),
+            skill_key=None if env.get("WORKSPACE_KEY") else env.get("SKILL_KEY"),
+            **options,
+        )
+
+    def __call__(self) -> "contextlib.AbstractAsyncContextManager[Tuple[Any, Any]]":
+        return self._serve()
+
+    async def _request(self, connection: Any, message: Dict[str, Any], timeout: float, retry: bool = False,
+                       headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        nats = _import_nats()
+        payload = json.dumps(message).encode()
+        try:
+            reply = await connection.request(message["subject"], payload, timeout=timeout, headers=headers)
+        except nats.errors.TimeoutError:
+            if not retry:
+                raise
+            logger.warning("Timeout of NATS request (%s), retrying", message["subject"])
+            reply = await connection.request(message["subject"], payload, timeout=timeout, headers=headers)
+        return json.loads(reply.data)
+
+    async def _handshake(self, connection: Any) -> SkillIdentity:
+        message = handshake_message(self.workspace_key, self.name, self.skill_key)
+        return SkillIdentity.from_response(await self._request(connection, message, REQUEST_TIMEOUT_SECONDS))
+
+    @contextlib.asynccontextmanager
+    async def _serve(self) -> AsyncIterator[Tuple[Any, Any]]:
+        nats = _import_nats()
+        connection = await nats.connect(
+            servers=self.servers, name=f"langchain-skilder:{uuid.uuid4()}", **self.connect_options
+        )
+        try:
+            identity = await self._handshake(connection)
+            self.identity = identity
+            kv = await connection.jetstream().key_value(EPHEMERAL_BUCKET)
+            watcher = await kv.watch(identity.list_tools_key)
+            async with self._session(connection, identity, watcher) as streams:
+                yield streams
+        finally:
+            with contextlib.suppress(Exception):
+                await connection.drain()
+
+    @contextlib.asynccontextmanager
+    async def _session(self, connection: Any, identity: SkillIdentity, watcher: Any) -> AsyncIterator[Tuple[Any, Any]]:
+        server_write, client_read = anyio.create_memory_object_stream[Union[SessionMessage, Exception]](0)
+        client_write, server_read = anyio.create_memory_object_stream[SessionMessage](0)
+        skill: Dict[str, SkillTools] = {}
+        published = anyio.Event()
+
+        async def send(message: Dict[str, Any]) -> None:
+            with contextlib.suppress(anyio.ClosedResourceError, anyio.BrokenResourceError):
+                await server_write.send(SessionMessage(types.JSONRPCMessage.model_validate(message)))
+
+        async def watch() -> None:
+            try:
+                while True:
+                    entry = await watcher.updates(timeout=None)
+                    # None marks the end of the initial values; deletes keep the last list
+                    if entry is None or entry.operation is not None or not entry.value:
+                        continue
+                    message = json.loads(entry.value)
+                    if message.get("type") != "list-tools":
+                        logger.error("Error watching the tools of %s: %s", identity.name, message.get("data"))
+                        continue
+                    skill["tools"] = SkillTools(message.get("data") or {})
+                    if published.is_set():
+                        await send({"jsonrpc": "2.0", "method": "notifications/tools/list_changed"})
+                    published.set()
+            finally:
+                with contextlib.suppress(Exception):
+                    await watcher.stop()
+
+        async def tools() -> SkillTools:
+            with anyio.move_on_after(self.tools_timeout_seconds):
+                await published.wait()
+            if not published.is_set():
+                raise RuntimeError(f"No tool list published for skill {identity.name}")
+            return skill["tools"]
+
+        async def call_tool(params: Dict[str, Any]) -> Dict[str, Any]:
+            name = params.get("name", "")
+            if name == INIT_SKILL_TOOL_NAME:
+                tools = skill.get("tools")
+                return {"content": [{"type": "text", "text": tools.description if tools else ""}]}
+            try:
+                message = (await tools()).call_message(identity, name, params.get("arguments") or {})
+            except KeyError:
+                raise RuntimeError(f"Tool {name} not found in skill: {identity.name}") from None
+            meta = params.get("_meta") or {}
+            headers = {key: str(meta[key]) for key in _FORWARDED_META if meta.get(key)}
+            response = await self._request(
+                connection, message, self.call_timeout_seconds, retry=True, headers=headers or None
+            )
+            return call_result(response, name)
+
+        async def handle(method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+            if method == "initialize":
+                version = params.get("protocolVersion")
+                if version not in SUPPORTED_PROTOCOL_VERSIONS:
+                    version = types.LATEST_PROTOCOL_VERSION
+                return {
+                    "protocolVersion": version,
+                    "capabilities": {"tools": {"listChanged": True}},
+                    "serverInfo": {"name": identity.name or "skilder", "version": "native-nats"},
+                }
+            if method == "ping":
+                return {}
+            if method == "tools/list":
+                return {"tools": (await tools()).mcp_tools()}
+            if method == "tools/call":
+                return await call_tool(params)
+            raise LookupError(method)
+
+        async def answer(request: types.JSONRPCRequest) -> None:
+            try:
+                result = await handle(request.method, request.params or {})
+            except LookupError:
+                error = {"code": types.METHOD_NOT_FOUND, "message": f"Method not found: {request.method}"}
+            except Exception as failure:
+                error = {"code": types.INTERNAL_ERROR, "message": str(failure) or type(failure).__name__}
+            else:
+                await send({"jsonrpc": "2.0", "id": request.id, "result": result})
+                return
+            await send({"jsonrpc": "2.0", "id": request.id, "error": error})
+
+        async def serve() -> None:
+            async with server_read:
+                async for item in server_read:
+                    if isinstance(item.message.root, types.JSONRPCRequest):
+                        group.start_soon(answer, item.message.root)
+
+        async with anyio.create_task_group() as group:
+            group.start_soon(watch)
+            group.start_soon(serve)
+            try:
+                yield client_read, client_write
+            finally:
+                group.cancel_scope.cancel()
+                server_write.close()
@@ -0,0 +1,201 @@
+"""Sampled profiling of client work.
+
+When workers show CPU spikes, it is hard to tell how much comes from the
+client itself (tool object construction, result formatting, JSON handling,
+event loop churn) rather than from the agent or the runtime. A
+`CallProfiler` attached to `MCPClient` or `MCPSkill` profiles a random sample
+of their `start`, `call_tool` and `get_langchain_tools` executions and dumps
+each profile to a directory, next to a JSON file with its metadata
+(operation, tool, duration, outcome, pid...).
+
+Two profilers are supported:
+- `"cprofile"` (default, standard library): deterministic profile of the
+  event loop thread for the duration of the operation, including the other
+  tasks it interleaves with. Dumps `.prof` files (`python -m pstats`,
+  snakeviz...). Only one runs at a time; overlapping samples are skipped.
+- `"pyinstrument"`: statistical, async-aware profile following the awaited
+  task only. Dumps `.pyisession` files (`pyinstrument --load`). Requires the
+  `profiling` extra.
+
+Without a profiler (the default), clients only compare it to None.
+"""
+
+from typing import Any, Awaitable, Dict, Iterable, Optional, TypeVar
+import asyncio
+import cProfile
+import datetime
+import itertools
+import json
+import os
+import random
+import sys
+import time
+
+PROFILED_OPERATIONS = ("start", "call_tool", "get_langchain_tools")
+PROFILER_MODES = ("cprofile", "pyinstrument")
+
+T = TypeVar("T")
+
+
+def _import_pyinstrument() -> Any:
+    try:
+        import pyinstrument
+    except ImportError as error:
+        raise ImportError(
+            "The pyinstrument profiler requires pyinstrument: pip install \"langchain_skilder[profiling]\""
+        ) from error
+    return pyinstrument
+
+
+class CallProfiler:
+    """Profile a sample of client operations and dump the profiles to `directory`."""
+
+    def __init__(
+        self,
+        directory: str,
+        sample_rate: float = 0.01,
+        operations: Optional[Iterable[str]] = None,
+        mode: str = "cprofile",
+        max_profiles: Optional[int] = 1000,
+        seed: Optional[int] = None,
+    ):
+        """Configure the sampling.
+
+        Args:
+            directory: Where profiles and their metadata are written
+                (created on first dump)
+            sample_rate: Fraction (0-1) of the operations profiled
+            operations: Operations to sample among `PROFILED_OPERATIONS`
+                (default: all of them)
+            mode: "cprofile" or "pyinstrument"
+            max_profiles: Stop profiling after this many dumps (None: no limit)
+            seed: Optional random seed for reproducible sampling
+
+        Raises:
+            ValueError: If `mode`, `sample_rate` or an operation is invalid
+            ImportError: If `mode` is "pyinstrument" and it is not installed
+        """
+        if mode not in PROFILER_MODES:
+            raise ValueError(f"Unknown profiler mode '{mode}'; expected one of {list(PROFILER_MODES)}")
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        selected = tuple(operations) if operations is not None else PROFILED_OPERATIONS
+        unknown = [operation for operation in selected if operation not in PROFILED_OPERATIONS]
+        if unknown:
+            raise ValueError(f"Unknown operations {unknown}; expected some of {list(PROFILED_OPERATIONS)}")
+        if mode == "pyinstrument":
+            _import_pyinstrument()
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.operations = frozenset(selected)
+        self.mode = mode
+        self.max_profiles = max_profiles
+        self._rng = random.Random(seed)
+        self._sequence = itertools.count(1)
+        self._cprofile_active = False
+        self.written = 0
+        self.skipped = 0
+        self.failed = 0
+
+    def sampled(self, operation: str) -> bool:
+        """Draw whether this execution of `operation` is profiled."""
+        if operation not in self.operations:
+            return False
+        if self.max_profiles is not None and self.written >= self.max_profiles:
+            return False
+        return self._rng.random() < self.sample_rate
+
+    async def profile(self, operation: str, awaitable: Awaitable[T], **metadata: Any) -> T:
+        """Await `awaitable` under the profiler and dump the profile.
+
+        The outcome of `awaitable` (result or exception) is returned
+        unchanged; a profile that cannot be taken or written is counted and
+        dropped.
+
+        Args:
+            operation: Operation name recorded in the metadata
+            awaitable: The operation to run
+            **metadata: Extra JSON-serializable metadata (e.g. the tool name)
+        """
+        profiler = self._begin()
+        if profiler is None:
+            self.skipped += 1
+            return await awaitable
+        started_at = datetime.datetime.now(datetime.timezone.utc)
+        started = time.perf_counter()
+        status = "ok"
+        error_text: Optional[str] = None
+        try:
+            return await awaitable
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        except Exception as error:
+            status, error_text = "error", repr(error)
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            self._end(profiler)
+            self._dump(profiler, {
+                **metadata,
+                "operation": operation,
+                "profiler": self.mode,
+                "status": status,
+                "error": error_text,
+                "started_at": started_at.isoformat(),
+                "duration_seconds": duration,
+                "pid": os.getpid(),
+                "sample_rate": self.sample_rate,
+            })
+
+    def _begin(self) -> Any:
+        """Start a profiler, or return None when another one is running."""
+        try:
+            if self.mode == "pyinstrument":
+                profiler = _import_pyinstrument().Profiler(async_mode="enabled")
+                profiler.start()
+                return profiler
+            # cProfile hooks the whole thread: never stack it on another
+            # profiler (ours or a debugger's)
+            if self._cprofile_active or sys.getprofile() is not None:
+                return None
+            profiler = cProfile.Profile()
+            profiler.enable()
+            self._cprofile_active = True
+            return profiler
+        except (RuntimeError, ValueError):
+            return None
+
+    def _end(self, profiler: Any) -> None:
+        if self.mode == "pyinstrument":
+            profiler.stop()
+        else:
+            profiler.disable()
+            self._cprofile_active = False
+
+    def _dump(self, profiler: Any, metadata: Dict[str, Any]) -> None:
+        stem = f"{metadata['operation']}-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{next(self._sequence)}"
+        base = os.path.join(self.directory, stem)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if self.mode == "pyinstrument":
+                profile_path = base + ".pyisession"
+                profiler.last_session.save(profile_path)
+            else:
+                profile_path = base + ".prof"
+                profiler.dump_stats(profile_path)
+            with open(base + ".json", "w", encoding="utf-8") as handle:
+                json.dump({**metadata, "profile": os.path.basename(profile_path)}, handle, indent=2, default=str)
+            self.written += 1
+        except (OSError, TypeError, ValueError):
+            self.failed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of profiles written, skipped and failed."""
+        return {
+            "mode": self.mode,
+            "sample_rate": self.sample_rate,
+            "written": self.written,
+            "skipped": self.skipped,
+            "failed": self.failed,
+        }
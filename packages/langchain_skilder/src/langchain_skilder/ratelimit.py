@@ -0,0 +1,207 @@
+"""Client-side rate limiting of tool calls.
+
+Some MCP servers behind a skill enforce hard rate limits; exceeding them
+costs a slow error round trip and an LLM turn. `RateLimiter` paces calls
+before they reach the runtime with token buckets:
+
+- per tool name (`tools={"search": {"rate": 5}}`);
+- per skill, shared by every call of the client (`skill={"rate": 20}`);
+  share one `RateLimiter` between clients to share the skill budget;
+- from the tool catalog: a tool whose `_meta` holds `"skilder/rateLimit":
+  {"rate": 1, "per_seconds": 60}` is limited without any client
+  configuration (explicit per-tool limits take precedence).
+
+A call over the limit either waits for its token (`mode="wait"`, calls are
+spaced evenly) or fails fast with `SkilderRateLimitError` (`mode="fail"`).
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple, TypedDict
+import asyncio
+import time
+
+from .errors import SkilderRateLimitError
+
+RATE_LIMIT_META_KEY = "skilder/rateLimit"
+RATE_LIMIT_MODES = ("wait", "fail")
+
+
+class RateLimitConfig(TypedDict, total=False):
+    """Configuration of one token bucket.
+
+    - rate: Calls allowed per `per_seconds`
+    - per_seconds: Refill period of `rate` (default 1 second)
+    - burst: Bucket capacity, i.e. calls allowed back to back (default
+      `rate`, at least 1)
+    """
+    rate: float
+    per_seconds: float
+    burst: float
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate / per_seconds` tokens per second.
+
+    Waiting callers reserve their token up front (the balance may go
+    negative), so concurrent waiters are released one refill interval apart
+    instead of all at once.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        per_seconds: float = 1.0,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Configure the bucket; it starts full.
+
+        Raises:
+            ValueError: If `rate`, `per_seconds` or `burst` is not positive
+        """
+        if rate <= 0 or per_seconds <= 0 or (burst is not None and burst <= 0):
+            raise ValueError("Rate limit rate, per_seconds and burst must be positive")
+        self.refill_per_second = rate / per_seconds
+        self.capacity = float(burst) if burst is not None else max(1.0, float(rate))
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    @classmethod
+    def from_config(cls, config: RateLimitConfig, clock: Callable[[], float] = time.monotonic) -> "TokenBucket":
+        """Build a bucket from a `RateLimitConfig`.
+
+        Raises:
+            ValueError: If the configuration has no positive `rate`
+        """
+        if "rate" not in config:
+            raise ValueError(f"Rate limit {dict(config)} has no 'rate'")
+        return cls(config["rate"], config.get("per_seconds", 1.0), config.get("burst"), clock)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def delay(self) -> float:
+        """Seconds until a token is available, without taking it."""
+        self._refill()
+        return max(0.0, (1.0 - self._tokens) / self.refill_per_second)
+
+    def reserve(self) -> float:
+        """Take a token, possibly in advance, and return the seconds to wait for it."""
+        self._refill()
+        self._tokens -= 1.0
+        return max(0.0, -self._tokens / self.refill_per_second)
+
+    def refund(self) -> None:
+        """Give back a reserved token (the call was cancelled)."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + 1.0)
+
+
+class RateLimiter:
+    """Per-tool and per-skill rate limits applied by `MCPClient.call_tool`."""
+
+    def __init__(
+        self,
+        tools: Optional[Dict[str, RateLimitConfig]] = None,
+        skill: Optional[RateLimitConfig] = None,
+        mode: str = "wait",
+        max_wait_seconds: Optional[float] = None,
+        meta_key: Optional[str] = RATE_LIMIT_META_KEY,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Configure the limits.
+
+        Args:
+            tools: Limits by tool name
+            skill: Limit shared by all the tools
+            mode: Default behaviour over the limit: "wait" for a token or
+                "fail" fast with `SkilderRateLimitError`
+            max_wait_seconds: In "wait" mode, fail instead of waiting longer
+                than this (None waits as long as needed)
+            meta_key: Tool `_meta` key holding a catalog-provided limit;
+                None ignores catalog limits
+            clock: Monotonic clock (for tests)
+
+        Raises:
+            ValueError: If `mode` or a limit is invalid
+        """
+        self.mode = self._check_mode(mode)
+        self.max_wait_seconds = max_wait_seconds
+        self.meta_key = meta_key
+        self._clock = clock
+        self._tools: Dict[str, TokenBucket] = {
+            name: TokenBucket.from_config(config, clock) for name, config in (tools or {}).items()
+        }
+        self._skill = TokenBucket.from_config(skill, clock) if skill else None
+        # Buckets of catalog-provided limits, rebuilt when the limit changes
+        self._from_meta: Dict[str, Tuple[Tuple, TokenBucket]] = {}
+
+    @staticmethod
+    def _check_mode(mode: str) -> str:
+        if mode not in RATE_LIMIT_MODES:
+            raise ValueError(f"Unknown rate limit mode '{mode}'; expected one of {list(RATE_LIMIT_MODES)}")
+        return mode
+
+    def _meta_bucket(self, tool_name: str, meta: Optional[Dict]) -> Optional[TokenBucket]:
+        config = meta.get(self.meta_key) if meta and self.meta_key else None
+        if not isinstance(config, dict) or "rate" not in config:
+            self._from_meta.pop(tool_name, None)
+            return None
+        key = tuple(sorted(config.items()))
+        cached = self._from_meta.get(tool_name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        try:
+            bucket = TokenBucket.from_config(config, self._clock)  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            # A malformed catalog limit must not break calls to the tool
+            return None
+        self._from_meta[tool_name] = (key, bucket)
+        return bucket
+
+    def buckets(self, tool_name: str, meta: Optional[Dict] = None) -> List[TokenBucket]:
+        """Buckets a call to `tool_name` draws from (tool first, then skill)."""
+        bucket = self._tools.get(tool_name) or self._meta_bucket(tool_name, meta)
+        return [b for b in (bucket, self._skill) if b is not None]
+
+    async def acquire(self, tool_name: str, meta: Optional[Dict] = None, mode: Optional[str] = None) -> float:
+        """Take the tokens for one call to `tool_name`, waiting if needed.
+
+        Args:
+            tool_name: Tool being called
+            meta: Catalog `_meta` of the tool, if known
+            mode: Overrides the default mode for this call
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            SkilderRateLimitError: If the call is over the limit and may not
+                wait (fail mode, or the wait exceeds `max_wait_seconds`)
+            ValueError: If `mode` is invalid
+        """
+        mode = self._check_mode(mode) if mode is not None else self.mode
+        buckets = self.buckets(tool_name, meta)
+        if not buckets:
+            return 0.0
+        delay = max(bucket.delay() for bucket in buckets)
+        if delay > 0 and (mode == "fail" or (self.max_wait_seconds is not None and delay > self.max_wait_seconds)):
+            raise SkilderRateLimitError(
+                f"Rate limit exceeded for {tool_name}; retry in {delay:.2f}s", retry_after_seconds=delay
+            )
+        wait = max(bucket.reserve() for bucket in buckets)
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                for bucket in buckets:
+                    bucket.refund()
+                raise
+        return wait
@@ -0,0 +1,254 @@
+"""Record MCP sessions and replay them without NATS or the Node runtime.
+
+`SessionRecorder` wraps the transport of `MCPClient` / `MCPSkill` and writes
+every JSON-RPC message, with its timing, to a compact JSON-lines log (gzip
+compressed when the path ends with `.gz`). `ReplayTransport` serves those
+recorded responses to a fresh client, at recorded or accelerated speed, so
+agent throughput and client-side overhead can be measured offline and
+reproducibly:
+
+    # record a real session
+    async with MCPClient.with_skill_key(skill_key=key, recorder=SessionRecorder("session.jsonl.gz")) as mcp:
+        ...
+
+    # replay it, 10x faster than recorded
+    mcp = MCPClient.with_skill_key(skill_key=key, transport=ReplayTransport("session.jsonl.gz", speed=10))
+
+Log format: a header object, then one `[seconds, direction, message]` array
+per message, where direction is "c" (client to server) or "s" (server to
+client). The runtime environment (keys, tokens) is never written.
+
+Replay matches each incoming request to a recorded request with the same
+method and parameters (ignoring `_meta`), falling back to the same method and
+target (tool name or resource URI), so calls with other arguments still get a
+representative answer. Unused recordings are preferred; once exhausted they
+are reused, so a short recording can drive long load tests. The recorded
+response is sent after the recorded delay divided by `speed`, followed by the
+server notifications recorded after it.
+"""
+
+from typing import Any, AsyncIterator, Callable, Dict, IO, List, Optional, Tuple, Union
+import contextlib
+import gzip
+import json
+import time
+
+import anyio
+import mcp.types as types
+from mcp.shared.message import SessionMessage
+
+FORMAT_NAME = "skilder-mcp-session"
+FORMAT_VERSION = 1
+
+# Async context manager yielding the (read, write) streams of a session
+TransportFactory = Callable[[], "contextlib.AbstractAsyncContextManager[Tuple[Any, Any]]"]
+
+
+def _open_log(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")  # type: ignore[return-value]
+    return open(path, mode, encoding="utf-8")
+
+
+def _dump(message: types.JSONRPCMessage) -> Dict[str, Any]:
+    return message.model_dump(by_alias=True, mode="json", exclude_none=True)
+
+
+class SessionRecorder:
+    """Record the JSON-RPC traffic of a session to `path`.
+
+    Each new session (e.g. after a restart) overwrites the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.messages_recorded = 0
+
+    @contextlib.asynccontextmanager
+    async def record(
+        self, transport: "contextlib.AbstractAsyncContextManager[Tuple[Any, Any]]"
+    ) -> AsyncIterator[Tuple[Any, Any]]:
+        """Wrap an opened-on-enter transport, logging messages in both directions."""
+        log = _open_log(self.path, "w")
+        origin = time.monotonic()
+        log.write(json.dumps({
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        }) + "\n")
+
+        def write(direction: str, message: types.JSONRPCMessage) -> None:
+            entry = [round(time.monotonic() - origin, 6), direction, _dump(message)]
+            log.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self.messages_recorded += 1
+
+        try:
+            async with transport as (inner_read, inner_write):
+                read_writer, read_stream = anyio.create_memory_object_stream[Union[SessionMessage, Exception]](0)
+                write_stream, write_reader = anyio.create_memory_object_stream[SessionMessage](0)
+
+                async def pump_incoming() -> None:
+                    async with read_writer:
+                        async for item in inner_read:
+                            if isinstance(item, SessionMessage):
+                                write("s", item.message)
+                            await read_writer.send(item)
+
+                async def pump_outgoing() -> None:
+                    async with write_reader:
+                        async for item in write_reader:
+                            write("c", item.message)
+                            await inner_write.send(item)
+
+                async with anyio.create_task_group() as group:
+                    group.start_soon(pump_incoming)
+                    group.start_soon(pump_outgoing)
+                    try:
+                        yield read_stream, write_stream
+                    finally:
+                        group.cancel_scope.cancel()
+        finally:
+            log.close()
+
+
+class _Exchange:
+    __slots__ = ("method", "params", "at", "response", "followers", "used")
+
+    def __init__(self, method: str, params: Optional[Dict[str, Any]], at: float):
+        self.method = method
+        self.params = params
+        self.at = at
+        self.response: Optional[Tuple[float, Dict[str, Any]]] = None
+        self.followers: List[Tuple[float, Dict[str, Any]]] = []
+        self.used = False
+
+
+def _comparable(params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not params:
+        return None
+    return {key: value for key, value in params.items() if key != "_meta"}
+
+
+def _target(params: Optional[Dict[str, Any]]) -> Any:
+    """Tool name or resource URI addressed by a request, if any."""
+    if not params:
+        return None
+    return params.get("name", params.get("uri"))
+
+
+def load_session(path: str) -> List[Tuple[float, str, Dict[str, Any]]]:
+    """Read a recorded session as `(seconds, direction, message)` tuples.
+
+    Raises:
+        ValueError: If the file is not a recorded session
+    """
+    with _open_log(path, "r") as log:
+        header = json.loads(log.readline() or "{}")
+        if header.get("format") != FORMAT_NAME:
+            raise ValueError(f"{path} is not a recorded MCP session")
+        return [tuple(json.loads(line)) for line in log if line.strip()]  # type: ignore[misc]
+
+
+class ReplayTransport:
+    """Serve a recorded session to a client, as a transport factory.
+
+    Pass an instance as `transport=` to `MCPClient` or `MCPSkill`. Every call
+    opens an independent replay, so one instance can serve many clients.
+    """
+
+    def __init__(self, path: str, speed: Optional[float] = 1.0):
+        """Load the recorded session.
+
+        Args:
+            path: Log written by `SessionRecorder`
+            speed: Replay speed factor (2.0 = twice as fast as recorded);
+                None or 0 answers without any delay
+        """
+        self.path = path
+        self.speed = speed
+        self._messages = load_session(path)
+
+    def _exchanges(self) -> List[_Exchange]:
+        exchanges: List[_Exchange] = []
+        pending: Dict[Any, _Exchange] = {}
+        last: Optional[_Exchange] = None
+        for at, direction, message in self._messages:
+            if direction == "c":
+                if "method" in message and "id" in message:
+                    last = _Exchange(message["method"], message.get("params"), at)
+                    pending[message["id"]] = last
+                    exchanges.append(last)
+            elif "id" in message and "method" not in message:
+                exchange = pending.pop(message["id"], None)
+                if exchange is not None:
+                    exchange.response = (at - exchange.at, message)
+            elif "id" not in message and last is not None:
+                last.followers.append((at - last.at, message))
+        return [exchange for exchange in exchanges if exchange.response is not None]
+
+    def _delay(self, seconds: float) -> float:
+        return seconds / self.speed if self.speed else 0.0
+
+    def __call__(self) -> "contextlib.AbstractAsyncContextManager[Tuple[Any, Any]]":
+        return self._serve()
+
+    @contextlib.asynccontextmanager
+    async def _serve(self) -> AsyncIterator[Tuple[Any, Any]]:
+        exchanges = self._exchanges()
+        server_write, client_read = anyio.create_memory_object_stream[Union[SessionMessage, Exception]](0)
+        client_write, server_read = anyio.create_memory_object_stream[SessionMessage](0)
+
+        def match(request: types.JSONRPCRequest) -> Optional[_Exchange]:
+            params = _comparable(request.params)
+            target = _target(request.params)
+            candidates = [
+                exchange for exchange in exchanges
+                if exchange.method == request.method and _target(exchange.params) == target
+            ]
+            for used in (False, True):
+                fresh = [exchange for exchange in candidates if exchange.used == used]
+                for exchange in fresh:
+                    if _comparable(exchange.params) == params:
+                        return exchange
+                if fresh:
+                    return fresh[0]
+            return None
+
+        async def send(message: Dict[str, Any]) -> None:
+            with contextlib.suppress(anyio.ClosedResourceError, anyio.BrokenResourceError):
+                await server_write.send(SessionMessage(types.JSONRPCMessage.model_validate(message)))
+
+        async def answer(request: types.JSONRPCRequest) -> None:
+            exchange = match(request)
+            if exchange is None or exchange.response is None:
+                if request.method == "ping":
+                    await send({"jsonrpc": "2.0", "id": request.id, "result": {}})
+                    return
+                await send({
+                    "jsonrpc": "2.0",
+                    "id": request.id,
+                    "error": {"code": types.METHOD_NOT_FOUND, "message": f"No recorded response for {request.method}"},
+                })
+                return
+            exchange.used = True
+            delay, response = exchange.response
+            events = sorted([(delay, {**response, "id": request.id})] + exchange.followers, key=lambda event: event[0])
+            elapsed = 0.0
+            for at, message in events:
+                await anyio.sleep(self._delay(at - elapsed))
+                elapsed = at
+                await send(message)
+
+        async def serve() -> None:
+            async with server_read:
+                async for item in server_read:
+                    if isinstance(item.message.root, types.JSONRPCRequest):
+                        group.start_soon(answer, item.message.root)
+
+        async with anyio.create_task_group() as group:
+            group.start_soon(serve)
+            try:
+                yield client_read, client_write
+            finally:
+                group.cancel_scope.cancel()
+                server_write.close()
@@ -0,0 +1,138 @@
+"""Local cache of MCP resources and prompts, kept fresh by subscriptions.
+
+Reading the same resource twice used to download it twice. `ResourceCache`
+keeps read results for as long as the server can tell us they changed:
+
+- a resource body is cached only once the client is subscribed to it
+  (`resources/subscribe`), and dropped on `notifications/resources/updated`;
+  servers without subscription support are never served from the cache,
+  since nothing would invalidate it;
+- the resource list is dropped on `notifications/resources/list_changed`,
+  prompts and rendered prompts on `notifications/prompts/list_changed`;
+- everything is dropped when the session restarts (subscriptions die with it).
+
+A read racing an update is not cached: each URI has a version bumped by
+every update, and a result is only stored if the version did not move while
+it was being fetched. Bodies larger than `max_entry_bytes` are not cached.
+
+MCP returns a resource body in a single `resources/read` response, so it
+cannot be streamed off the wire; `iter_contents()` hands it out in chunks,
+decoding base64 blobs chunk by chunk instead of materializing a second,
+decoded copy.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+import base64
+import json
+
+from pydantic import AnyUrl
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def normalize_uri(uri: Union[str, AnyUrl]) -> str:
+    """Canonical string form of a resource URI (as notifications report it)."""
+    return str(AnyUrl(str(uri)))
+
+
+def contents_size(contents: List[Dict[str, Any]]) -> int:
+    """Approximate size in bytes of read contents (text length or encoded blob length)."""
+    return sum(len(item.get("text") or item.get("blob") or "") for item in contents)
+
+
+def iter_contents(contents: List[Dict[str, Any]], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Union[str, bytes]]:
+    """Yield the body of read contents in chunks: `str` for text, `bytes` for blobs.
+
+    Raises:
+        ValueError: If `chunk_size` is not positive
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    for item in contents:
+        if "blob" in item:
+            blob = item["blob"]
+            # 4 base64 characters decode to 3 bytes: keep chunks aligned
+            step = max(4, chunk_size // 3 * 4)
+            for start in range(0, len(blob), step):
+                yield base64.b64decode(blob[start:start + step])
+        else:
+            text = item.get("text", "")
+            for start in range(0, len(text), chunk_size):
+                yield text[start:start + chunk_size]
+
+
+class ResourceCache:
+    """Resource bodies, resource list and prompts cached for one session."""
+
+    def __init__(self, max_entry_bytes: int = 1024 * 1024):
+        """Configure the cache.
+
+        Args:
+            max_entry_bytes: Largest resource body kept in the cache
+        """
+        self.max_entry_bytes = max_entry_bytes
+        self.resources: Optional[List[Dict[str, Any]]] = None
+        self.prompts: Optional[List[Dict[str, Any]]] = None
+        self._bodies: Dict[str, List[Dict[str, Any]]] = {}
+        self._versions: Dict[str, int] = {}
+        self._subscribed: Set[str] = set()
+        self._rendered: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def get(self, uri: str) -> Optional[List[Dict[str, Any]]]:
+        return self._bodies.get(uri)
+
+    def version(self, uri: str) -> int:
+        return self._versions.get(uri, 0)
+
+    def is_subscribed(self, uri: str) -> bool:
+        return uri in self._subscribed
+
+    def mark_subscribed(self, uri: str, subscribed: bool = True) -> None:
+        if subscribed:
+            self._subscribed.add(uri)
+        else:
+            self._subscribed.discard(uri)
+
+    def put(self, uri: str, contents: List[Dict[str, Any]], version: int) -> bool:
+        """Cache a body read at `version`; False when it may already be stale or is too large."""
+        if uri not in self._subscribed or self.version(uri) != version:
+            return False
+        if contents_size(contents) > self.max_entry_bytes:
+            return False
+        self._bodies[uri] = contents
+        return True
+
+    def invalidate(self, uri: str) -> None:
+        """The resource changed (`notifications/resources/updated`)."""
+        self._versions[uri] = self.version(uri) + 1
+        self._bodies.pop(uri, None)
+
+    def invalidate_prompts(self) -> None:
+        self.prompts = None
+        self._rendered.clear()
+
+    @staticmethod
+    def _prompt_key(name: str, arguments: Optional[Dict[str, str]]) -> Tuple[str, str]:
+        return name, json.dumps(arguments or {}, sort_keys=True)
+
+    def get_prompt(self, name: str, arguments: Optional[Dict[str, str]]) -> Optional[Dict[str, Any]]:
+        return self._rendered.get(self._prompt_key(name, arguments))
+
+    def put_prompt(self, name: str, arguments: Optional[Dict[str, str]], prompt: Dict[str, Any]) -> None:
+        self._rendered[self._prompt_key(name, arguments)] = prompt
+
+    def clear(self) -> None:
+        """Forget everything, including subscriptions (new session)."""
+        self.resources = None
+        self._bodies.clear()
+        self._subscribed.clear()
+        self.invalidate_prompts()
+        # Versions are kept so reads racing the restart are not cached
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "bodies": len(self._bodies),
+            "bytes": sum(contents_size(contents) for contents in self._bodies.values()),
+            "subscriptions": len(self._subscribed),
+            "prompts": len(self._rendered),
+        }
@@ -0,0 +1,183 @@
+"""Locate the Skilder runtime entry point and build its spawn command.
+
+Spawning through `npx @skilder-ai/runtime@<version>` resolves the package on
+every start, which costs far more than the Node boot itself. `RuntimeLocator`
+resolves the runtime entry point once per version and spawns `node <entry>`
+directly. Resolution order:
+
+1. An explicit `runtime_path` (file or package directory)
+2. The `SKILDER_RUNTIME_PATH` environment variable
+3. A cached install in `<cache_dir>/<version>` (see `install_runtime()`);
+   the cache directory defaults to `SKILDER_RUNTIME_CACHE` or
+   `~/.cache/skilder/runtime`
+4. `npx @skilder-ai/runtime@<version>`, only with `allow_npx=True`
+
+Without a local runtime, resolution raises `RuntimeNotFoundError` naming the
+`install_runtime()` call that caches it, rather than silently paying the npx
+cost on every spawn. An override pointing to a missing runtime, or a missing
+`node` executable, also raises right away instead of failing at spawn time.
+"""
+
+from typing import Dict, List, Optional, Tuple
+import json
+import os
+import shutil
+import subprocess
+
+from .errors import RuntimeNotFoundError
+
+RUNTIME_PACKAGE = "@skilder-ai/runtime"
+RUNTIME_PATH_ENV = "SKILDER_RUNTIME_PATH"
+RUNTIME_CACHE_ENV = "SKILDER_RUNTIME_CACHE"
+
+
+def default_cache_dir() -> str:
+    """Return the runtime cache directory (`SKILDER_RUNTIME_CACHE` or the user cache)."""
+    if os.environ.get(RUNTIME_CACHE_ENV):
+        return os.environ[RUNTIME_CACHE_ENV]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "skilder", "runtime")
+
+
+def _package_entry(package_dir: str) -> Optional[str]:
+    """Return the entry script declared by the package.json in `package_dir`."""
+    try:
+        with open(os.path.join(package_dir, "package.json")) as manifest:
+            package = json.load(manifest)
+    except (OSError, ValueError):
+        return None
+    entry = package.get("bin") or package.get("main")
+    if isinstance(entry, dict):
+        entry = entry.get("runtime") or next(iter(entry.values()), None)
+    if not entry:
+        return None
+    path = os.path.join(package_dir, entry)
+    return path if os.path.isfile(path) else None
+
+
+class RuntimeLocator:
+    """Resolve (and memoize per version) the command spawning the runtime."""
+
+    def __init__(
+        self,
+        runtime_path: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        node: str = "node",
+        allow_npx: bool = False,
+    ):
+        """Configure the locator.
+
+        Args:
+            runtime_path: Runtime entry script or package directory, taking
+                precedence over `SKILDER_RUNTIME_PATH` and the cache
+            cache_dir: Directory holding cached installs, one sub-directory per version
+            node: Node executable used for resolved entry points
+            allow_npx: Fall back to `npx` when no local runtime is found;
+                by default a missing runtime raises `RuntimeNotFoundError`
+        """
+        self.runtime_path = runtime_path
+        self.cache_dir = cache_dir
+        self.node = node
+        self.allow_npx = allow_npx
+        self._resolved: Dict[str, Tuple[str, List[str]]] = {}
+
+    def _cache_dir(self) -> str:
+        return self.cache_dir or default_cache_dir()
+
+    def install_dir(self, version: str) -> str:
+        """Directory of the cached install of `version`."""
+        return os.path.join(self._cache_dir(), version.replace("/", "_"))
+
+    def cached_entry(self, version: str) -> Optional[str]:
+        """Entry script of the cached install of `version`, if present."""
+        return _package_entry(os.path.join(self.install_dir(version), "node_modules", *RUNTIME_PACKAGE.split("/")))
+
+    def _override_entry(self) -> Optional[str]:
+        path = self.runtime_path or os.environ.get(RUNTIME_PATH_ENV)
+        if not path:
+            return None
+        source = "runtime_path" if self.runtime_path else RUNTIME_PATH_ENV
+        if os.path.isdir(path):
+            entry = _package_entry(path)
+            if entry is None:
+                raise RuntimeNotFoundError(f"{source}={path} is a directory without a runtime entry point in package.json")
+            return entry
+        if not os.path.isfile(path):
+            raise RuntimeNotFoundError(f"{source}={path} does not exist")
+        return path
+
+    def resolve(self, version: str = "latest") -> Tuple[str, List[str]]:
+        """Return `(command, args)` spawning the runtime `version`.
+
+        Raises:
+            RuntimeNotFoundError: If an override points to a missing runtime,
+                `node` is not installed, or no runtime is found (and npx is not allowed)
+        """
+        resolved = self._resolved.get(version)
+        if resolved is not None:
+            return resolved[0], list(resolved[1])
+        entry = self._override_entry() or self.cached_entry(version)
+        if entry is not None:
+            node = shutil.which(self.node)
+            if node is None:
+                raise RuntimeNotFoundError(f"Node.js executable '{self.node}' not found on PATH (needed to run {entry})")
+            resolved = (node, [os.path.abspath(entry)])
+        elif self.allow_npx:
+            resolved = ("npx", [f"{RUNTIME_PACKAGE}@{version}"])
+        else:
+            raise RuntimeNotFoundError(
+                f"{RUNTIME_PACKAGE}@{version} not found: set {RUNTIME_PATH_ENV}, pass runtime_path, "
+                f"or run install_runtime('{version}') to cache it in {self.install_dir(version)}"
+            )
+        self._resolved[version] = resolved
+        return resolved[0], list(resolved[1])
+
+    def install(self, version: str = "latest", npm: str = "npm") -> str:
+        """Install `version` into the cache with npm and return its entry script.
+
+        Re-running it refreshes a cached tag such as `latest`.
+
+        Raises:
+            RuntimeNotFoundError: If npm is missing or the install fails
+        """
+        npm_path = shutil.which(npm)
+        if npm_path is None:
+            raise RuntimeNotFoundError(f"'{npm}' not found on PATH; cannot install {RUNTIME_PACKAGE}@{version}")
+        target = self.install_dir(version)
+        os.makedirs(target, exist_ok=True)
+        completed = subprocess.run(
+            [npm_path, "install", "--prefix", target, "--no-audit", "--no-fund", f"{RUNTIME_PACKAGE}@{version}"],
+            capture_output=True,
+            text=True,
+        )
+        entry = self.cached_entry(version) if completed.returncode == 0 else None
+        if entry is None:
+            raise RuntimeNotFoundError(
+                f"Installing {RUNTIME_PACKAGE}@{version} into {target} failed: {completed.stderr.strip()[-2000:]}"
+            )
+        self._resolved.pop(version, None)
+        return entry
+
+    def clear(self) -> None:
+        """Forget memoized resolutions (e.g. after changing the environment)."""
+        self._resolved.clear()
+
+
+_default_locator = RuntimeLocator()
+
+
+def default_locator() -> RuntimeLocator:
+    """Process-wide locator used by clients created without one."""
+    return _default_locator
+
+
+def install_runtime(version: str = "latest", cache_dir: Optional[str] = None) -> str:
+    """Cache `@skilder-ai/runtime@<version>` locally so clients spawn `node` directly.
+
+    Returns:
+        Path of the installed entry script
+    """
+    locator = RuntimeLocator(cache_dir=cache_dir) if cache_dir else _default_locator
+    entry = locator.install(version)
+    _default_locator.clear()
+    return entry
@@ -0,0 +1,180 @@
+"""Priority lanes for tool calls sharing one MCP session.
+
+Calls used to be served in whatever order they acquired a single lock, so a
+burst of background calls could starve interactive ones. `CallScheduler`
+admits calls through named lanes:
+
+- weighted fair scheduling: when a slot frees up, the waiting lane with the
+  earliest virtual finish time is served; each admission advances the lane's
+  virtual time by `1 / weight`. With weights 8:1, interactive calls get 8
+  slots for every background slot while both are busy, and a lone lane gets
+  all the capacity;
+- per-lane concurrency caps (`max_concurrent`) keep a lane from occupying
+  every slot;
+- `max_concurrent` slots in total (1 keeps calls serialized, as before).
+
+Within a lane, calls are served in arrival order.
+"""
+
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple, TypedDict
+from collections import deque
+import asyncio
+import contextlib
+
+DEFAULT_PRIORITY = "default"
+
+
+class LaneConfig(TypedDict, total=False):
+    """Configuration of one priority lane.
+
+    - weight: Share of the slots while several lanes are waiting (default 1)
+    - max_concurrent: Max calls of this lane running at once (default: no cap)
+    """
+    weight: float
+    max_concurrent: int
+
+
+DEFAULT_LANES: Dict[str, LaneConfig] = {
+    "interactive": {"weight": 8.0},
+    DEFAULT_PRIORITY: {"weight": 4.0},
+    "background": {"weight": 1.0},
+}
+
+
+class _Lane:
+    __slots__ = ("name", "weight", "max_concurrent", "waiters", "running", "virtual_time", "admitted")
+
+    def __init__(self, name: str, config: LaneConfig):
+        self.name = name
+        self.weight = float(config.get("weight", 1.0))
+        if self.weight <= 0:
+            raise ValueError(f"Lane '{name}' weight must be positive")
+        self.max_concurrent: Optional[int] = config.get("max_concurrent")
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.running = 0
+        self.virtual_time = 0.0
+        self.admitted = 0
+
+    def eligible(self) -> bool:
+        return bool(self.waiters) and (self.max_concurrent is None or self.running < self.max_concurrent)
+
+
+class CallScheduler:
+    """Admit calls through weighted, capped priority lanes."""
+
+    def __init__(self, max_concurrent: int = 1, lanes: Optional[Dict[str, LaneConfig]] = None):
+        """Configure the scheduler.
+
+        Args:
+            max_concurrent: Calls running at once across all lanes
+            lanes: Lane configurations by name; defaults to `interactive`
+                (weight 8), `default` (4) and `background` (1)
+
+        Raises:
+            ValueError: If a lane weight or `max_concurrent` is not positive
+        """
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+        self._lanes: Dict[str, _Lane] = {
+            name: _Lane(name, config) for name, config in (lanes if lanes is not None else DEFAULT_LANES).items()
+        }
+        self._running = 0
+        self._virtual_clock = 0.0
+
+    @property
+    def lanes(self) -> Tuple[str, ...]:
+        return tuple(self._lanes)
+
+    def check_priority(self, priority: str) -> None:
+        """Raise `ValueError` if `priority` is not a configured lane."""
+        self._lane(priority)
+
+    def _lane(self, priority: str) -> _Lane:
+        lane = self._lanes.get(priority)
+        if lane is None:
+            raise ValueError(f"Unknown priority '{priority}'; expected one of {sorted(self._lanes)}")
+        return lane
+
+    def _can_run(self, lane: _Lane) -> bool:
+        return self._running < self.max_concurrent and (lane.max_concurrent is None or lane.running < lane.max_concurrent)
+
+    def _finish_tag(self, lane: _Lane) -> float:
+        return lane.virtual_time + 1.0 / lane.weight
+
+    def _admit(self, lane: _Lane) -> None:
+        start = max(lane.virtual_time, self._virtual_clock)
+        lane.virtual_time = start + 1.0 / lane.weight
+        self._virtual_clock = start
+        lane.running += 1
+        lane.admitted += 1
+        self._running += 1
+
+    def _dispatch(self) -> None:
+        """Grant free slots to waiting lanes, earliest virtual finish first."""
+        while self._running < self.max_concurrent:
+            candidates = [lane for lane in self._lanes.values() if lane.eligible()]
+            if not candidates:
+                return
+            lane = min(candidates, key=self._finish_tag)
+            waiter = lane.waiters.popleft()
+            if waiter.done():  # cancelled while waiting
+                continue
+            self._admit(lane)
+            waiter.set_result(None)
+
+    def _release(self, lane: _Lane) -> None:
+        lane.running -= 1
+        self._running -= 1
+        self._dispatch()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: str = DEFAULT_PRIORITY) -> AsyncIterator[None]:
+        """Wait for a slot in the `priority` lane and hold it for the block.
+
+        Raises:
+            ValueError: If `priority` is not a configured lane
+        """
+        lane = self._lane(priority)
+        if not lane.waiters and self._can_run(lane) and not any(
+            other.eligible() for other in self._lanes.values()
+        ):
+            self._admit(lane)
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            if not lane.waiters:
+                # A lane returning from idle starts at the current clock: no banked credit
+                lane.virtual_time = max(lane.virtual_time, self._virtual_clock)
+            lane.waiters.append(waiter)
+            self._dispatch()
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Granted just before the cancellation: hand the slot on
+                    self._release(lane)
+                else:
+                    with contextlib.suppress(ValueError):
+                        lane.waiters.remove(waiter)
+                raise
+        try:
+            yield
+        finally:
+            self._release(lane)
+
+    def reset(self) -> None:
+        """Forget queued and running calls (e.g. inherited across a fork), keeping the lanes."""
+        for lane in self._lanes.values():
+            lane.waiters.clear()
+            lane.running = 0
+            lane.virtual_time = 0.0
+            lane.admitted = 0
+        self._running = 0
+        self._virtual_clock = 0.0
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-lane waiting, running and admitted call counts."""
+        return {
+            name: {"waiting": len(lane.waiters), "running": lane.running, "admitted": lane.admitted}
+            for name, lane in self._lanes.items()
+        }
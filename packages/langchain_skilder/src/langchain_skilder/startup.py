@@ -0,0 +1,152 @@
+"""Startup tracing and readiness probing for the runtime process.
+
+`start()` used to only know "ready" or "timed out". The runtime logs each step
+of its boot sequence to stderr (see `runtime.main.service.ts`): DI setup, NATS
+connection, handshake, heartbeat (`runtime.health.service.ts`), skill
+subscription and the stdio MCP server. `StartupProbe` recognizes those lines
+(as captured by `StderrCapture`) and turns them into a `StartupTrace` with one
+timestamp per phase.
+
+The runtime has no local health endpoint (its health service only publishes
+heartbeats to NATS), so readiness is probed from the same log lines: fatal
+errors (permanent authentication failure) and reconnect attempts whose backoff
+outlasts the remaining startup budget make `start()` fail as soon as the
+runtime reports them instead of burning the whole startup timeout.
+"""
+
+from typing import Any, Dict, List, Optional, Pattern, Sequence, Tuple
+import re
+import time
+
+# Phases reported by the runtime on stderr, in boot order
+DEFAULT_PHASE_PATTERNS: Sequence[Tuple[str, str]] = (
+    (r"\[main\] Starting with PID", "runtime_boot"),
+    (r"\[nats\] Starting", "nats_connecting"),
+    (r"\[auth\] Starting", "nats_connected"),
+    (r"\[auth\] Handshake response received", "authenticated"),
+    (r"\[health\] Heartbeat started", "healthy"),
+    (r"\[skill\] Starting skill service", "skill_resolving"),
+    (r"\[skill\] Received (\d+ mcp tools|smart skill tool)", "skill_resolved"),
+    (r"Starting stdio MCP server", "mcp_server_started"),
+)
+
+# Runtime messages meaning startup cannot succeed at all
+DEFAULT_FATAL_PATTERNS: Sequence[str] = (
+    r"Permanent authentication failure",
+    r"Cannot recover from authentication failure",
+)
+
+# Reconnect announcement after a failed attempt (NATS unreachable, handshake
+# error...), see `RuntimeMainService.reconnect()`
+RETRY_PATTERN = r"Connection failed\. Attempt \d+\. Waiting (\d+(?:\.\d+)?)ms before reconnecting"
+
+
+class StartupTrace:
+    """Timestamps of each startup phase of one runtime process.
+
+    Phases recorded by the client itself:
+    - `spawn`: `start()` called
+    - `process_spawned`: runtime process running, stdio connected
+    - `session_initialized`: MCP `initialize` handshake done
+    Runtime phases in between come from `StartupProbe`.
+    """
+
+    def __init__(self) -> None:
+        self.started_at = time.time()
+        self._origin = time.monotonic()
+        self.phases: List[Tuple[str, float]] = [("spawn", 0.0)]
+        self.outcome: Optional[str] = None
+        self.error: Optional[str] = None
+        self.total_seconds: Optional[float] = None
+
+    def mark(self, phase: str, at: Optional[float] = None) -> None:
+        """Record `phase` (first occurrence only) at monotonic time `at` (default: now)."""
+        if any(name == phase for name, _ in self.phases):
+            return
+        elapsed = (time.monotonic() if at is None else at) - self._origin
+        self.phases.append((phase, max(0.0, elapsed)))
+
+    def finish(self, outcome: str, error: Optional[str] = None) -> None:
+        """Close the trace with `outcome` ("ready", "failed" or "timeout")."""
+        if self.outcome is not None:
+            return
+        self.outcome = outcome
+        self.error = error
+        self.total_seconds = time.monotonic() - self._origin
+
+    @property
+    def origin(self) -> float:
+        """`time.monotonic()` value when startup began."""
+        return self._origin
+
+    @property
+    def last_phase(self) -> str:
+        return max(self.phases, key=lambda phase: phase[1])[0]
+
+    def durations(self) -> Dict[str, float]:
+        """Seconds spent reaching each phase from the previous one."""
+        ordered = sorted(self.phases, key=lambda phase: phase[1])
+        result: Dict[str, float] = {}
+        previous = 0.0
+        for name, at in ordered:
+            result[name] = at - previous
+            previous = at
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        durations = self.durations()
+        return {
+            "started_at": self.started_at,
+            "outcome": self.outcome,
+            "error": self.error,
+            "total_seconds": None if self.total_seconds is None else round(self.total_seconds, 4),
+            "phases": [
+                {"name": name, "at_seconds": round(at, 4), "duration_seconds": round(durations[name], 4)}
+                for name, at in sorted(self.phases, key=lambda phase: phase[1])
+            ],
+        }
+
+    def __repr__(self) -> str:
+        steps = ", ".join(f"{name}@{at:.3f}s" for name, at in sorted(self.phases, key=lambda phase: phase[1]))
+        return f"StartupTrace({self.outcome or 'pending'}: {steps})"
+
+
+class StartupProbe:
+    """Classify runtime stderr lines into startup phases and fatal errors."""
+
+    def __init__(
+        self,
+        phase_patterns: Sequence[Tuple[str, str]] = DEFAULT_PHASE_PATTERNS,
+        fatal_patterns: Sequence[str] = DEFAULT_FATAL_PATTERNS,
+        retry_pattern: Optional[str] = RETRY_PATTERN,
+    ):
+        """Configure the probe.
+
+        Args:
+            phase_patterns: `(regex, phase name)` pairs matched against each line
+            fatal_patterns: Regexes marking a line as a fatal startup error.
+                Pass an empty sequence to always wait for the timeout.
+            retry_pattern: Regex whose first group is the reconnect delay in
+                milliseconds; None disables retry detection
+        """
+        self._phases: List[Tuple[Pattern[str], str]] = [(re.compile(p), name) for p, name in phase_patterns]
+        self._fatal: List[Pattern[str]] = [re.compile(p) for p in fatal_patterns]
+        self._retry: Optional[Pattern[str]] = re.compile(retry_pattern) if retry_pattern else None
+
+    def phase(self, line: str) -> Optional[str]:
+        """Return the phase announced by `line`, if any."""
+        for pattern, name in self._phases:
+            if pattern.search(line):
+                return name
+        return None
+
+    def is_fatal(self, line: str) -> bool:
+        """True when `line` reports an error that aborts startup."""
+        return any(pattern.search(line) for pattern in self._fatal)
+
+    def retry_delay(self, line: str) -> Optional[float]:
+        """Seconds until the runtime retries, when `line` announces a reconnect."""
+        if self._retry is None:
+            return None
+        match = self._retry.search(line)
+        return float(match.group(1)) / 1000.0 if match else None
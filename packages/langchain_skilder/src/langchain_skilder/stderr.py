@@ -0,0 +1,222 @@
+"""Bounded, non-blocking capture of the runtime process stderr.
+
+`stdio_client` hands the child's stderr to whatever file it is given and never
+reads it. With verbose logging the Node runtime can fill an undrained pipe and
+block on its next write, stalling tool calls. `StderrCapture` owns a dedicated
+pipe drained by a daemon thread, so draining keeps up even when the event loop
+is busy:
+
+- the last `max_lines` lines are kept in a ring buffer (`tail()`), attached to
+  startup and crash errors;
+- lines are optionally forwarded to Python `logging`, rate limited so a log
+  storm cannot flood handlers (suppressed lines are counted and reported);
+- listeners (see `add_listener()`) see every line as it arrives, e.g. to
+  follow the runtime startup phases.
+"""
+
+from typing import Callable, Deque, List, Optional, TextIO, Union
+from collections import deque
+import logging
+import os
+import re
+import threading
+import time
+
+DEFAULT_LOGGER_NAME = "langchain_skilder.runtime"
+
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+_LEVEL_RE = re.compile(r"\b(TRACE|DEBUG|INFO|WARN|WARNING|ERROR|FATAL)\b")
+_LEVELS = {
+    "TRACE": logging.DEBUG,
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARN": logging.WARNING,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "FATAL": logging.CRITICAL,
+}
+
+
+class StderrCapture:
+    """Drain a child process stderr into a ring buffer and, optionally, logging.
+
+    Usage (what `MCPClient` does for every runtime it spawns):
+        errlog = capture.open()           # pass as `errlog` to stdio_client
+        ... spawn the process ...
+        capture.attached()                # release the parent's write end
+        capture.tail()                    # recent lines, e.g. for errors
+    """
+
+    def __init__(
+        self,
+        max_lines: int = 200,
+        forward_to: Union[str, logging.Logger, None] = DEFAULT_LOGGER_NAME,
+        max_log_lines_per_second: float = 100.0,
+        max_line_length: int = 4096,
+    ):
+        """Configure the capture.
+
+        Args:
+            max_lines: Size of the ring buffer of recent lines
+            forward_to: Logger (or logger name) receiving each line; None disables forwarding
+            max_log_lines_per_second: Forwarding rate limit (burst of the same size)
+            max_line_length: Longer lines are truncated
+        """
+        self.max_lines = max_lines
+        self._lines: Deque[str] = deque(maxlen=max_lines)
+        self._lock = threading.Lock()
+        if isinstance(forward_to, str):
+            forward_to = logging.getLogger(forward_to)
+        self._logger: Optional[logging.Logger] = forward_to
+        self._rate = max_log_lines_per_second
+        self._tokens = max_log_lines_per_second
+        self._last_refill = time.monotonic()
+        self._max_line_length = max_line_length
+        self._write_file: Optional[TextIO] = None
+        self._thread: Optional[threading.Thread] = None
+        self._eof = threading.Event()
+        self.lines_total = 0
+        self.lines_suppressed = 0
+        self._pending_suppressed = 0
+        self._listeners: List[Callable[[str], None]] = []
+
+    def open(self) -> TextIO:
+        """Create a fresh pipe and return its write end for the child's stderr.
+
+        Resets the ring buffer; any previous pipe is closed first.
+        """
+        self.close()
+        with self._lock:
+            self._lines.clear()
+        # One event per pipe so a previous drain thread cannot flag this one
+        self._eof = threading.Event()
+        read_fd, write_fd = os.pipe()
+        self._write_file = os.fdopen(write_fd, "w")
+        self._thread = threading.Thread(
+            target=self._drain, args=(read_fd, self._eof), name="skilder-runtime-stderr", daemon=True
+        )
+        self._thread.start()
+        return self._write_file
+
+    def attached(self) -> None:
+        """Close the parent's copy of the write end once the child holds it.
+
+        The drain thread then sees end-of-file as soon as the child exits.
+        """
+        if self._write_file is not None:
+            try:
+                self._write_file.close()
+            except OSError:
+                pass
+            self._write_file = None
+
+    def close(self) -> None:
+        """Release the write end. The drain thread owns the read end and
+        closes it at end-of-file, i.e. once the child has exited too."""
+        self.attached()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            # Give the drain thread a moment to consume the last lines
+            thread.join(timeout=0.1)
+
+    def after_fork(self) -> None:
+        """Forget the drain thread and pipe of the parent, in a forked child.
+
+        The thread does not exist in the child and the lock may have been held
+        at fork time. The recent lines are kept.
+        """
+        self._lock = threading.Lock()
+        self._thread = None
+        self._eof = threading.Event()
+        if self._write_file is not None:
+            # The child's copy would keep the parent's pipe open
+            try:
+                self._write_file.close()
+            except OSError:
+                pass
+            self._write_file = None
+
+    @property
+    def eof(self) -> bool:
+        """True once the child closed its stderr (usually: it exited)."""
+        return self._eof.is_set()
+
+    def add_listener(self, listener: Callable[[str], None]) -> None:
+        """Call `listener(line)` for every captured line.
+
+        Listeners run on the drain thread: they must be quick and thread-safe
+        (hop to an event loop with `loop.call_soon_threadsafe`). Exceptions
+        they raise are ignored.
+        """
+        self._listeners = self._listeners + [listener]
+
+    def remove_listener(self, listener: Callable[[str], None]) -> None:
+        self._listeners = [registered for registered in self._listeners if registered is not listener]
+
+    def tail(self, lines: Optional[int] = None) -> List[str]:
+        """Return the most recent captured lines (all buffered lines by default)."""
+        with self._lock:
+            recent = list(self._lines)
+        return recent if lines is None else recent[-lines:]
+
+    def feed(self, line: str) -> None:
+        """Record one line (called by the drain thread)."""
+        line = _ANSI_RE.sub("", line).rstrip("\r")
+        if not line.strip():
+            return
+        if len(line) > self._max_line_length:
+            line = line[:self._max_line_length] + "..."
+        with self._lock:
+            self._lines.append(line)
+            self.lines_total += 1
+        if self._logger is not None:
+            self._forward(line)
+        for listener in self._listeners:
+            try:
+                listener(line)
+            except Exception:
+                pass
+
+    def _forward(self, line: str) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._rate, self._tokens + (now - self._last_refill) * self._rate)
+        self._last_refill = now
+        if self._tokens < 1.0:
+            self.lines_suppressed += 1
+            self._pending_suppressed += 1
+            return
+        self._tokens -= 1.0
+        assert self._logger is not None
+        if self._pending_suppressed:
+            self._logger.warning("%d runtime stderr lines suppressed by rate limit", self._pending_suppressed)
+            self._pending_suppressed = 0
+        match = _LEVEL_RE.search(line)
+        level = _LEVELS[match.group(1)] if match else logging.INFO
+        self._logger.log(level, "%s", line)
+
+    def _drain(self, read_fd: int, eof: threading.Event) -> None:
+        buffer = b""
+        try:
+            while True:
+                try:
+                    chunk = os.read(read_fd, 65536)
+                except OSError:
+                    break
+                if not chunk:
+                    break
+                buffer += chunk
+                *complete, buffer = buffer.split(b"\n")
+                for raw in complete:
+                    self.feed(raw.decode("utf-8", errors="replace"))
+                if len(buffer) > self._max_line_length * 4:
+                    # Unterminated, oversized output: flush it as a line
+                    self.feed(buffer.decode("utf-8", errors="replace"))
+                    buffer = b""
+            if buffer:
+                self.feed(buffer.decode("utf-8", errors="replace"))
+        finally:
+            try:
+                os.close(read_fd)
+            except OSError:
+                pass
+            eof.set()
@@ -0,0 +1,231 @@
+"""Early dispatch of tool calls streamed by the model.
+
+In a ReAct loop, a tool call only starts once the model has streamed its
+whole message, including the calls and text that follow it. On multi-call
+turns the first calls could already be running while the model is still
+generating the next ones.
+
+`EarlyToolDispatcher` is a LangChain callback handler for the chat model. It
+assembles the streamed tool call chunks and, as soon as the arguments of a
+call parse as a complete JSON object that is valid for the tool's input
+schema, sends the call through its `MCPClient`. When the model run ends, the
+dispatched calls are reconciled with the final message: a call missing from
+it, or whose name or arguments differ, is cancelled.
+
+The tool node then runs as usual: `MCPClient.call_tool` (used by `MCPTool`,
+`MCPSkill` adapter tools and `SkilderToolNode`) claims the early call with
+the same tool and arguments and awaits its result instead of sending a new
+request. A call left unclaimed for `ttl_seconds` is cancelled by a timer
+scheduled when it is dispatched.
+
+    dispatcher = EarlyToolDispatcher(mcp)
+    model = model.with_config(callbacks=[dispatcher])
+    agent = create_react_agent(model, await mcp.get_langchain_tools())
+
+Only tools annotated `readOnlyHint` or `idempotentHint` start early by
+default: with `dispatch="all"`, a call runs even if the agent would not have
+executed it (e.g. interrupted before the tool node for approval). Early
+calls use the client's `tool_priority` lane and the trace context of the
+model run.
+"""
+
+from typing import TYPE_CHECKING, Any, AsyncIterator, Deque, Dict, Iterator, Optional
+from collections import deque
+from uuid import UUID
+import asyncio
+import contextvars
+import json
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from .coalescing import CallCoalescer
+
+if TYPE_CHECKING:
+    from .mcp_only import MCPClient
+
+EARLY_DISPATCH_MODES = ("idempotent", "all")
+
+# Set in the tasks of early calls, so their own `call_tool` does not claim them
+_EARLY_CALL: contextvars.ContextVar[bool] = contextvars.ContextVar("skilder_early_call", default=False)
+
+
+class _EarlyCall:
+    __slots__ = ("call_id", "name", "arguments", "key", "task", "timer")
+
+    def __init__(self, call_id: str, name: str, arguments: Dict[str, Any], key: str, task: asyncio.Task):
+        self.call_id = call_id
+        self.name = name
+        self.arguments = arguments
+        self.key = key
+        self.task = task
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class EarlyToolDispatcher(AsyncCallbackHandler):
+    """Start the tool calls of a streaming model before its message is complete."""
+
+    def __init__(
+        self,
+        client: "MCPClient",
+        dispatch: str = "idempotent",
+        ttl_seconds: float = 60.0,
+    ):
+        """Attach the dispatcher to `client`.
+
+        Args:
+            client: Client running the early calls; its `call_tool` claims them
+            dispatch: Which calls start early: "idempotent" (tools annotated
+                `readOnlyHint` or `idempotentHint`) or "all"
+            ttl_seconds: How long a result waits for its claim before the
+                call is cancelled
+
+        Raises:
+            ValueError: If `dispatch` is unknown
+        """
+        if dispatch not in EARLY_DISPATCH_MODES:
+            raise ValueError(f"Unknown dispatch mode '{dispatch}'; expected one of {list(EARLY_DISPATCH_MODES)}")
+        super().__init__()
+        self.client = client
+        self.dispatch = dispatch
+        self.ttl_seconds = ttl_seconds
+        # Model run -> tool call index -> streamed chunks assembled so far
+        self._chunks: Dict[UUID, Dict[int, Dict[str, Any]]] = {}
+        # Model run -> tool call index -> call dispatched from that run
+        self._runs: Dict[UUID, Dict[int, _EarlyCall]] = {}
+        # Call key -> dispatched calls waiting for their claim, oldest first
+        self._pending: Dict[str, Deque[_EarlyCall]] = {}
+        self.dispatched = 0
+        self.claimed = 0
+        self.discarded = 0
+        self.expired = 0
+        client.early_dispatcher = self
+
+    # A handler implementing these taps makes `BaseChatModel.ainvoke` use the
+    # streaming API; the chunks are then reported to `on_llm_new_token`.
+    def tap_output_aiter(self, run_id: UUID, output: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        return output
+
+    def tap_output_iter(self, run_id: UUID, output: Iterator[Any]) -> Iterator[Any]:
+        return output
+
+    async def on_llm_new_token(self, token: Any, *, chunk: Any = None, run_id: UUID, **kwargs: Any) -> None:
+        message = getattr(chunk, "message", None)
+        for piece in getattr(message, "tool_call_chunks", None) or []:
+            index = piece.get("index")
+            if index is None:
+                continue
+            streamed = self._chunks.setdefault(run_id, {}).setdefault(index, {"id": None, "name": None, "args": ""})
+            if piece.get("id"):
+                streamed["id"] = piece["id"]
+            if piece.get("name"):
+                streamed["name"] = piece["name"]
+            streamed["args"] += piece.get("args") or ""
+            if index not in self._runs.get(run_id, {}):
+                self._try_dispatch(run_id, index, streamed)
+
+    def _try_dispatch(self, run_id: UUID, index: int, streamed: Dict[str, Any]) -> None:
+        """Dispatch a streamed call once it is complete and valid."""
+        if not streamed["id"] or not streamed["name"] or not streamed["args"].rstrip().endswith("}"):
+            return
+        try:
+            arguments = json.loads(streamed["args"])
+        except ValueError:
+            return
+        entry = self.client.catalog_entry(streamed["name"])
+        if entry is None:
+            return
+        if self.dispatch == "idempotent":
+            annotations = entry.annotations or {}
+            if not (annotations.get("readOnlyHint") or annotations.get("idempotentHint")):
+                return
+        if self.client.validate_call(streamed["name"], arguments) is not None:
+            return  # left to the tool node, which reports the problem
+        key = CallCoalescer.key(streamed["name"], arguments)
+        if key is None:
+            return
+        task = asyncio.ensure_future(self._run(streamed["name"], arguments))
+        # Failures are raised to the claimer; unclaimed ones are dropped
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        early = _EarlyCall(streamed["id"], streamed["name"], arguments, key, task)
+        early.timer = asyncio.get_running_loop().call_later(self.ttl_seconds, self._expire, early)
+        self._runs.setdefault(run_id, {})[index] = early
+        self._pending.setdefault(key, deque()).append(early)
+        self.dispatched += 1
+
+    async def _run(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        _EARLY_CALL.set(True)
+        return await self.client.call_tool(tool_name, arguments, priority=self.client.tool_priority)
+
+    async def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        """Keep the early calls found in the final message, cancel the others."""
+        self._chunks.pop(run_id, None)
+        dispatched = self._runs.pop(run_id, {})
+        if not dispatched:
+            return
+        final: Dict[str, Dict[str, Any]] = {}
+        for generations in response.generations:
+            for generation in generations:
+                for call in getattr(getattr(generation, "message", None), "tool_calls", None) or []:
+                    final[call["id"]] = call
+        for early in dispatched.values():
+            call = final.get(early.call_id)
+            if (call is None or call["name"] != early.name or call["args"] != early.arguments) and self._drop(early):
+                self.discarded += 1
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        """Cancel the calls dispatched by a failed model run."""
+        self._chunks.pop(run_id, None)
+        for early in self._runs.pop(run_id, {}).values():
+            if self._drop(early):
+                self.discarded += 1
+
+    def claim(self, tool_name: str, arguments: Dict[str, Any]) -> Optional[asyncio.Task]:
+        """Return the early call matching a tool call, or None to send it normally."""
+        if _EARLY_CALL.get() or not self._pending:
+            return None
+        key = CallCoalescer.key(tool_name, arguments)
+        queue = self._pending.get(key) if key is not None else None
+        if not queue:
+            return None
+        early = queue.popleft()
+        if not queue:
+            del self._pending[early.key]
+        if early.timer is not None:
+            early.timer.cancel()
+        self.claimed += 1
+        return early.task
+
+    def _drop(self, early: _EarlyCall) -> bool:
+        """Cancel an unclaimed early call; False when it was already claimed."""
+        queue = self._pending.get(early.key)
+        if queue is None or early not in queue:
+            return False
+        queue.remove(early)
+        if not queue:
+            del self._pending[early.key]
+        if early.timer is not None:
+            early.timer.cancel()
+        early.task.cancel()
+        return True
+
+    def _expire(self, early: _EarlyCall) -> None:
+        """Cancel a call still unclaimed `ttl_seconds` after its dispatch."""
+        if self._drop(early):
+            self.expired += 1
+
+    def reset(self) -> None:
+        """Forget the calls of a previous event loop (e.g. in a forked child)."""
+        self._chunks = {}
+        self._runs = {}
+        self._pending = {}
+
+    def stats(self) -> Dict[str, int]:
+        """Return the early calls dispatched, claimed, discarded, expired and pending."""
+        return {
+            "dispatched": self.dispatched,
+            "claimed": self.claimed,
+            "discarded": self.discarded,
+            "expired": self.expired,
+            "pending": sum(len(queue) for queue in self._pending.values()),
+        }
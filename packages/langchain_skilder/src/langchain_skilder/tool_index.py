@@ -0,0 +1,270 @@
+"""Relevance index over a skill's tool catalog.
+
+Large skills can expose hundreds of tools; handing all of them to an agent
+inflates every prompt. `ToolIndex` ranks the cached catalog against a free
+text query so that only the top-k relevant tools are bound to the model.
+
+Ranking:
+- Default: Okapi BM25 over tool names, descriptions and input schema fields
+  (property names, property descriptions and enum values).
+- Optional: a pluggable `embed_fn` that maps a batch of texts to vectors.
+  Tools are then ranked by cosine similarity with the embedded query.
+
+Updates are incremental: `update()` compares each tool against the indexed
+version by signature and only re-indexes (or re-embeds) tools that were added
+or changed, dropping the ones that disappeared.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from collections import Counter
+import hashlib
+import heapq
+import json
+import math
+import re
+
+EmbedFn = Callable[[List[str]], Sequence[Sequence[float]]]
+
+_TOKEN_RE = re.compile(r"[A-Za-z0-9]+")
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "that", "the", "this", "to", "with",
+})
+# Name tokens are repeated so that a match on the tool name outweighs an
+# incidental match deep inside a description.
+_NAME_WEIGHT = 3
+
+
+def _tokenize(text: str) -> List[str]:
+    """Split text into lowercase terms, breaking snake_case and camelCase."""
+    tokens: List[str] = []
+    for word in _TOKEN_RE.findall(text):
+        for part in _CAMEL_RE.findall(word) or [word]:
+            part = part.lower()
+            if part not in _STOPWORDS:
+                tokens.append(part)
+    return tokens
+
+
+def _schema_text(schema: Any) -> List[str]:
+    """Collect searchable text from a JSON schema (names, descriptions, enums)."""
+    parts: List[str] = []
+    if not isinstance(schema, dict):
+        return parts
+    description = schema.get("description")
+    if isinstance(description, str):
+        parts.append(description)
+    for value in schema.get("enum", []) or []:
+        if isinstance(value, str):
+            parts.append(value)
+    properties = schema.get("properties")
+    if isinstance(properties, dict):
+        for prop_name, prop_schema in properties.items():
+            parts.append(str(prop_name))
+            parts.extend(_schema_text(prop_schema))
+    items = schema.get("items")
+    if isinstance(items, dict):
+        parts.extend(_schema_text(items))
+    return parts
+
+
+def tool_signature(tool: Any) -> str:
+    """Return a stable hash of a tool's description and input schema."""
+    payload = json.dumps(
+        [getattr(tool, "description", None) or "", getattr(tool, "inputSchema", None) or {}],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def tool_document(tool: Any) -> str:
+    """Return the text representation of a tool used for indexing."""
+    name = getattr(tool, "name", "")
+    parts = [name, getattr(tool, "description", None) or ""]
+    parts.extend(_schema_text(getattr(tool, "inputSchema", None) or {}))
+    return "\n".join(part for part in parts if part)
+
+
+class ToolIndex:
+    """Incremental top-k retrieval over MCP tool metadata.
+
+    Tools are any objects exposing `name`, `description` and `inputSchema`
+    attributes (e.g. `mcp.types.Tool`).
+
+    Example:
+        index = ToolIndex()
+        index.update(catalog)
+        names = index.search("create a github issue", k=5)
+    """
+
+    def __init__(self, embed_fn: Optional[EmbedFn] = None, k1: float = 1.5, b: float = 0.75):
+        """Create an empty index.
+
+        Args:
+            embed_fn: Optional batch embedding function. When provided, search
+                ranks tools by cosine similarity instead of BM25.
+            k1: BM25 term frequency saturation.
+            b: BM25 document length normalization.
+        """
+        self._embed_fn = embed_fn
+        self._k1 = k1
+        self._b = b
+        self._signatures: Dict[str, str] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._doc_terms: Dict[str, Counter] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._vectors: Dict[str, Tuple[List[float], float]] = {}
+        # BM25 length normalization per document, recomputed lazily after updates
+        self._length_norms: Optional[Dict[str, float]] = None
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._signatures
+
+    def update(self, tools: Iterable[Any]) -> Dict[str, List[str]]:
+        """Synchronize the index with a full catalog snapshot.
+
+        Only tools whose signature changed are re-indexed. Tools absent from
+        `tools` are removed.
+
+        Returns:
+            Dict with the `added`, `changed` and `removed` tool names.
+        """
+        seen: Dict[str, Any] = {}
+        for tool in tools:
+            seen[tool.name] = tool
+
+        removed = [name for name in self._signatures if name not in seen]
+        for name in removed:
+            self._remove(name)
+
+        added: List[str] = []
+        changed: List[str] = []
+        pending_embeddings: List[Tuple[str, str]] = []
+        for name, tool in seen.items():
+            signature = getattr(tool, "signature", None) or tool_signature(tool)
+            previous = self._signatures.get(name)
+            if previous == signature:
+                continue
+            if previous is None:
+                added.append(name)
+            else:
+                changed.append(name)
+                self._remove(name)
+            document = tool_document(tool)
+            self._add(name, signature, document)
+            if self._embed_fn is not None:
+                pending_embeddings.append((name, document))
+
+        if pending_embeddings:
+            assert self._embed_fn is not None
+            vectors = self._embed_fn([document for _, document in pending_embeddings])
+            for (name, _), vector in zip(pending_embeddings, vectors):
+                self._vectors[name] = _with_norm(vector)
+
+        return {"added": added, "changed": changed, "removed": removed}
+
+    def clear(self) -> None:
+        """Drop every indexed tool."""
+        self._signatures.clear()
+        self._doc_lengths.clear()
+        self._doc_terms.clear()
+        self._postings.clear()
+        self._vectors.clear()
+        self._total_length = 0
+        self._length_norms = None
+
+    def search(self, query: str, k: int = 5) -> List[str]:
+        """Return up to `k` tool names ranked by relevance to `query`.
+
+        With BM25, tools that share no term with the query are not returned.
+        """
+        return [name for name, _ in self.scores(query, k)]
+
+    def scores(self, query: str, k: int = 5) -> List[Tuple[str, float]]:
+        """Return up to `k` `(tool name, score)` pairs, best first."""
+        if k <= 0 or not self._signatures:
+            return []
+        if self._embed_fn is not None:
+            scored = self._score_embeddings(query)
+        else:
+            scored = self._score_bm25(query)
+        # Ties are broken by name to keep results deterministic.
+        return heapq.nsmallest(k, scored.items(), key=lambda item: (-item[1], item[0]))
+
+    def _add(self, name: str, signature: str, document: str) -> None:
+        tokens = _tokenize(document)
+        tokens.extend(_tokenize(name) * (_NAME_WEIGHT - 1))
+        terms = Counter(tokens)
+        self._signatures[name] = signature
+        self._doc_terms[name] = terms
+        self._doc_lengths[name] = len(tokens)
+        self._total_length += len(tokens)
+        self._length_norms = None
+        for term, count in terms.items():
+            self._postings.setdefault(term, {})[name] = count
+
+    def _remove(self, name: str) -> None:
+        self._signatures.pop(name, None)
+        self._vectors.pop(name, None)
+        terms = self._doc_terms.pop(name, None)
+        self._total_length -= self._doc_lengths.pop(name, 0)
+        self._length_norms = None
+        if not terms:
+            return
+        for term in terms:
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(name, None)
+            if not posting:
+                del self._postings[term]
+
+    def _get_length_norms(self) -> Dict[str, float]:
+        if self._length_norms is None:
+            avg_length = (self._total_length / len(self._doc_lengths)) or 1.0
+            k1, b = self._k1, self._b
+            self._length_norms = {
+                name: k1 * (1.0 - b + b * length / avg_length)
+                for name, length in self._doc_lengths.items()
+            }
+        return self._length_norms
+
+    def _score_bm25(self, query: str) -> Dict[str, float]:
+        doc_count = len(self._signatures)
+        norms = self._get_length_norms()
+        k1_plus_one = self._k1 + 1.0
+        scores: Dict[str, float] = {}
+        for term in set(_tokenize(query)):
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            df = len(posting)
+            weight = math.log(1.0 + (doc_count - df + 0.5) / (df + 0.5)) * k1_plus_one
+            for name, tf in posting.items():
+                scores[name] = scores.get(name, 0.0) + weight * tf / (tf + norms[name])
+        return scores
+
+    def _score_embeddings(self, query: str) -> Dict[str, float]:
+        assert self._embed_fn is not None
+        query_vector, query_norm = _with_norm(self._embed_fn([query])[0])
+        if query_norm == 0.0:
+            return {}
+        scores: Dict[str, float] = {}
+        for name, (vector, norm) in self._vectors.items():
+            if norm == 0.0:
+                continue
+            dot = sum(a * b for a, b in zip(query_vector, vector))
+            scores[name] = dot / (norm * query_norm)
+        return scores
+
+
+def _with_norm(vector: Sequence[float]) -> Tuple[List[float], float]:
+    values = [float(value) for value in vector]
+    return values, math.sqrt(sum(value * value for value in values))
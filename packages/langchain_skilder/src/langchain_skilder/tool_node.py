@@ -0,0 +1,168 @@
+"""Batched tool node: run every tool call of an `AIMessage` at once.
+
+LangGraph's default tool node invokes each `MCPTool` on its own. When the
+model emits several tool calls in one step, `SkilderToolNode` handles them as
+a batch on the shared `MCPClient` session:
+
+1. every call is validated up front (known tool, arguments matching the
+   tool's input schema); invalid calls are answered with an error
+   `ToolMessage` without reaching the runtime;
+2. the valid calls are dispatched concurrently, so a step costs about
+   the latency of its slowest call, not the sum, as long as the batch fits
+   in the client's `max_concurrent_calls` (16 by default); identical calls
+   of read-only tools share one request, through the client's `coalescer`
+   or, when it has none, the node's own;
+3. one `ToolMessage` per call is returned, in the order of the tool calls,
+   within the client's `result_budget` when one is set (`skilder_read_more`
+   calls are answered client-side).
+
+It is a LangChain `Runnable` and depends on nothing from LangGraph, so it
+can be used as a graph node directly:
+
+    graph.add_node("tools", SkilderToolNode(mcp))
+"""
+
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, Union
+import asyncio
+
+from langchain_core.messages import AIMessage, ToolCall, ToolMessage
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from .budget import CONTINUATION_TOOL_NAME
+from .coalescing import CallCoalescer
+from .mcp_only import (
+    PRIORITY_CONFIG_KEY,
+    REQUEST_ID_CONFIG_KEY,
+    TRACEPARENT_CONFIG_KEY,
+    MCPClient,
+    MCPTool,
+    format_tool_result,
+)
+
+class SkilderToolNode(Runnable):
+    """Execute all the tool calls of the last `AIMessage` concurrently."""
+
+    def __init__(
+        self,
+        client: MCPClient,
+        handle_errors: bool = True,
+        messages_key: str = "messages",
+        name: str = "tools",
+        coalescer: Optional[CallCoalescer] = None,
+    ):
+        """Configure the node.
+
+        Args:
+            client: Client whose session runs the calls
+            handle_errors: Turn failed calls into error `ToolMessage`s; when
+                False the first failure is raised
+            messages_key: State key holding the messages when the input is a dict
+            name: Node name
+            coalescer: Shares identical calls of a batch when the client has
+                no coalescer of its own. Defaults to `CallCoalescer()`
+                (tools annotated `readOnlyHint`).
+        """
+        self.client = client
+        self.handle_errors = handle_errors
+        self.messages_key = messages_key
+        self.name = name
+        self.coalescer = coalescer if coalescer is not None else CallCoalescer()
+
+    def _tool_calls(self, input: Any) -> List[ToolCall]:
+        if isinstance(input, dict):
+            messages = input.get(self.messages_key, [])
+        elif isinstance(input, AIMessage):
+            messages = [input]
+        else:
+            messages = input
+        for message in reversed(messages):
+            if isinstance(message, AIMessage):
+                return list(message.tool_calls)
+        raise ValueError("No AIMessage found in the input")
+
+    async def _dispatch(self, call: ToolCall, config: Optional[RunnableConfig]) -> Tuple[str, bool]:
+        """Run one call and return `(content, is_error)`."""
+
+        def send() -> Awaitable[Dict[str, Any]]:
+            return self.client.call_tool(
+                call["name"],
+                call["args"],
+                priority=MCPTool._config_value(config, PRIORITY_CONFIG_KEY) or self.client.tool_priority,
+                traceparent=MCPTool._config_value(config, TRACEPARENT_CONFIG_KEY),
+                request_id=MCPTool._config_value(config, REQUEST_ID_CONFIG_KEY),
+            )
+
+        try:
+            key = CallCoalescer.key(call["name"], call["args"])
+            entry = self.client.catalog_entry(call["name"])
+            if (
+                self.client.coalescer is None
+                and key is not None
+                and self.coalescer.coalesces(call["name"], entry.annotations if entry is not None else None)
+            ):
+                result = await self.coalescer.run(call["name"], key, send)
+            else:
+                result = await send()
+        except Exception as error:
+            if not self.handle_errors:
+                raise
+            return f"Error calling {call['name']}: {error}", True
+        content = self.client._shape_result(call["name"], format_tool_result(call["name"], result))
+        return content, bool(result.get("isError"))
+
+    async def ainvoke(
+        self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> Union[Dict[str, List[ToolMessage]], List[ToolMessage]]:
+        """Run the tool calls of the last `AIMessage` in `input`.
+
+        Args:
+            input: A state dict with `messages_key`, a message list, or an `AIMessage`
+
+        Returns:
+            `{messages_key: [ToolMessage, ...]}` for dict input, else the list
+        """
+        calls = self._tool_calls(input)
+        await self.client.get_langchain_tools()  # loads the catalog used for validation
+
+        outcomes: List[Optional[Tuple[str, bool]]] = [None] * len(calls)
+        dispatched: List[int] = []
+        for index, call in enumerate(calls):
+            if self.client.result_budget is not None and call["name"] == CONTINUATION_TOOL_NAME:
+                # Continuations of truncated results are served client-side
+                args = call.get("args")
+                handle = args.get("handle") if isinstance(args, dict) else None
+                outcomes[index] = self.client.result_budget.continuation(handle)
+                continue
+            problem = self.client.validate_call(call["name"], call.get("args"))
+            if problem is not None:
+                if not self.handle_errors:
+                    raise ValueError(problem)
+                outcomes[index] = (problem, True)
+                continue
+            dispatched.append(index)
+
+        # Identical calls share one request (see `_dispatch`)
+        results = await asyncio.gather(*(self._dispatch(calls[index], config) for index in dispatched))
+        for index, outcome in zip(dispatched, results):
+            outcomes[index] = outcome
+
+        messages = [
+            ToolMessage(
+                content=content,
+                name=call["name"],
+                tool_call_id=call["id"],
+                status="error" if is_error else "success",
+            )
+            for call, (content, is_error) in zip(calls, outcomes)  # type: ignore[misc]
+        ]
+        if isinstance(input, dict):
+            return {self.messages_key: messages}
+        return messages
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        """Synchronous entry point, only usable outside a running event loop."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.ainvoke(input, config, **kwargs))
+        raise RuntimeError("SkilderToolNode.invoke() cannot run inside an event loop; use ainvoke()")
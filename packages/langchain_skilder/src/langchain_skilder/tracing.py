@@ -0,0 +1,243 @@
+"""W3C trace context propagation and client-side spans for tool calls.
+
+A tool call crosses Python, stdio, the Node runtime, NATS, the backend and
+the MCP server. To attribute its latency to a hop, every `tools/call` request
+carries the W3C trace context (`traceparent`, `tracestate`) and an optional
+caller-supplied request id (`skilder/requestId`) in its `_meta`, and the
+client records a span for it with wall-clock start and end times.
+
+The parent of a call span is, in order:
+1. a `traceparent` passed to `MCPClient.call_tool` (or set in the LangChain
+   run config of an `MCPTool`),
+2. the context set with `trace_context(...)`,
+3. the current OpenTelemetry span, when `opentelemetry-api` is installed,
+4. none: the span starts a new trace.
+
+Finished spans are kept in a bounded buffer (`CallTracer.spans()`) and passed
+to an optional exporter, e.g. to forward them to a tracing backend.
+"""
+
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+from collections import deque
+import contextlib
+import contextvars
+import logging
+import re
+import secrets
+import time
+
+try:  # optional: inherit the caller's OpenTelemetry span
+    from opentelemetry import trace as otel_trace
+except ImportError:  # pragma: no cover - depends on the environment
+    otel_trace = None
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_META_KEY = "skilder/requestId"
+
+_TRACEPARENT = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+# (traceparent, tracestate) set by `trace_context()`
+_current: contextvars.ContextVar[Optional[Tuple[str, Optional[str]]]] = contextvars.ContextVar(
+    "skilder_trace_context", default=None
+)
+
+
+def parse_traceparent(traceparent: str) -> Optional[Tuple[str, str, str]]:
+    """Return `(trace_id, parent_span_id, flags)` of a valid `traceparent`, else None."""
+    match = _TRACEPARENT.match(traceparent.strip().lower())
+    if match is None or match.group(1) == "ff":
+        return None
+    _, trace_id, span_id, flags = match.groups()
+    if trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+        return None
+    return trace_id, span_id, flags
+
+
+def format_traceparent(trace_id: str, span_id: str, sampled: bool = True) -> str:
+    return f"00-{trace_id}-{span_id}-{'01' if sampled else '00'}"
+
+
+@contextlib.contextmanager
+def trace_context(traceparent: str, tracestate: Optional[str] = None) -> Iterator[None]:
+    """Make tool calls in this block (and its tasks) children of `traceparent`.
+
+    Raises:
+        ValueError: If `traceparent` is not a valid W3C trace context
+    """
+    if parse_traceparent(traceparent) is None:
+        raise ValueError(f"Invalid traceparent '{traceparent}'")
+    token = _current.set((traceparent, tracestate))
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def _otel_parent() -> Optional[Tuple[str, Optional[str]]]:
+    if otel_trace is None:
+        return None
+    context = otel_trace.get_current_span().get_span_context()
+    if not context.is_valid:
+        return None
+    traceparent = format_traceparent(
+        format(context.trace_id, "032x"), format(context.span_id, "016x"), bool(context.trace_flags & 0x01)
+    )
+    tracestate = context.trace_state.to_header() if context.trace_state else None
+    return traceparent, tracestate or None
+
+
+class ToolCallSpan:
+    """Client-side span of one `tools/call` request."""
+
+    __slots__ = (
+        "name", "tool_name", "trace_id", "span_id", "parent_span_id", "sampled", "tracestate",
+        "request_id", "attempt", "start_time_ns", "sent_time_ns", "end_time_ns", "status", "error",
+        "attributes", "_started",
+    )
+
+    def __init__(
+        self,
+        tool_name: str,
+        trace_id: str,
+        parent_span_id: Optional[str],
+        sampled: bool = True,
+        tracestate: Optional[str] = None,
+        request_id: Optional[str] = None,
+        attempt: int = 1,
+    ):
+        self.name = f"tools/call {tool_name}"
+        self.tool_name = tool_name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.sampled = sampled
+        self.tracestate = tracestate
+        self.request_id = request_id
+        self.attempt = attempt
+        self.start_time_ns = time.time_ns()
+        self.sent_time_ns: Optional[int] = None
+        self.end_time_ns: Optional[int] = None
+        self.status: Optional[str] = None
+        self.error: Optional[str] = None
+        self.attributes: Dict[str, Any] = {}
+        self._started = time.perf_counter_ns()
+
+    @property
+    def traceparent(self) -> str:
+        """`traceparent` announcing this span as the parent of downstream hops."""
+        return format_traceparent(self.trace_id, self.span_id, self.sampled)
+
+    def meta(self) -> Dict[str, Any]:
+        """`_meta` entries propagating the span to the runtime."""
+        meta: Dict[str, Any] = {"traceparent": self.traceparent}
+        if self.tracestate:
+            meta["tracestate"] = self.tracestate
+        if self.request_id:
+            meta[REQUEST_ID_META_KEY] = self.request_id
+        return meta
+
+    def _now_ns(self) -> int:
+        # Wall-clock start plus a monotonic offset: immune to clock jumps mid-call
+        return self.start_time_ns + (time.perf_counter_ns() - self._started)
+
+    def mark_sent(self) -> None:
+        """Record when the request left the client (after queueing and rate limits)."""
+        self.sent_time_ns = self._now_ns()
+
+    def finish(self, status: str, error: Optional[BaseException] = None) -> None:
+        self.end_time_ns = self._now_ns()
+        self.status = status
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        if self.end_time_ns is None:
+            return None
+        return (self.end_time_ns - self.start_time_ns) / 1e9
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "tool_name": self.tool_name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "request_id": self.request_id,
+            "attempt": self.attempt,
+            "start_time_ns": self.start_time_ns,
+            "sent_time_ns": self.sent_time_ns,
+            "end_time_ns": self.end_time_ns,
+            "duration_seconds": self.duration_seconds,
+            "status": self.status,
+            "error": self.error,
+            "attributes": dict(self.attributes),
+        }
+
+    def __repr__(self) -> str:
+        return f"ToolCallSpan({self.name!r}, trace_id={self.trace_id!r}, status={self.status!r})"
+
+
+class CallTracer:
+    """Create tool call spans, keep the latest ones and export them."""
+
+    def __init__(self, exporter: Optional[Callable[[ToolCallSpan], None]] = None, max_spans: int = 1000):
+        """Configure the tracer.
+
+        Args:
+            exporter: Called with every finished span (exceptions are logged
+                and ignored)
+            max_spans: Finished spans kept for `spans()`
+        """
+        self.exporter = exporter
+        self._spans: Deque[ToolCallSpan] = deque(maxlen=max_spans)
+
+    def start_span(
+        self,
+        tool_name: str,
+        traceparent: Optional[str] = None,
+        tracestate: Optional[str] = None,
+        request_id: Optional[str] = None,
+        attempt: int = 1,
+    ) -> ToolCallSpan:
+        """Start the span of one call, child of the resolved parent context.
+
+        Raises:
+            ValueError: If an explicit `traceparent` is invalid
+        """
+        parent: Optional[Tuple[str, Optional[str]]] = None
+        if traceparent is not None:
+            if parse_traceparent(traceparent) is None:
+                raise ValueError(f"Invalid traceparent '{traceparent}'")
+            parent = (traceparent, tracestate)
+        else:
+            parent = _current.get() or _otel_parent()
+        if parent is None:
+            return ToolCallSpan(tool_name, secrets.token_hex(16), None, request_id=request_id, attempt=attempt)
+        trace_id, parent_span_id, flags = parse_traceparent(parent[0])  # type: ignore[misc]
+        return ToolCallSpan(
+            tool_name,
+            trace_id,
+            parent_span_id,
+            sampled=bool(int(flags, 16) & 0x01),
+            tracestate=parent[1],
+            request_id=request_id,
+            attempt=attempt,
+        )
+
+    def end_span(self, span: ToolCallSpan, status: str, error: Optional[BaseException] = None) -> None:
+        """Finish `span`, record it and hand it to the exporter."""
+        span.finish(status, error)
+        self._spans.append(span)
+        if self.exporter is not None:
+            try:
+                self.exporter(span)
+            except Exception:
+                logger.exception("Span exporter failed")
+
+    def spans(self) -> List[ToolCallSpan]:
+        """Finished spans, oldest first."""
+        return list(self._spans)
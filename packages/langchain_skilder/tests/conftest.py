@@ -0,0 +1,34 @@
+import json
+import os
+import sys
+import pytest
+
+from langchain_skilder import runtime
+from langchain_skilder.runtime import RUNTIME_PACKAGE, RuntimeLocator
+
+# Runtime versions requested by the tests
+RUNTIME_VERSIONS = ("latest", "1.2.3", "1.5.0", "2.0.0")
+
+
+@pytest.fixture(scope="session")
+def runtime_cache(tmp_path_factory):
+    """Runtime cache holding a placeholder install of every tested version."""
+    cache = str(tmp_path_factory.mktemp("runtime-cache"))
+    locator = RuntimeLocator(cache_dir=cache)
+    for version in RUNTIME_VERSIONS:
+        package = os.path.join(locator.install_dir(version), "node_modules", *RUNTIME_PACKAGE.split("/"))
+        os.makedirs(os.path.join(package, "dist"))
+        with open(os.path.join(package, "dist", "index.js"), "w") as script:
+            script.write("// runtime\n")
+        with open(os.path.join(package, "package.json"), "w") as manifest:
+            json.dump({"name": RUNTIME_PACKAGE, "bin": {"runtime": "dist/index.js"}}, manifest)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def default_runtime(runtime_cache, monkeypatch):
+    """Resolve the runtime of clients created without a locator from the test cache.
+
+    The interpreter stands in for node; tests spawning a process use the stub server.
+    """
+    monkeypatch.setattr(runtime, "_default_locator", RuntimeLocator(cache_dir=runtime_cache, node=sys.executable))
@@ -1,6 +1,7 @@
 import pytest
 from langchain_skilder.mcp import MCPSkill, _validate_auth
 from langchain_skilder.mcp_only import MCPClient
+from langchain_skilder.runtime import default_locator
 
 
 class TestAuthenticationValidation:
@@ -143,9 +144,9 @@ class TestEnvironmentVariables:
     def test_version_default(self):
         """Test default version."""
         mcp = MCPSkill(name="test", workspace_key="WSK_123")
-        assert mcp.serverParams.args == ["@skilder-ai/runtime@latest"]
+        assert mcp.serverParams.args == [default_locator().cached_entry("latest")]
 
     def test_version_custom(self):
         """Test custom version."""
         mcp = MCPSkill(name="test", workspace_key="WSK_123", version="1.2.3")
-        assert mcp.serverParams.args == ["@skilder-ai/runtime@1.2.3"]
+        assert mcp.serverParams.args == [default_locator().cached_entry("1.2.3")]
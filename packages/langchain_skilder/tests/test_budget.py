@@ -0,0 +1,105 @@
+import re
+import pytest
+
+from langchain_core.messages import AIMessage
+
+from langchain_skilder.budget import CONTINUATION_TOOL_NAME, ResultBudget
+from langchain_skilder.loadtest import stub_server_parameters
+from langchain_skilder.mcp_only import MCPClient
+from langchain_skilder.tool_node import SkilderToolNode
+
+HANDLE_RE = re.compile(r'handle "([^"]+)"')
+
+
+def _handle(text):
+    match = HANDLE_RE.search(text)
+    return match.group(1) if match else None
+
+
+def _read_all(budget, text):
+    """Follow the continuation handles of a shaped result and return the original text."""
+    parts = []
+    while True:
+        handle = _handle(text)
+        parts.append(text.split("\n\n[Result truncated")[0] if handle else text)
+        if handle is None:
+            return parts
+        text = budget.read(handle)
+
+
+class TestResultBudget:
+    """Test truncation and continuation of oversized results."""
+
+    def test_overflow_is_held_and_read_back_in_chunks(self):
+        """Test that chunks respect the limit and reassemble the result."""
+        budget = ResultBudget(max_chars=100)
+        text = "".join(f"line {index:03d} {'x' * 20}\n" for index in range(20))
+        shaped = budget.shape("read_file", text)
+        assert len(shaped.split("\n\n[Result truncated")[0]) <= 100
+        assert f"Call {CONTINUATION_TOOL_NAME}" in shaped
+
+        parts = _read_all(budget, shaped)
+        assert all(part.endswith("x") for part in parts[:-1])  # cut at line breaks
+        assert "\n".join(parts) == text
+        assert budget.shape("read_file", "short") == "short"
+        assert budget.stats()["truncated"] == 1 and budget.stats()["continued"] == len(parts) - 1
+
+    def test_handles_are_idempotent_and_bounded(self):
+        """Test re-reading a handle, unknown handles, eviction and expiry."""
+        now = [0.0]
+        budget = ResultBudget(max_chars=10, max_held_results=2, ttl_seconds=60, clock=lambda: now[0])
+        first = _handle(budget.shape("t", "a" * 50))
+        assert budget.read(first) == budget.read(first)
+        with pytest.raises(KeyError):
+            budget.read("unknown:10")
+        assert budget.continuation(123)[1] and budget.continuation("nope")[1]
+
+        budget.shape("t", "b" * 50)
+        budget.read(first)  # most recently read: kept
+        budget.shape("t", "c" * 50)
+        assert budget.stats()["held"] == 2
+        assert budget.read(first).startswith("a")
+
+        now[0] = 61.0
+        with pytest.raises(KeyError):
+            budget.read(first)
+        assert budget.stats()["expired"] == 2
+
+    def test_limits_in_tokens_and_per_tool(self):
+        """Test token estimates and per-tool overrides of the default."""
+        budget = ResultBudget(max_tokens=50, tools={"search": {"max_chars": 20}, "raw": {}}, chars_per_token=2)
+        assert budget.limit("other") == 100
+        assert budget.limit("search") == 20
+        assert budget.limit("raw") is None
+        with pytest.raises(ValueError):
+            ResultBudget(max_chars=0)
+
+
+@pytest.mark.asyncio
+async def test_client_tools_truncate_and_continue_results():
+    """Test that LangChain tools and the tool node apply the budget end to end."""
+    client = MCPClient.with_skill_key(skill_key="SKL_test", result_budget=ResultBudget(max_chars=60))
+    client.serverParams = stub_server_parameters({"tools": 3})
+    message = "y" * 150
+    try:
+        tools = {tool.name: tool for tool in await client.get_langchain_tools()}
+        assert list(tools)[-1] == CONTINUATION_TOOL_NAME
+
+        first = await tools["echo"].ainvoke({"message": message})
+        handle = _handle(first)
+        assert handle and len(first) < 200
+        rest = await tools[CONTINUATION_TOOL_NAME].ainvoke({"handle": handle})
+        assert rest.startswith("y")
+
+        node = SkilderToolNode(client)
+        messages = await node.ainvoke([AIMessage(content="", tool_calls=[
+            {"name": "echo", "args": {"message": message}, "id": "call_0", "type": "tool_call"},
+            {"name": CONTINUATION_TOOL_NAME, "args": {"handle": handle}, "id": "call_1", "type": "tool_call"},
+            {"name": CONTINUATION_TOOL_NAME, "args": {"handle": "expired:1"}, "id": "call_2", "type": "tool_call"},
+        ])])
+        assert _handle(messages[0].content) is not None
+        assert messages[1].content == rest and messages[1].status == "success"
+        assert messages[2].status == "error"
+        assert client.metrics()["results"]["truncated"] == 2
+    finally:
+        await client.stop()
@@ -0,0 +1,223 @@
+import asyncio
+import gc
+from types import SimpleNamespace
+import pytest
+from unittest.mock import AsyncMock, patch
+import mcp.types as types
+
+from langchain_skilder.catalog import CatalogLoad, diff_catalogs, intern_catalog, intern_schema, intern_tool, shared_catalog_stats
+from langchain_skilder.loadtest import stub_server_parameters
+from langchain_skilder.mcp_only import MCPClient
+
+
+def _schema():
+    return {"type": "object", "properties": {"path": {"type": "string"}}, "required": ["path"]}
+
+
+class TestInterning:
+    """Test deduplication of catalog metadata."""
+
+    def test_identical_schemas_share_one_dict(self):
+        """Test that equal schemas resolve to the same object."""
+        a = intern_schema(_schema())
+        b = intern_schema({"required": ["path"], "properties": {"path": {"type": "string"}}, "type": "object"})
+        assert a is b
+        assert a == _schema()
+
+    def test_identical_tools_share_one_entry(self):
+        """Test that separately parsed copies of a tool share an entry."""
+        first = intern_tool(types.Tool(name="read", description="Read " + "a file", inputSchema=_schema()))
+        second = intern_tool(types.Tool(name="read", description="Read a " + "file", inputSchema=_schema()))
+        assert first is second
+        assert first.description is second.description
+
+    def test_different_tools_share_schema_but_not_entry(self):
+        """Test that distinct tools with the same schema only share the schema."""
+        read, write = intern_catalog([
+            SimpleNamespace(name="read", description="Read", inputSchema=_schema()),
+            SimpleNamespace(name="write", description="Write", inputSchema=_schema()),
+        ])
+        assert read is not write
+        assert read.inputSchema is write.inputSchema
+        assert read.signature != write.signature
+
+    def test_annotations_are_part_of_identity(self):
+        """Test that annotations are kept as dicts and change the signature."""
+        plain = intern_tool(types.Tool(name="t", inputSchema=_schema()))
+        annotated = intern_tool(types.Tool(name="t", inputSchema=_schema(), annotations=types.ToolAnnotations(readOnlyHint=True)))
+        assert plain is not annotated
+        assert plain.annotations is None
+        assert annotated.annotations == {"readOnlyHint": True}
+
+    def test_unused_entries_are_released(self):
+        """Test that shared entries are held weakly."""
+        entry = intern_tool(SimpleNamespace(name="ephemeral_tool_xyz", description="only once", inputSchema={"x": 1}))
+        gc.collect()  # entries left by earlier tests
+        before = shared_catalog_stats()["entries"]
+        del entry
+        gc.collect()
+        assert shared_catalog_stats()["entries"] == before - 1
+
+
+@pytest.mark.asyncio
+async def test_tool_objects_are_reused_across_calls_and_refreshes():
+    """Test that MCPClient reuses tool objects while their entry is unchanged."""
+    def listing(description):
+        return SimpleNamespace(tools=[
+            SimpleNamespace(name="a", description="A", inputSchema=_schema()),
+            SimpleNamespace(name="b", description=description, inputSchema=_schema()),
+        ])
+
+    mock_session = AsyncMock()
+    mock_session.initialize = AsyncMock()
+    mock_session.list_tools = AsyncMock(return_value=listing("B"))
+    stdio_ctx = AsyncMock()
+    stdio_ctx.__aenter__.return_value = (AsyncMock(), AsyncMock())
+    client_ctx = AsyncMock()
+    client_ctx.__aenter__.return_value = mock_session
+
+    with patch("langchain_skilder.mcp_only.stdio_client", return_value=stdio_ctx), \
+         patch("langchain_skilder.mcp_only.ClientSession", return_value=client_ctx):
+        first_client = MCPClient.with_skill_key(skill_key="SKL_test")
+        second_client = MCPClient.with_skill_key(skill_key="SKL_test")
+        first = await first_client.get_langchain_tools()
+        again = await first_client.get_langchain_tools()
+        assert [id(t) for t in first] == [id(t) for t in again]
+
+        other = await second_client.get_langchain_tools()
+        assert other[0] is not first[0]
+        assert other[0].entry is first[0].entry
+
+        mock_session.list_tools.return_value = listing("B v2")
+        await first_client._handle_message(types.ServerNotification(types.ToolListChangedNotification()))
+        refreshed = await first_client.get_langchain_tools()
+        assert refreshed[0] is first[0]
+        assert refreshed[1] is first[1]  # updated in place
+        assert refreshed[1].description == "B v2"
+        assert refreshed[1].entry is not other[1].entry
+
+        await first_client.stop()
+        await second_client.stop()
+
+
+def test_diff_catalogs_by_name_and_signature():
+    """Test that only added, removed and changed tools are reported."""
+    old = intern_catalog([
+        SimpleNamespace(name="keep", description="Keep", inputSchema=_schema()),
+        SimpleNamespace(name="edit", description="Edit", inputSchema=_schema()),
+        SimpleNamespace(name="drop", description="Drop", inputSchema=_schema()),
+    ])
+    new = intern_catalog([
+        SimpleNamespace(name="keep", description="Keep", inputSchema=_schema()),
+        SimpleNamespace(name="edit", description="Edit", inputSchema={"type": "object"}),
+        SimpleNamespace(name="add", description="Add", inputSchema=_schema()),
+    ])
+    diff = diff_catalogs(old, new)
+    assert diff.to_dict() == {"added": ["add"], "removed": ["drop"], "changed": ["edit"]}
+    assert diff.changed[0] is new[1] and diff.removed[0] is old[2]
+    assert not diff_catalogs(new, list(new))
+    assert diff_catalogs([], new).to_dict()["added"] == ["keep", "edit", "add"]
+
+
+@pytest.mark.asyncio
+async def test_catalog_listeners_receive_the_delta_on_list_changed():
+    """Test that a list change is refreshed eagerly and reported to listeners."""
+    def listing(*names):
+        return SimpleNamespace(tools=[SimpleNamespace(name=n, description=n.upper(), inputSchema=_schema()) for n in names])
+
+    mock_session = AsyncMock()
+    mock_session.initialize = AsyncMock()
+    mock_session.list_tools = AsyncMock(return_value=listing("a", "b"))
+    stdio_ctx = AsyncMock()
+    stdio_ctx.__aenter__.return_value = (AsyncMock(), AsyncMock())
+    client_ctx = AsyncMock()
+    client_ctx.__aenter__.return_value = mock_session
+
+    with patch("langchain_skilder.mcp_only.stdio_client", return_value=stdio_ctx), \
+         patch("langchain_skilder.mcp_only.ClientSession", return_value=client_ctx):
+        client = MCPClient.with_skill_key(skill_key="SKL_test")
+        diffs = []
+        client.add_catalog_listener(diffs.append)
+        client.add_catalog_listener(lambda diff: 1 / 0)  # failures are isolated
+        tools = await client.get_langchain_tools()
+        assert [diff.to_dict() for diff in diffs] == [{"added": ["a", "b"], "removed": [], "changed": []}]
+
+        await client.get_langchain_tools()
+        assert len(diffs) == 1  # cached, nothing to report
+
+        mock_session.list_tools.return_value = listing("b", "c")
+        await client._handle_message(types.ServerNotification(types.ToolListChangedNotification()))
+        for _ in range(50):
+            if len(diffs) == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert diffs[1].to_dict() == {"added": ["c"], "removed": ["a"], "changed": []}
+        refreshed = await client.get_langchain_tools()
+        assert refreshed[0] is tools[1]
+        assert mock_session.list_tools.await_count == 2
+
+        counters = client.metrics()["counters"]
+        assert counters["catalog.tools_added"] == 3 and counters["catalog.tools_removed"] == 1
+        assert "catalog.tools_changed" not in counters
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_catalog_load_follows_cursors_and_streams_pages():
+    """Test that pages are yielded as they arrive and assembled in order."""
+    pages = {
+        None: SimpleNamespace(tools=[SimpleNamespace(name="a", inputSchema={})], nextCursor="2"),
+        "2": SimpleNamespace(tools=[SimpleNamespace(name="b", inputSchema={})], nextCursor="3"),
+        "3": SimpleNamespace(tools=[SimpleNamespace(name="c", inputSchema={})], nextCursor=None),
+    }
+    release = asyncio.Event()
+
+    async def fetch(cursor):
+        if cursor == "3":
+            await release.wait()
+        return pages[cursor]
+
+    completed = []
+    load = CatalogLoad(fetch, completed.append).start()
+    received = []
+    async for page in load.iter_pages():
+        received.append([entry.name for entry in page])
+        if len(received) == 2:
+            assert not load.done and not completed
+            release.set()
+    assert received == [["a"], ["b"], ["c"]]
+    assert [entry.name for entry in await load.result()] == ["a", "b", "c"]
+    assert completed == [load.catalog]
+
+    async def looping(cursor):
+        return SimpleNamespace(tools=[], nextCursor="same")
+
+    with pytest.raises(RuntimeError, match="twice"):
+        await CatalogLoad(looping).start().result()
+
+
+@pytest.mark.asyncio
+async def test_paginated_catalog_is_streamed_and_cached():
+    """Test that the first tools are usable before the last page of a large catalog lands."""
+    client = MCPClient.with_skill_key(skill_key="SKL_test")
+    client.serverParams = stub_server_parameters({"tools": 7, "page_size": 3, "list_latency_ms": 150})
+    try:
+        async for page in client.iter_langchain_tools():
+            assert [tool.name for tool in page] == ["echo", "sleep", "fail"]
+            assert not client._catalog_load.done  # remaining pages still loading
+            result = await page[0].ainvoke({"message": "early"})
+            assert '{"message": "early"}' in result
+            break
+
+        tools = await client.get_langchain_tools()
+        assert [tool.name for tool in tools][3:] == ["tool_0", "tool_1", "tool_2", "tool_3"]
+        assert tools[0] is page[0]
+        pages = [len(page) async for page in client.iter_langchain_tools()]
+        assert pages == [7]  # cached catalog
+
+        metrics = client.metrics()
+        assert metrics["counters"]["catalog.pages"] == 3
+        assert metrics["counters"]["catalog.refreshes"] == 1
+        assert metrics["timings"]["catalog.first_page"]["max"] < metrics["timings"]["catalog.load"]["max"]
+    finally:
+        await client.stop()
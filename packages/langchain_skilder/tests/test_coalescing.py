@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+
+from langchain_skilder.coalescing import CallCoalescer
+from langchain_skilder.loadtest import stub_server_parameters
+from langchain_skilder.mcp_only import MCPClient
+
+
+def _stub_client(coalescer):
+    client = MCPClient.with_skill_key(skill_key="SKL_test", coalescer=coalescer, max_concurrent_calls=8)
+    client.serverParams = stub_server_parameters({"tools": 3})
+    return client
+
+
+class TestCallCoalescer:
+    """Test eligibility, keys and cancellation of shared requests."""
+
+    def test_eligibility_by_mode_and_name(self):
+        """Test that read-only tools are coalesced by default and overrides apply."""
+        read_only = {"readOnlyHint": True}
+        idempotent = {"idempotentHint": True}
+        default = CallCoalescer(never_tools=["search"])
+        assert default.coalesces("ls", read_only) and not default.coalesces("put", idempotent)
+        assert not default.coalesces("ls", None) and not default.coalesces("search", read_only)
+        assert CallCoalescer(mode="idempotent").coalesces("put", idempotent)
+        assert CallCoalescer(mode="all").coalesces("write", None)
+        assert CallCoalescer(tools=["write"]).coalesces("write", None)
+        with pytest.raises(ValueError):
+            CallCoalescer(mode="none")
+
+        assert CallCoalescer.key("ls", {"a": 1, "b": [2]}) == CallCoalescer.key("ls", {"b": [2], "a": 1})
+        assert CallCoalescer.key("ls", {"a": 1}) != CallCoalescer.key("cat", {"a": 1})
+        assert CallCoalescer.key("ls", {"a": object()}) is None
+
+    @pytest.mark.asyncio
+    async def test_cancelled_callers_leave_the_request_to_the_others(self):
+        """Test that the request survives a cancelled caller but not the last one."""
+        coalescer = CallCoalescer()
+        sent = []
+        release = asyncio.Event()
+
+        async def call():
+            sent.append(1)
+            await release.wait()
+            return "result"
+
+        first = asyncio.create_task(coalescer.run("ls", "k", call))
+        second = asyncio.create_task(coalescer.run("ls", "k", call))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        assert await second == "result" and len(sent) == 1
+        assert first.cancelled()
+
+        release.clear()
+        lonely = asyncio.create_task(coalescer.run("ls", "k", call))
+        await asyncio.sleep(0)
+        lonely.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await lonely
+        await asyncio.sleep(0)
+        assert coalescer.stats()["in_flight"] == 0  # cancelled with its last caller
+        assert coalescer.stats()["tools"]["ls"] == {"sent": 2, "coalesced": 1, "ratio": 1 / 3}
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_calls_share_one_request():
+    """Test coalescing on the client: one request per distinct read-only call."""
+    client = _stub_client(CallCoalescer())
+    try:
+        await client.get_langchain_tools()
+        same = [client.call_tool("sleep", {"seconds": 0.2}) for _ in range(5)]
+        other = client.call_tool("sleep", {"seconds": 0.1})
+        failing = [client.call_tool("fail", {}) for _ in range(2)]  # not read-only
+        results = await asyncio.gather(*same, other, *failing)
+        assert all(result["content"][0].text == '{"seconds": 0.2}' for result in results[:5])
+        assert results[5]["content"][0].text == '{"seconds": 0.1}'
+        assert all(result["isError"] for result in results[6:])
+        assert len(client.tracer.spans()) == 4
+
+        # Calls are shared while in flight only
+        await client.call_tool("sleep", {"seconds": 0.2})
+        stats = client.metrics()["coalescing"]
+        assert stats["sent"] == 3 and stats["coalesced"] == 4
+        assert stats["tools"]["sleep"]["ratio"] == pytest.approx(4 / 7)
+        assert "fail" not in stats["tools"]
+    finally:
+        await client.stop()
@@ -0,0 +1,188 @@
+import asyncio
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import pytest
+import pytest_asyncio
+from mcp import StdioServerParameters
+
+from langchain_skilder.daemon import DaemonConnector, RuntimeDaemon
+from langchain_skilder.errors import SkilderRuntimeError
+from langchain_skilder.loadtest import stub_server_parameters
+from langchain_skilder.mcp_only import MCPClient
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are limited to ~100 characters: stay out of pytest's tmp_path
+    directory = tempfile.mkdtemp(prefix="skd-", dir="/tmp")
+    try:
+        yield os.path.join(directory, "d.sock")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest_asyncio.fixture
+async def daemon(socket_path):
+    daemon = RuntimeDaemon(socket_path, idle_timeout_seconds=0.3)
+    await daemon.start()
+    task = asyncio.create_task(daemon.serve())
+    try:
+        yield daemon
+    finally:
+        await daemon.stop()
+        await task
+
+
+def _client(socket_path, skill_key="SKL_test"):
+    client = MCPClient.with_skill_key(skill_key=skill_key, daemon=socket_path)
+    client.serverParams = stub_server_parameters({"tools": 3})
+    client.serverParams.env = {**(client.serverParams.env or {}), "SKILL_KEY": skill_key}
+    return client
+
+
+@pytest.mark.asyncio
+async def test_clients_share_one_runtime_per_configuration(daemon, socket_path):
+    """Test that sessions with the same runtime configuration share one runtime."""
+    first, second, other = _client(socket_path), _client(socket_path), _client(socket_path, "SKL_other")
+    try:
+        results = await asyncio.gather(
+            first.call_tool("echo", {"message": "a"}),
+            second.call_tool("echo", {"message": "b"}),
+            other.call_tool("echo", {"message": "c"}),
+        )
+        assert [result["content"][0].text for result in results] == [
+            '{"message": "a"}', '{"message": "b"}', '{"message": "c"}'
+        ]
+        assert len(await second.get_langchain_tools()) == 3
+
+        runtimes = sorted(runtime["connections"] for runtime in daemon.stats()["runtimes"])
+        assert runtimes == [1, 2]
+        assert (await DaemonConnector(socket_path).stats())["pid"] == os.getpid()
+    finally:
+        await asyncio.gather(first.stop(), second.stop(), other.stop())
+
+
+@pytest.mark.asyncio
+async def test_notifications_reach_every_session(daemon, socket_path):
+    """Test that server notifications are sent to all the sessions of a runtime."""
+    reader, writer = _client(socket_path), _client(socket_path)
+    try:
+        assert (await reader.read_resource("stub://counter"))[0]["text"] == "1"
+        await writer.call_tool("echo", {"updated_uri": "stub://counter"})
+        for _ in range(50):
+            if reader.metrics()["counters"].get("resources.updated"):
+                break
+            await asyncio.sleep(0.02)
+        assert (await reader.read_resource("stub://counter"))[0]["text"] == "2"
+    finally:
+        await asyncio.gather(reader.stop(), writer.stop())
+
+
+@pytest.mark.asyncio
+async def test_sessions_reconnect_after_runtime_exit(daemon, socket_path):
+    """Test that losing the shared runtime restarts it on the next call."""
+    client = _client(socket_path)
+    try:
+        await client.call_tool("echo", {})
+        (runtime,) = daemon._runtimes.values()
+        runtime.closed.set()  # the runtime exits
+        await runtime.task
+        await asyncio.sleep(0.05)
+
+        result = await client.call_tool("echo", {"message": "again"})
+        assert result["content"][0].text == '{"message": "again"}'
+        assert client.metrics()["counters"]["runtime.restarts"] == 1
+        assert len(daemon.stats()["runtimes"]) == 1
+    finally:
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_idle_runtime_is_stopped(daemon, socket_path):
+    """Test that a runtime without sessions is stopped after the idle timeout."""
+    client = _client(socket_path)
+    await client.call_tool("echo", {})
+    await client.stop()
+    for _ in range(100):
+        if not daemon.stats()["runtimes"]:
+            break
+        await asyncio.sleep(0.05)
+    assert daemon.stats()["runtimes"] == []
+
+
+@pytest.mark.asyncio
+async def test_runtime_startup_failure_is_reported(daemon, socket_path):
+    """Test that a runtime failing to start fails the client startup."""
+    client = MCPClient.with_skill_key(skill_key="SKL_test", daemon=socket_path)
+    client.serverParams = StdioServerParameters(command="/nonexistent/skilder-runtime", args=[])
+    try:
+        with pytest.raises(SkilderRuntimeError) as failure:
+            await client.start()
+        assert "could not start the runtime" in str(failure.value.__cause__)
+    finally:
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_client_auto_starts_the_daemon(socket_path):
+    """Test that the first client starts a daemon process that later clients reuse."""
+    client = _client(socket_path)
+    client.daemon = DaemonConnector(socket_path, exit_when_idle_seconds=5)
+    second = _client(socket_path)
+    pid = None
+    try:
+        await client.call_tool("echo", {})
+        await second.call_tool("echo", {})
+        stats = await client.daemon.stats()
+        pid = stats["pid"]
+        assert pid != os.getpid()
+        assert [runtime["connections"] for runtime in stats["runtimes"]] == [2]
+    finally:
+        await asyncio.gather(client.stop(), second.stop())
+        if pid is not None:
+            os.kill(pid, signal.SIGTERM)
+
+
+@pytest.mark.asyncio
+async def test_socket_directory_controlled_by_others_is_refused(socket_path):
+    """Test that neither side binds or connects in a directory another user could control."""
+    directory = os.path.dirname(socket_path)
+    connector = DaemonConnector(socket_path, auto_start=False)
+
+    os.chmod(directory, 0o755)
+    with pytest.raises(PermissionError, match="accessible to other users"):
+        await RuntimeDaemon(socket_path).start()
+    with pytest.raises(PermissionError, match="accessible to other users"):
+        await connector._open()
+    assert not os.path.exists(socket_path)
+
+    os.chmod(directory, 0o700)
+    target = tempfile.mkdtemp(prefix="skd-", dir="/tmp")
+    link = target + "-link"
+    os.symlink(target, link)
+    try:
+        with pytest.raises(PermissionError, match="not a plain directory"):
+            await DaemonConnector(os.path.join(link, "d.sock"), auto_start=False)._open()
+        if os.getuid() == 0:
+            os.chown(directory, 65534, -1)
+            with pytest.raises(PermissionError, match="owned by uid 65534"):
+                await connector._open()
+    finally:
+        os.unlink(link)
+        shutil.rmtree(target, ignore_errors=True)
+
+
+def test_package_imports_without_fcntl():
+    """Test that the package imports where `fcntl` does not exist (Windows)."""
+    script = (
+        "import sys\n"
+        "sys.modules['fcntl'] = None\n"  # import fcntl now raises ImportError
+        "from langchain_skilder import MCPClient\n"
+        "from langchain_skilder.loadtest import stub_server_parameters\n"
+        "MCPClient.with_skill_key(skill_key='SKL_test', server_params=stub_server_parameters())\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True, timeout=60)
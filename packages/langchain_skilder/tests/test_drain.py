@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+
+from langchain_skilder.errors import SkilderDrainingError
+from langchain_skilder.loadtest import stub_server_parameters
+from langchain_skilder.mcp_only import MCPClient
+
+
+def _stub_client(**options):
+    client = MCPClient.with_skill_key(skill_key="SKL_test", **options)
+    client.serverParams = stub_server_parameters({"tools": 3})
+    return client
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_in_flight_and_queued_calls():
+    """Test that calls in flight or queued on the lock complete during the drain."""
+    # One slot: the second call queues behind the first
+    client = _stub_client(drain_timeout_seconds=10.0, max_concurrent_calls=1)
+    await client.start()
+    first = asyncio.create_task(client.call_tool("sleep", {"seconds": 0.3}))
+    queued = asyncio.create_task(client.call_tool("echo", {"message": "hi"}))
+    await asyncio.sleep(0.05)
+
+    await client.stop()
+
+    assert (await first)["isError"] is False
+    assert (await queued)["isError"] is False
+    assert client.last_drain["in_flight"] == 2
+    assert client.last_drain["completed"] == 2
+    assert client.last_drain["abandoned"] == 0
+    assert client.last_drain["duration_seconds"] >= 0.2
+    assert client.metrics()["timings"]["shutdown.drain"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_new_calls_are_rejected_while_draining():
+    """Test that calls made after stop() began are rejected without reaching the runtime."""
+    client = _stub_client()
+    await client.start()
+    in_flight = asyncio.create_task(client.call_tool("sleep", {"seconds": 0.3}))
+    await asyncio.sleep(0.05)
+    stopping = asyncio.create_task(client.stop())
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(SkilderDrainingError):
+        await client.call_tool("echo", {})
+    with pytest.raises(SkilderDrainingError):
+        await client.get_langchain_tools()
+
+    await stopping
+    assert (await in_flight)["isError"] is False
+    assert client.metrics()["counters"]["calls.rejected"] == 2
+
+
+@pytest.mark.asyncio
+async def test_drain_deadline_abandons_slow_calls():
+    """Test that calls outliving the deadline are abandoned and counted."""
+    client = _stub_client()
+    await client.start()
+    slow = asyncio.create_task(client.call_tool("sleep", {"seconds": 30}))
+    await asyncio.sleep(0.05)
+
+    await client.stop(drain_timeout_seconds=0.2)
+
+    with pytest.raises(SkilderDrainingError, match="abandoned"):
+        await slow
+    assert client.last_drain["abandoned"] == 1
+    assert client.metrics()["counters"]["calls.abandoned"] == 1
+
+
+@pytest.mark.asyncio
+async def test_client_restarts_after_drained_stop():
+    """Test that a stopped client accepts calls again (lazy restart)."""
+    client = _stub_client()
+    await client.start()
+    await client.stop()
+    assert client.last_drain == {"duration_seconds": client.last_drain["duration_seconds"], "in_flight": 0, "completed": 0, "abandoned": 0}
+    try:
+        result = await client.call_tool("echo", {"message": "again"})
+        assert result["isError"] is False
+    finally:
+        await client.stop()
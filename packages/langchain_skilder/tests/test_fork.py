@@ -0,0 +1,134 @@
+import asyncio
+import json
+import os
+import signal
+import threading
+import time
+import pytest
+import mcp.client.stdio as stdio
+
+from langchain_skilder import forking
+from langchain_skilder.loadtest import stub_server_parameters
+from langchain_skilder.mcp import MCPSkill
+from langchain_skilder.mcp_only import MCPClient
+
+
+def _stub_client(**options):
+    client = MCPClient.with_skill_key(skill_key="SKL_test", **options)
+    client.serverParams = stub_server_parameters({"tools": 3})
+    return client
+
+
+def _in_child(client, write_fd):
+    """Use the inherited client from a fresh event loop and report to the parent."""
+
+    async def use():
+        tools = await client.get_langchain_tools()
+        result = await client.call_tool("echo", {"message": "child"})
+        metrics = client.metrics()
+        await client.stop()
+        return {"tools": len(tools), "text": result["content"][0].text, "counters": metrics["counters"]}
+
+    report = {}
+
+    def run():
+        try:
+            report.update(asyncio.run(use()))
+        except BaseException as error:
+            report["error"] = repr(error)
+
+    # The parent's event loop is still marked as running in this thread
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+    os.write(write_fd, json.dumps(report).encode())
+    os._exit(0)
+
+
+@pytest.mark.asyncio
+async def test_forked_child_gets_its_own_session_and_keeps_the_catalog():
+    """Test that a started client is reset in a forked child, reusing the parent's catalog."""
+    client = _stub_client()
+    try:
+        await client.get_langchain_tools()
+        parent_session = client._session
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            _in_child(client, write_fd)
+        os.close(write_fd)
+
+        def collect():
+            with os.fdopen(read_fd, "rb") as pipe:
+                data = pipe.read()
+            os.waitpid(pid, 0)
+            return json.loads(data)
+
+        report = await asyncio.wait_for(asyncio.to_thread(collect), timeout=60)
+        assert "error" not in report, report["error"]
+        assert report["tools"] == 3
+        assert report["text"] == '{"message": "child"}'
+        assert report["counters"]["runtime.forked"] == 1
+        assert report["counters"]["startup.ready"] == 1
+        assert "catalog.refreshes" not in report["counters"]  # inherited catalog
+
+        # The parent's session was left alone
+        assert client._session is parent_session
+        result = await client.call_tool("echo", {"message": "parent"})
+        assert result["content"][0].text == '{"message": "parent"}'
+    finally:
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_forked_child_does_not_delay_the_parent_stop():
+    """Test that a child releases the runtime pipes, so the runtime exits on the parent's stop."""
+    client = _stub_client()
+    try:
+        await client.get_langchain_tools()
+        assert len(client._runtime_fds) == 2
+        # Recorded without replacing anything in the SDK
+        assert stdio._create_platform_compatible_process.__module__ == "mcp.client.stdio"
+        assert forking.pipe_fds(object()) == ()
+        pid = os.fork()
+        if pid == 0:
+            time.sleep(10)  # still alive while the parent stops
+            os._exit(0)
+        try:
+            started = time.monotonic()
+            await client.stop()
+            # Without the release, stdin never reaches EOF: 2 s termination timeout
+            assert time.monotonic() - started < 1.5
+        finally:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+    finally:
+        await client.stop()
+
+
+def test_pid_check_and_fork_hook_reset_inherited_state():
+    """Test the reset of clients that look inherited from another process."""
+    client = _stub_client()
+    skill = MCPSkill.with_skill_key(skill_key="SKL_test")
+    for inherited in (client, skill.client):
+        inherited._started = True
+        inherited._runner_task = object()
+        inherited._session = object()
+        inherited._pid = -1
+    client._catalog_stale = False
+
+    forking._after_fork_in_child()
+
+    for reset in (client, skill.client):
+        assert reset._pid == os.getpid()
+        assert not reset._started and reset._runner_task is None and reset._session is None
+    assert not client._catalog_stale
+    assert client.metrics()["counters"] == {"runtime.forked": 1}
+
+    # Clients of the current process are untouched
+    client._started = True
+    client._after_fork()
+    assert client._started
+    client._started = False
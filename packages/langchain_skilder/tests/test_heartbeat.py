@@ -0,0 +1,100 @@
+import asyncio
+import pytest
+
+from langchain_skilder.heartbeat import Heartbeat
+from langchain_skilder.loadtest import stub_server_parameters
+from langchain_skilder.mcp_only import MCPClient
+
+
+def _stub_client(**options):
+    client = MCPClient.with_skill_key(skill_key="SKL_test", **options)
+    client.serverParams = stub_server_parameters({"tools": 3})
+    return client
+
+
+async def _hang():
+    await asyncio.sleep(3600)
+
+
+async def _wait_for(predicate, timeout=5.0):
+    async def poll():
+        while not predicate():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+
+def test_heartbeat_ewma_and_misses():
+    """Test latency smoothing and the unhealthy transition."""
+    heartbeat = Heartbeat(alpha=0.5, max_misses=2)
+    heartbeat.record_success(0.1)
+    heartbeat.record_success(0.3)
+    assert heartbeat.latency_seconds == pytest.approx(0.2)
+    assert heartbeat.last_latency_seconds == 0.3
+
+    assert heartbeat.record_miss() is False
+    assert heartbeat.record_miss() is True
+    assert heartbeat.record_miss() is False  # already unhealthy
+    assert heartbeat.healthy is False
+
+    heartbeat.record_success(0.1)
+    assert heartbeat.healthy is True and heartbeat.misses == 0
+    with pytest.raises(ValueError):
+        Heartbeat(alpha=0)
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_tracks_latency():
+    """Test that pings measure the session latency."""
+    client = _stub_client(heartbeat=Heartbeat(interval_seconds=0.05))
+    assert client.healthy and client.latency_seconds is None
+    try:
+        await client.start()
+        await _wait_for(lambda: client.heartbeat.pings >= 3)
+        assert client.healthy
+        assert 0 < client.latency_seconds < 1
+        assert client.metrics()["timings"]["heartbeat.ping"]["count"] >= 3
+        assert client.metrics()["heartbeat"]["healthy"] is True
+    finally:
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_wedged_session_is_recycled():
+    """Test that missed pings replace the session with a fresh runtime."""
+    heartbeat = Heartbeat(interval_seconds=0.05, timeout_seconds=0.05, max_misses=2)
+    client = _stub_client(heartbeat=heartbeat)
+    try:
+        await client.start()
+        wedged = client._session
+        wedged.send_ping = _hang
+
+        await _wait_for(lambda: client._session is not None and client._session is not wedged)
+        counters = client.metrics()["counters"]
+        assert counters["heartbeat.missed"] >= 2
+        assert counters["runtime.unhealthy"] == 1
+        assert counters["runtime.restarts"] == 1
+
+        await _wait_for(lambda: client.healthy and heartbeat.latency_seconds is not None)
+        assert (await client.call_tool("echo", {"message": "hi"}))["isError"] is False
+    finally:
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_session_without_recycle_recovers():
+    """Test that recycle=False only flags the session until pings succeed again."""
+    heartbeat = Heartbeat(interval_seconds=0.05, timeout_seconds=0.05, max_misses=1, recycle=False)
+    client = _stub_client(heartbeat=heartbeat)
+    try:
+        await client.start()
+        session = client._session
+        ping = session.send_ping
+        session.send_ping = _hang
+        await _wait_for(lambda: not client.healthy)
+        assert client._session is session
+
+        session.send_ping = ping
+        await _wait_for(lambda: client.healthy)
+        assert "runtime.restarts" not in client.metrics()["counters"]
+    finally:
+        await client.stop()
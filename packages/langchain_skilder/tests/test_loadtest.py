@@ -0,0 +1,81 @@
+import json
+import pytest
+
+from langchain_skilder import runtime
+from langchain_skilder.loadtest import parse_script, percentiles, run_load_test, stub_server_parameters
+from langchain_skilder.loadtest.__main__ import main
+from langchain_skilder.runtime import RuntimeLocator
+
+
+class TestScript:
+    """Test load test script parsing."""
+
+    def test_parse_script(self):
+        """Test list_tools and call_tool steps with arguments."""
+        steps = parse_script("list_tools, call_tool:echo", {"echo": {"message": "hi"}})
+        assert [s["label"] for s in steps] == ["list_tools", "call_tool:echo"]
+        assert steps[1]["tool"] == "echo"
+        assert steps[1]["arguments"] == {"message": "hi"}
+
+    @pytest.mark.parametrize("script", ["", "call_tool", "call_tool:", "delete_everything"])
+    def test_parse_script_rejects_invalid_steps(self, script):
+        """Test that unknown or incomplete steps are rejected."""
+        with pytest.raises(ValueError):
+            parse_script(script)
+
+
+class TestPercentiles:
+    """Test latency summaries."""
+
+    def test_nearest_rank(self):
+        """Test percentiles over 1..100 ms."""
+        summary = percentiles([i / 1000.0 for i in range(1, 101)])
+        assert summary["p50"] == 50.0
+        assert summary["p90"] == 90.0
+        assert summary["p99"] == 99.0
+        assert summary["max"] == 100.0
+        assert summary["mean"] == 50.5
+
+    def test_empty(self):
+        """Test that empty samples yield zeros."""
+        assert percentiles([])["p99"] == 0.0
+
+
+def test_stub_server_parameters_forward_options():
+    """Test that stub options become command line flags."""
+    params = stub_server_parameters({"tools": 5, "latency_ms": 1.5, "seed": None})
+    assert params.args[-4:] == ["--tools", "5", "--latency-ms", "1.5"]
+
+
+@pytest.mark.asyncio
+async def test_run_load_test_against_stub_server(tmp_path, monkeypatch):
+    """Test an end-to-end run with real clients against the stub server."""
+    # The stub target needs no Skilder runtime installed
+    monkeypatch.setattr(runtime, "_default_locator", RuntimeLocator(cache_dir=str(tmp_path)))
+    report = await run_load_test({
+        "agents": 2,
+        "iterations": 2,
+        "script": parse_script("list_tools,call_tool:echo,call_tool:fail"),
+        "target": "stub",
+        "stub_options": {"tools": 5},
+    })
+
+    assert report["startup"]["count"] == 2
+    assert report["startup"]["failures"] == 0
+    assert report["operations"]["list_tools"]["count"] == 4
+    assert report["operations"]["call_tool:echo"]["errors"] == 0
+    assert report["operations"]["call_tool:fail"]["error_rate"] == 1.0
+    assert report["totals"]["operations"] == 12
+    assert report["totals"]["throughput_ops_per_second"] > 0
+    assert set(report["client"]) == {"cpu_seconds", "cpu_percent", "rss_delta_mb", "rss_peak_mb"}
+    json.dumps(report)
+
+
+def test_cli_writes_json_report(tmp_path, capsys):
+    """Test the command line entry point with a JSON report."""
+    output = tmp_path / "report.json"
+    exit_code = main(["--agents", "1", "--iterations", "1", "--script", "call_tool:echo", "--json", str(output)])
+    assert exit_code == 0
+    report = json.loads(output.read_text())
+    assert report["config"]["script"] == ["call_tool:echo"]
+    assert "call_tool:echo" in capsys.readouterr().out
@@ -1,7 +1,16 @@
 import pytest
 from unittest.mock import AsyncMock, patch
 from mcp import StdioServerParameters
+import mcp.types as types
+from langchain_skilder.loadtest import stub_server_parameters
 from langchain_skilder.mcp import MCPSkill, TwolyOptions
+from langchain_skilder.runtime import default_locator
+
+
+def _mock_session():
+    session = AsyncMock()
+    session.list_tools.return_value = types.ListToolsResult(tools=[])
+    return session
 
 
 class TestMCPSkillInitialization:
@@ -13,8 +22,8 @@ class TestMCPSkillInitialization:
 
         assert mcp.name == "test-skill"
         assert isinstance(mcp.serverParams, StdioServerParameters)
-        assert mcp.serverParams.command == "npx"
-        assert mcp.serverParams.args == ["@skilder-ai/runtime@latest"]
+        assert mcp.serverParams.command == default_locator().node
+        assert mcp.serverParams.args == [default_locator().cached_entry("latest")]
         assert mcp.serverParams.env["WORKSPACE_KEY"] == "WSK_test123"
         assert mcp.serverParams.env["SKILL_NAME"] == "test-skill"
         assert mcp.serverParams.env["NATS_SERVERS"] == "nats://localhost:4222"
@@ -38,7 +47,7 @@ class TestMCPSkillInitialization:
         )
 
         assert mcp.serverParams.env["NATS_SERVERS"] == "nats://custom:4222"
-        assert mcp.serverParams.args == ["@skilder-ai/runtime@1.2.3"]
+        assert mcp.serverParams.args == [default_locator().cached_entry("1.2.3")]
 
     def test_init_requires_authentication(self):
         """Test that initialization requires authentication."""
@@ -85,7 +94,7 @@ class TestMCPSkillFactoryMethods:
         )
 
         assert mcp.serverParams.env["SKILL_KEY"] == "SKL_factory"
-        assert mcp.serverParams.args == ["@skilder-ai/runtime@2.0.0"]
+        assert mcp.serverParams.args == [default_locator().cached_entry("2.0.0")]
         assert "WORKSPACE_KEY" not in mcp.serverParams.env
 
 
@@ -98,11 +107,10 @@ class TestMCPSkillTools:
         mock_tools = [{"name": "tool1"}, {"name": "tool2"}]
         mock_read = AsyncMock()
         mock_write = AsyncMock()
-        mock_session = AsyncMock()
-        mock_session.initialize = AsyncMock()
+        mock_session = _mock_session()
 
-        with patch('langchain_skilder.mcp.stdio_client') as mock_stdio_client, \
-             patch('langchain_skilder.mcp.ClientSession') as mock_client_session, \
+        with patch('langchain_skilder.mcp_only.stdio_client') as mock_stdio_client, \
+             patch('langchain_skilder.mcp_only.ClientSession') as mock_client_session, \
              patch('langchain_skilder.mcp.load_mcp_tools') as mock_load_tools:
 
             mock_stdio_client.return_value.__aenter__.return_value = (mock_read, mock_write)
@@ -113,26 +121,33 @@ class TestMCPSkillTools:
             result = await mcp.get_langchain_tools()
 
             assert result == mock_tools
-            mock_stdio_client.assert_called_once_with(mcp.serverParams)
-            mock_client_session.assert_called_once_with(mock_read, mock_write)
+            # The session is run by the shared MCPClient core
+            assert mock_stdio_client.call_args.args == (mcp.serverParams,)
+            assert mock_client_session.call_args.args == (mock_read, mock_write)
             mock_session.initialize.assert_called_once()
-            mock_load_tools.assert_called_once_with(mock_session)
+            mock_load_tools.assert_called_once_with(mcp._adapter_session)
+
+            # Adapter tools are reused while the catalog is unchanged
+            assert await mcp.get_langchain_tools() == mock_tools
+            mock_load_tools.assert_called_once()
+            await mcp.stop()
 
     @pytest.mark.asyncio
     async def test_list_tools_alias(self):
         """Test that list_tools is an alias for get_langchain_tools."""
         mock_tools = [{"name": "tool1"}]
 
-        with patch('langchain_skilder.mcp.stdio_client') as mock_stdio_client, \
-             patch('langchain_skilder.mcp.ClientSession') as mock_client_session, \
+        with patch('langchain_skilder.mcp_only.stdio_client') as mock_stdio_client, \
+             patch('langchain_skilder.mcp_only.ClientSession') as mock_client_session, \
              patch('langchain_skilder.mcp.load_mcp_tools') as mock_load_tools:
 
             mock_stdio_client.return_value.__aenter__.return_value = (AsyncMock(), AsyncMock())
-            mock_client_session.return_value.__aenter__.return_value = AsyncMock()
+            mock_client_session.return_value.__aenter__.return_value = _mock_session()
             mock_load_tools.return_value = mock_tools
 
             mcp = MCPSkill.with_skill_key(skill_key="SKL_test")
             result = await mcp.list_tools()
+            await mcp.stop()
 
             assert result == mock_tools
 
@@ -141,20 +156,55 @@ class TestMCPSkillTools:
         """Test that tools is an alias for get_langchain_tools."""
         mock_tools = [{"name": "tool1"}]
 
-        with patch('langchain_skilder.mcp.stdio_client') as mock_stdio_client, \
-             patch('langchain_skilder.mcp.ClientSession') as mock_client_session, \
+        with patch('langchain_skilder.mcp_only.stdio_client') as mock_stdio_client, \
+             patch('langchain_skilder.mcp_only.ClientSession') as mock_client_session, \
              patch('langchain_skilder.mcp.load_mcp_tools') as mock_load_tools:
 
             mock_stdio_client.return_value.__aenter__.return_value = (AsyncMock(), AsyncMock())
-            mock_client_session.return_value.__aenter__.return_value = AsyncMock()
+            mock_client_session.return_value.__aenter__.return_value = _mock_session()
             mock_load_tools.return_value = mock_tools
 
             mcp = MCPSkill.with_workspace_key(name="test", workspace_key="WSK_test")
             result = await mcp.tools()
+            await mcp.stop()
 
             assert result == mock_tools
 
 
+class TestMCPSkillSharedClient:
+    """Test MCPSkill on the MCPClient session core."""
+
+    @pytest.mark.asyncio
+    async def test_adapter_tools_are_cached_per_catalog_version(self):
+        """Test that adapter tools are rebuilt only when the catalog changes."""
+        skill = MCPSkill.with_skill_key(skill_key="SKL_test")
+        skill.serverParams = stub_server_parameters({"tools": 3})
+        try:
+            tools = await skill.get_langchain_tools()
+            assert [tool.name for tool in tools] == ["echo", "sleep", "fail"]
+            assert [id(t) for t in await skill.get_langchain_tools()] == [id(t) for t in tools]
+
+            # A refresh returning the same catalog keeps the tools
+            await skill.client._handle_message(types.ServerNotification(types.ToolListChangedNotification()))
+            assert (await skill.get_langchain_tools())[0] is tools[0]
+            assert skill.client.metrics()["counters"]["catalog.refreshes"] == 2
+
+            # Calls go through the client scheduler
+            echo = next(tool for tool in tools if tool.name == "echo")
+            assert "hello" in str(await echo.ainvoke({"message": "hello"}))
+            assert skill.client.metrics()["lanes"]["default"]["admitted"] == 1
+
+            # A changed catalog rebuilds them
+            changed = AsyncMock(return_value=skill.client._catalog[:2])
+            with patch.object(skill.client, "_get_catalog", changed), \
+                 patch('langchain_skilder.mcp.load_mcp_tools', return_value=tools[:2]) as mock_load_tools:
+                assert len(await skill.get_langchain_tools()) == 2
+                await skill.get_langchain_tools()
+                mock_load_tools.assert_called_once_with(skill._adapter_session)
+        finally:
+            await skill.stop()
+
+
 class TestMCPSkillLifecycle:
     """Test MCPSkill lifecycle management."""
 
@@ -163,11 +213,10 @@ class TestMCPSkillLifecycle:
         """Test async context manager."""
         mock_read = AsyncMock()
         mock_write = AsyncMock()
-        mock_session = AsyncMock()
-        mock_session.initialize = AsyncMock()
+        mock_session = _mock_session()
 
-        with patch('langchain_skilder.mcp.stdio_client') as mock_stdio_client, \
-             patch('langchain_skilder.mcp.ClientSession') as mock_client_session, \
+        with patch('langchain_skilder.mcp_only.stdio_client') as mock_stdio_client, \
+             patch('langchain_skilder.mcp_only.ClientSession') as mock_client_session, \
              patch('langchain_skilder.mcp.load_mcp_tools') as mock_load_tools:
 
             mock_stdio_client.return_value.__aenter__.return_value = (mock_read, mock_write)
@@ -190,11 +239,10 @@ class TestMCPSkillLifecycle:
         """Test manual start and stop."""
         mock_read = AsyncMock()
         mock_write = AsyncMock()
-        mock_session = AsyncMock()
-        mock_session.initialize = AsyncMock()
+        mock_session = _mock_session()
 
-        with patch('langchain_skilder.mcp.stdio_client') as mock_stdio_client, \
-             patch('langchain_skilder.mcp.ClientSession') as mock_client_session, \
+        with patch('langchain_skilder.mcp_only.stdio_client') as mock_stdio_client, \
+             patch('langchain_skilder.mcp_only.ClientSession') as mock_client_session, \
              patch('langchain_skilder.mcp.load_mcp_tools') as mock_load_tools:
 
             mock_stdio_client.return_value.__aenter__.return_value = (mock_read, mock_write)
@@ -233,7 +281,7 @@ class TestMCPSkillEnvironmentVariables:
     def test_default_version(self):
         """Test default runtime version."""
         mcp = MCPSkill.with_skill_key(skill_key="SKL_test")
-        assert mcp.serverParams.args == ["@skilder-ai/runtime@latest"]
+        assert mcp.serverParams.args == [default_locator().cached_entry("latest")]
 
     def test_custom_version(self):
         """Test custom runtime version."""
@@ -242,7 +290,7 @@ class TestMCPSkillEnvironmentVariables:
             workspace_key="WSK_test",
             version="1.5.0"
         )
-        assert mcp.serverParams.args == ["@skilder-ai/runtime@1.5.0"]
+        assert mcp.serverParams.args == [default_locator().cached_entry("1.5.0")]
 
     def test_no_deprecated_runtime_name(self):
         """Test that RUNTIME_NAME is not set (deprecated)."""
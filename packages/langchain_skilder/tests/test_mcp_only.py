@@ -1,9 +1,11 @@
 import asyncio
 from types import SimpleNamespace
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import ANY, AsyncMock, patch
+from mcp import StdioServerParameters
 
 from langchain_skilder.mcp_only import MCPClient, TwolyOptions
+from langchain_skilder.runtime import RuntimeLocator, default_locator
 
 
 class _ToolObj(SimpleNamespace):
@@ -22,8 +24,8 @@ class TestMCPClientInit:
         instance = MCPClient(name="test-client", workspace_key="WSK_test123")
 
         assert instance.name == "test-client"
-        assert instance.serverParams.command == "npx"
-        assert instance.serverParams.args == ["@skilder-ai/runtime@latest"]
+        assert instance.serverParams.command == default_locator().node
+        assert instance.serverParams.args == [default_locator().cached_entry("latest")]
         assert instance.serverParams.env["WORKSPACE_KEY"] == "WSK_test123"
         assert instance.serverParams.env["SKILL_NAME"] == "test-client"
         assert instance.serverParams.env["NATS_SERVERS"] == "nats://localhost:4222"
@@ -37,6 +39,15 @@ class TestMCPClientInit:
         assert "WORKSPACE_KEY" not in instance.serverParams.env
         assert "SKILL_NAME" not in instance.serverParams.env
 
+    def test_init_with_server_params(self):
+        """Test that explicit server parameters are used without resolving the runtime."""
+        params = StdioServerParameters(command="python", args=["server.py"])
+        missing = RuntimeLocator(runtime_path="/nonexistent/runtime.js")
+        instance = MCPClient.with_skill_key(skill_key="SKL_test", server_params=params, runtime_locator=missing)
+        assert instance.serverParams is params
+        with pytest.raises(ValueError):
+            MCPClient.with_skill_key(skill_key="SKL_test", server_params=params, native_nats=True)
+
     def test_init_with_custom_options(self):
         """Test initialization with custom options."""
         instance = MCPClient(
@@ -47,7 +58,7 @@ class TestMCPClientInit:
             log_level="debug"
         )
 
-        assert instance.serverParams.args == ["@skilder-ai/runtime@1.2.3"]
+        assert instance.serverParams.args == [default_locator().cached_entry("1.2.3")]
         assert instance.serverParams.env["NATS_SERVERS"] == "nats://custom:4222"
         assert instance.serverParams.env["LOG_LEVEL"] == "debug"
 
@@ -129,7 +140,8 @@ async def test_call_tool_uses_same_session_and_returns_content():
         await instance.get_langchain_tools()
         result = await instance.call_tool("x", {"a": 1})
         assert result == {"content": [{"type": "text", "text": "ok"}], "isError": False}
-        mock_session.call_tool.assert_awaited_once_with("x", {"a": 1})
+        mock_session.call_tool.assert_awaited_once_with("x", {"a": 1}, meta=ANY)
+        assert "traceparent" in mock_session.call_tool.await_args.kwargs["meta"]
         await instance.stop()
 
 
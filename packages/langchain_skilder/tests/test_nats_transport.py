@@ -0,0 +1,209 @@
+import asyncio
+import contextlib
+import json
+import shutil
+import socket
+import subprocess
+import time
+import pytest
+
+from langchain_skilder.errors import SkilderRuntimeError
+from langchain_skilder.mcp_only import MCPClient
+from langchain_skilder.nats_transport import (
+    NatsTransport,
+    SkillIdentity,
+    SkillTools,
+    call_result,
+    handshake_message,
+)
+
+IDENTITY = SkillIdentity("ws", "sk", "Stub")
+ECHO = {
+    "id": "tool-echo",
+    "name": "echo",
+    "description": "Echo arguments",
+    "inputSchema": json.dumps({"type": "object", "properties": {"message": {"type": "string"}}}),
+    "annotations": json.dumps({"readOnlyHint": True}),
+}
+PARENT = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+
+def _list_tools(tools, **data):
+    return {"type": "list-tools", "data": {"workspaceId": "ws", "skillId": "sk", "mcpTools": tools, **data}}
+
+
+def test_handshake_and_identity():
+    """Test the handshake request and response handling of both key types."""
+    assert handshake_message(skill_key="SKL_x")["data"]["key"] == "SKL_x"
+    assert "nature" not in handshake_message(skill_key="SKL_x")["data"]
+    workspace = handshake_message(workspace_key="WSK_x", name="Agent")
+    assert workspace["subject"] == "handshake"
+    assert workspace["data"]["nature"] == "skill" and workspace["data"]["name"] == "Agent"
+
+    identity = SkillIdentity.from_response(
+        {"type": "handshake-response", "data": {"workspaceId": "ws", "nature": "skill", "id": "sk", "name": "Stub"}}
+    )
+    assert identity.list_tools_key == "ws.sk.list-tools"
+    with pytest.raises(SkilderRuntimeError, match="AUTHENTICATION_FAILED"):
+        SkillIdentity.from_response({"type": "error", "data": {"error": "AUTHENTICATION_FAILED"}})
+    with pytest.raises(SkilderRuntimeError):
+        SkillIdentity.from_response({"type": "handshake-response", "data": {"nature": "runtime", "id": "rt"}})
+
+
+def test_skill_tools_listing_and_routing():
+    """Test the runtime's tool listing and call subjects, smart skills included."""
+    tools = SkillTools(_list_tools([ECHO], description="Stub skill")["data"])
+    listed = tools.mcp_tools()
+    assert [tool["name"] for tool in listed] == ["init_skill", "echo"]
+    assert listed[1]["inputSchema"]["properties"]["message"] == {"type": "string"}
+    assert listed[1]["annotations"] == {"readOnlyHint": True}
+    message = tools.call_message(IDENTITY, "echo", {"message": "hi"})
+    assert message["subject"] == "ws.call-tool.tool-echo.sk"
+    assert message["data"] == {
+        "type": "mcp-tool", "toolId": "tool-echo", "workspaceId": "ws", "from": "sk", "arguments": {"message": "hi"},
+    }
+    with pytest.raises(KeyError):
+        tools.call_message(IDENTITY, "missing", {})
+
+    smart = SkillTools(_list_tools([ECHO], smartSkillTool={"id": "smart-1", "name": "ask", "description": "Ask"})["data"])
+    assert [tool["name"] for tool in smart.mcp_tools()] == ["init_skill", "ask"]
+    message = smart.call_message(IDENTITY, "ask", {"message": "hello"})
+    assert message["subject"] == "ws.call-tool.smart-1.sk"
+    assert message["data"]["type"] == "smart-skill" and message["data"]["skillId"] == "smart-1"
+
+
+def test_call_result_and_client_options():
+    """Test response decoding and how the transport is configured."""
+    result = {"content": [{"type": "text", "text": "ok"}]}
+    assert call_result({"type": "agent-call-response", "data": {"result": result}}, "echo") == result
+    with pytest.raises(RuntimeError, match=r"Tool call \(echo\) failed: boom"):
+        call_result({"type": "error", "data": {"error": "boom"}}, "echo")
+
+    transport = NatsTransport.from_env({"NATS_SERVERS": "nats://a:4222, nats://b:4222", "SKILL_KEY": "SKL_x"})
+    assert transport.servers == ["nats://a:4222", "nats://b:4222"] and transport.skill_key == "SKL_x"
+    with pytest.raises(ValueError):
+        NatsTransport.from_env({"WORKSPACE_KEY": "WSK_x"})  # SKILL_NAME missing
+
+    client = MCPClient.with_workspace_key(name="Agent", workspace_key="WSK_x", native_nats=True)
+    assert isinstance(client.transport, NatsTransport) and client.transport.name == "Agent"
+    assert client.serverParams is None  # no runtime resolved
+    with pytest.raises(ValueError):
+        MCPClient.with_skill_key(skill_key="SKL_x", native_nats=True, transport=client.transport)
+
+
+@pytest.fixture
+def nats_url(tmp_path):
+    """A local JetStream-enabled nats-server."""
+    pytest.importorskip("nats")
+    server = shutil.which("nats-server")
+    if server is None:
+        pytest.skip("nats-server is not installed")
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    process = subprocess.Popen(
+        [server, "-js", "-a", "127.0.0.1", "-p", str(port), "-sd", str(tmp_path)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 5
+    while True:
+        with contextlib.suppress(OSError), socket.create_connection(("127.0.0.1", port), timeout=0.2):
+            break
+        if time.monotonic() > deadline:
+            process.kill()
+            pytest.fail("nats-server did not start")
+        time.sleep(0.05)
+    try:
+        yield f"nats://127.0.0.1:{port}"
+    finally:
+        process.terminate()
+        process.wait()
+
+
+class _Responder:
+    """Stub of the Skilder backend and tool runtimes on NATS."""
+
+    def __init__(self, url, key="SKL_test"):
+        self.url = url
+        self.key = key
+        self.calls = []
+
+    async def __aenter__(self):
+        import nats
+
+        self.connection = await nats.connect(self.url)
+        self.kv = await self.connection.jetstream().create_key_value(bucket="ephemeral")
+        await self.connection.subscribe("handshake", cb=self._handshake)
+        await self.connection.subscribe("ws.call-tool.*.sk", cb=self._call_tool)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.connection.drain()
+
+    async def publish(self, tools, **data):
+        await self.kv.put("ws.sk.list-tools", json.dumps(_list_tools(tools, **data)).encode())
+
+    async def _handshake(self, msg):
+        if json.loads(msg.data)["data"]["key"] == self.key:
+            reply = {"type": "handshake-response", "data": {"workspaceId": "ws", "nature": "skill", "id": "sk", "name": "Stub"}}
+        else:
+            reply = {"type": "error", "data": {"error": "AUTHENTICATION_FAILED: invalid key"}}
+        await msg.respond(json.dumps(reply).encode())
+
+    async def _call_tool(self, msg):
+        request = json.loads(msg.data)
+        self.calls.append((msg.subject, request, msg.headers or {}))
+        result = {"content": [{"type": "text", "text": json.dumps(request["data"]["arguments"])}]}
+        reply = {"type": "agent-call-response", "data": {"result": result, "executedByIdOrAgent": "rt"}}
+        await msg.respond(json.dumps(reply).encode())
+
+
+@pytest.mark.asyncio
+async def test_native_client_lists_and_calls_tools(nats_url):
+    """Test a full session against nats-server without the Node runtime."""
+    async with _Responder(nats_url) as responder:
+        await responder.publish([ECHO], description="Stub skill")
+        async with MCPClient.with_skill_key(skill_key="SKL_test", nats_servers=nats_url, native_nats=True) as client:
+            tools = {tool.name: tool for tool in await client.get_langchain_tools()}
+            assert list(tools) == ["init_skill", "echo"]
+
+            result = await client.call_tool("echo", {"message": "hi"}, traceparent=PARENT)
+            assert json.loads(result["content"][0]["text"]) == {"message": "hi"}
+            subject, request, headers = responder.calls[0]
+            assert subject == "ws.call-tool.tool-echo.sk"
+            assert request["data"]["from"] == "sk"
+            assert headers["traceparent"] == client.tracer.spans()[-1].traceparent
+
+            init = await client.call_tool("init_skill", {"original_prompt": "hello"})
+            assert init["content"][0]["text"] == "Stub skill"
+            assert len(responder.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_native_client_follows_tool_list_updates(nats_url):
+    """Test that a new tool list published in the KV bucket reaches the catalog."""
+    async with _Responder(nats_url) as responder:
+        await responder.publish([ECHO])
+        async with MCPClient.with_skill_key(skill_key="SKL_test", nats_servers=nats_url, native_nats=True) as client:
+            assert len(await client.get_langchain_tools()) == 2
+            await responder.publish([ECHO, {**ECHO, "id": "tool-other", "name": "other"}])
+            for _ in range(100):
+                if len(await client.get_langchain_tools()) == 3:
+                    break
+                await asyncio.sleep(0.02)
+            assert [tool.name for tool in await client.get_langchain_tools()] == ["init_skill", "echo", "other"]
+            await client.call_tool("other", {})
+            assert responder.calls[-1][0] == "ws.call-tool.tool-other.sk"
+
+
+@pytest.mark.asyncio
+async def test_native_client_reports_authentication_failure(nats_url):
+    """Test that a rejected key fails the startup with the backend's error."""
+    async with _Responder(nats_url):
+        client = MCPClient.with_skill_key(skill_key="SKL_wrong", nats_servers=nats_url, native_nats=True)
+        try:
+            with pytest.raises(SkilderRuntimeError) as failure:
+                await client.start()
+            assert "AUTHENTICATION_FAILED" in str(failure.value.__cause__)
+        finally:
+            await client.stop()
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import pstats
+import pytest
+
+from langchain_skilder.loadtest import stub_server_parameters
+from langchain_skilder.mcp import MCPSkill
+from langchain_skilder.mcp_only import MCPClient
+from langchain_skilder.profiling import CallProfiler
+
+
+def _metadata(directory):
+    return sorted(
+        (json.loads(path.read_text()) for path in directory.glob("*.json")),
+        key=lambda metadata: metadata["started_at"],
+    )
+
+
+@pytest.mark.asyncio
+async def test_sampled_operations_are_dumped_with_metadata(tmp_path):
+    """Test that profiled client operations leave a loadable profile and its metadata."""
+    profiler = CallProfiler(str(tmp_path), sample_rate=1.0)
+    client = MCPClient.with_skill_key(skill_key="SKL_test", profiler=profiler)
+    client.serverParams = stub_server_parameters({"tools": 3})
+    try:
+        await client.get_langchain_tools()
+        await client.call_tool("echo", {"message": "hi"})
+        with pytest.raises(ValueError):
+            await client.call_tool("echo", {}, priority="unknown")
+    finally:
+        await client.stop()
+
+    metadata = _metadata(tmp_path)
+    assert [entry["operation"] for entry in metadata] == ["get_langchain_tools", "call_tool", "call_tool"]
+    # The startup ran inside the profiled get_langchain_tools: not profiled twice
+    assert profiler.stats()["written"] == 3 and profiler.stats()["skipped"] == 1
+    call = metadata[1]
+    assert call["tool"] == "echo" and call["status"] == "ok" and call["duration_seconds"] > 0
+    assert metadata[2]["status"] == "error" and "unknown" in metadata[2]["error"]
+    stats = pstats.Stats(str(tmp_path / call["profile"]))
+    assert any(function[2] == "_call_tool" for function in stats.stats)  # type: ignore[attr-defined]
+    assert client.metrics()["profiling"]["written"] == 3
+
+
+@pytest.mark.asyncio
+async def test_sampling_limits(tmp_path):
+    """Test sample rate, operation selection, profile cap and configuration errors."""
+    never = CallProfiler(str(tmp_path), sample_rate=0.0)
+    assert not any(never.sampled("call_tool") for _ in range(100))
+    only_calls = CallProfiler(str(tmp_path), sample_rate=1.0, operations=["call_tool"], max_profiles=1)
+    assert not only_calls.sampled("start") and only_calls.sampled("call_tool")
+
+    async def work():
+        await asyncio.sleep(0)
+        return 42
+
+    assert await only_calls.profile("call_tool", work()) == 42
+    assert not only_calls.sampled("call_tool")  # max_profiles reached
+
+    with pytest.raises(ValueError):
+        CallProfiler(str(tmp_path), mode="perf")
+    with pytest.raises(ValueError):
+        CallProfiler(str(tmp_path), operations=["stop"])
+
+
+@pytest.mark.asyncio
+async def test_skill_startup_is_profiled(tmp_path):
+    """Test that MCPSkill profiles its startup and tool loading."""
+    skill = MCPSkill.with_skill_key(skill_key="SKL_test")
+    skill.serverParams = stub_server_parameters({"tools": 3})
+    skill.profiler = CallProfiler(str(tmp_path), sample_rate=1.0, operations=["start"])
+    try:
+        assert len(await skill.get_langchain_tools()) == 3
+    finally:
+        await skill.stop()
+    assert [entry["operation"] for entry in _metadata(tmp_path)] == ["start"]
+
+
+@pytest.mark.asyncio
+async def test_pyinstrument_profiles(tmp_path):
+    """Test the async-aware profiler when pyinstrument is installed."""
+    pytest.importorskip("pyinstrument")
+    profiler = CallProfiler(str(tmp_path), sample_rate=1.0, mode="pyinstrument")
+
+    async def work():
+        await asyncio.sleep(0.01)
+        return "done"
+
+    assert await profiler.profile("call_tool", work(), tool="echo") == "done"
+    (metadata,) = _metadata(tmp_path)
+    assert metadata["profile"].endswith(".pyisession") and (tmp_path / metadata["profile"]).exists()
@@ -0,0 +1,142 @@
+import asyncio
+import time
+import pytest
+
+from langchain_skilder.errors import SkilderRateLimitError
+from langchain_skilder.loadtest import stub_server_parameters
+from langchain_skilder.mcp_only import MCPClient
+from langchain_skilder.ratelimit import RATE_LIMIT_META_KEY, RateLimiter, TokenBucket
+from langchain_skilder.retry import RetryPolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_refills_continuously():
+    """Test burst capacity, refill and reservations in advance."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=2, clock=clock)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.delay() == pytest.approx(0.5)
+    # Waiters reserve in advance and are spaced one refill interval apart
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+    clock.now += 10
+    assert bucket.tokens == 2.0
+
+
+def test_token_bucket_rejects_invalid_limits():
+    """Test that non-positive limits are rejected."""
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+    with pytest.raises(ValueError):
+        TokenBucket.from_config({"burst": 3})
+    with pytest.raises(ValueError, match="mode"):
+        RateLimiter(mode="drop")
+
+
+@pytest.mark.asyncio
+async def test_fail_mode_rejects_without_taking_tokens():
+    """Test fail-fast calls over the limit, per tool and per skill."""
+    clock = FakeClock()
+    limiter = RateLimiter(tools={"search": {"rate": 1, "per_seconds": 10}}, skill={"rate": 3}, mode="fail", clock=clock)
+
+    await limiter.acquire("search")
+    with pytest.raises(SkilderRateLimitError) as raised:
+        await limiter.acquire("search")
+    assert raised.value.retry_after_seconds == pytest.approx(10.0)
+
+    # The rejected call did not consume skill tokens
+    await limiter.acquire("echo")
+    await limiter.acquire("echo")
+    with pytest.raises(SkilderRateLimitError):
+        await limiter.acquire("echo")
+
+
+@pytest.mark.asyncio
+async def test_wait_mode_paces_calls():
+    """Test that waiting calls are spaced by the refill interval."""
+    limiter = RateLimiter(tools={"search": {"rate": 20, "burst": 1}})
+    started = time.monotonic()
+    waits = await asyncio.gather(*(limiter.acquire("search") for _ in range(4)))
+
+    assert sorted(waits) == pytest.approx([0.0, 0.05, 0.1, 0.15], abs=0.01)
+    assert time.monotonic() - started >= 0.14
+    # The per-call mode overrides the default
+    with pytest.raises(SkilderRateLimitError):
+        await limiter.acquire("search", mode="fail")
+
+
+@pytest.mark.asyncio
+async def test_max_wait_and_cancellation():
+    """Test long waits failing fast and cancelled waits refunding their token."""
+    clock = FakeClock()
+    limiter = RateLimiter(tools={"slow": {"rate": 1, "per_seconds": 60}}, max_wait_seconds=1.0, clock=clock)
+    await limiter.acquire("slow")
+    with pytest.raises(SkilderRateLimitError):
+        await limiter.acquire("slow")
+
+    limiter = RateLimiter(tools={"tool": {"rate": 10, "burst": 1}}, clock=clock)
+    await limiter.acquire("tool")
+    waiting = asyncio.create_task(limiter.acquire("tool"))
+    await asyncio.sleep(0)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert limiter.buckets("tool")[0].tokens == pytest.approx(0.0)
+
+
+@pytest.mark.asyncio
+async def test_catalog_meta_limits_and_precedence():
+    """Test limits advertised in tool `_meta`, overridden by explicit limits."""
+    clock = FakeClock()
+    meta = {RATE_LIMIT_META_KEY: {"rate": 1, "per_seconds": 60}}
+    limiter = RateLimiter(tools={"pinned": {"rate": 100}}, mode="fail", clock=clock)
+
+    await limiter.acquire("advertised", meta)
+    with pytest.raises(SkilderRateLimitError):
+        await limiter.acquire("advertised", meta)
+    # A changed limit gets a fresh bucket
+    await limiter.acquire("advertised", {RATE_LIMIT_META_KEY: {"rate": 5}})
+
+    for _ in range(5):
+        await limiter.acquire("pinned", meta)
+    # Malformed and ignored limits do not break calls
+    await limiter.acquire("broken", {RATE_LIMIT_META_KEY: {"rate": -1}})
+    await RateLimiter(meta_key=None, mode="fail").acquire("advertised", meta)
+    await RateLimiter(meta_key=None, mode="fail").acquire("advertised", meta)
+
+
+def test_rate_limit_errors_are_not_retried():
+    """Test that the retry policy leaves rate limit rejections to the caller."""
+    assert not RetryPolicy().is_transient(SkilderRateLimitError("over"))
+
+
+@pytest.mark.asyncio
+async def test_client_applies_rate_limits():
+    """Test waits and rejections against the stub server, with metrics."""
+    limiter = RateLimiter(tools={"echo": {"rate": 10, "burst": 1}})
+    client = MCPClient.with_skill_key(skill_key="SKL_test", rate_limiter=limiter)
+    client.serverParams = stub_server_parameters({"tools": 3})
+    try:
+        started = time.monotonic()
+        for _ in range(3):
+            assert (await client.call_tool("echo", {"message": "hi"}))["isError"] is False
+        assert time.monotonic() - started >= 0.18
+
+        with pytest.raises(SkilderRateLimitError):
+            await client.call_tool("echo", {"message": "hi"}, rate_limit_mode="fail")
+
+        metrics = client.metrics()
+        assert metrics["counters"]["calls.rate_limited"] == 1
+        assert metrics["timings"]["ratelimit.wait"]["count"] == 2
+    finally:
+        await client.stop()
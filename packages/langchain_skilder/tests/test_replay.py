@@ -0,0 +1,101 @@
+import gzip
+import json
+import time
+import pytest
+from mcp.shared.exceptions import McpError
+
+from langchain_skilder.loadtest import run_load_test, stub_server_parameters
+from langchain_skilder.mcp import MCPSkill
+from langchain_skilder.mcp_only import MCPClient
+from langchain_skilder.replay import ReplayTransport, SessionRecorder, load_session
+from langchain_skilder.runtime import RuntimeLocator
+
+
+async def _record(path):
+    recorder = SessionRecorder(str(path))
+    client = MCPClient.with_skill_key(skill_key="SKL_secret", recorder=recorder)
+    client.serverParams = stub_server_parameters({"tools": 4})
+    async with client:
+        tools = [tool.name for tool in await client.get_langchain_tools()]
+        echo = await client.call_tool("echo", {"message": "hi"})
+        await client.call_tool("sleep", {"seconds": 0.3})
+    return tools, echo, recorder
+
+
+@pytest.mark.asyncio
+async def test_record_writes_compact_log_without_secrets(tmp_path):
+    """Test that both directions are logged with timings and no environment."""
+    path = tmp_path / "session.jsonl.gz"
+    _, _, recorder = await _record(path)
+    with gzip.open(path, "rt") as log:
+        text = log.read()
+    assert "SKL_secret" not in text
+    header = json.loads(text.splitlines()[0])
+    assert header["format"] == "skilder-mcp-session"
+    messages = load_session(str(path))
+    assert len(messages) == recorder.messages_recorded
+    methods = [message.get("method") for _, direction, message in messages if direction == "c"]
+    assert methods[:2] == ["initialize", "notifications/initialized"]
+    assert "tools/list" in methods and methods.count("tools/call") == 2
+    assert all(earlier[0] <= later[0] for earlier, later in zip(messages, messages[1:]))
+
+
+@pytest.mark.asyncio
+async def test_replay_serves_recorded_responses(tmp_path):
+    """Test that a fresh client gets the recorded catalog and results."""
+    path = tmp_path / "session.jsonl"
+    tools, echo, _ = await _record(path)
+    # A missing runtime is never resolved: nothing is spawned
+    missing = RuntimeLocator(runtime_path=str(tmp_path / "missing.js"))
+    replay = ReplayTransport(str(path), speed=0)
+    async with MCPClient.with_skill_key(skill_key="SKL_other", transport=replay, runtime_locator=missing) as client:
+        assert client.serverParams is None
+        assert [tool.name for tool in await client.get_langchain_tools()] == tools
+        result = await client.call_tool("echo", {"message": "hi"})
+        assert [item.text for item in result["content"]] == [item.text for item in echo["content"]]
+        # Other arguments and repeated calls reuse the recording of the same tool
+        again = await client.call_tool("echo", {"message": "other"})
+        assert again["isError"] is False
+        with pytest.raises(McpError, match="No recorded response"):
+            await client.call_tool("not_recorded", {})
+
+
+@pytest.mark.asyncio
+async def test_replay_speed(tmp_path):
+    """Test that recorded latency is reproduced and can be accelerated."""
+    path = tmp_path / "session.jsonl"
+    await _record(path)
+    for speed, low, high in ((1.0, 0.25, 2.0), (10.0, 0.0, 0.2)):
+        async with MCPClient.with_skill_key(skill_key="SKL_x", transport=ReplayTransport(str(path), speed=speed)) as client:
+            started = time.perf_counter()
+            await client.call_tool("sleep", {"seconds": 0.3})
+            assert low <= time.perf_counter() - started < high
+
+
+@pytest.mark.asyncio
+async def test_mcp_skill_accepts_replay_transport(tmp_path):
+    """Test that MCPSkill runs on a replayed session."""
+    path = tmp_path / "session.jsonl"
+    tools, _, _ = await _record(path)
+    skill = MCPSkill(skill_key="SKL_x", transport=ReplayTransport(str(path), speed=0))
+    try:
+        assert [tool.name for tool in await skill.get_langchain_tools()] == tools
+    finally:
+        await skill.stop()
+
+
+@pytest.mark.asyncio
+async def test_load_test_replay_target(tmp_path):
+    """Test that the load tester drives many agents from one recording."""
+    path = tmp_path / "session.jsonl"
+    await _record(path)
+    report = await run_load_test({
+        "agents": 3,
+        "iterations": 4,
+        "target": "replay",
+        "replay_file": str(path),
+        "replay_speed": 0,
+    })
+    assert report["startup"]["count"] == 3
+    assert report["operations"]["call_tool:echo"]["count"] == 24
+    assert report["totals"]["errors"] == 0
@@ -0,0 +1,143 @@
+import asyncio
+import base64
+import pytest
+
+import mcp.types as types
+from pydantic import AnyUrl
+
+from langchain_skilder.loadtest import stub_server_parameters
+from langchain_skilder.loadtest.stub_server import STUB_BLOB
+from langchain_skilder.mcp_only import MCPClient
+from langchain_skilder.resources import ResourceCache, iter_contents
+
+
+def _stub_client(**options):
+    client = MCPClient.with_skill_key(skill_key="SKL_test", **options)
+    client.serverParams = stub_server_parameters({"tools": 3})
+    return client
+
+
+def _notification(root):
+    return types.ServerNotification(root)
+
+
+def test_iter_contents_chunks_text_and_blobs():
+    """Test chunked iteration, with blobs decoded chunk by chunk."""
+    blob = bytes(range(256)) * 3
+    contents = [
+        {"uri": "a://t", "text": "abcdefg"},
+        {"uri": "a://b", "blob": base64.b64encode(blob).decode()},
+    ]
+    chunks = list(iter_contents(contents, chunk_size=3))
+    assert chunks[:3] == ["abc", "def", "g"]
+    assert all(len(chunk) <= 3 for chunk in chunks[3:])
+    assert b"".join(chunks[3:]) == blob
+    with pytest.raises(ValueError):
+        list(iter_contents(contents, chunk_size=0))
+
+
+def test_cache_requires_subscription_and_current_version():
+    """Test that only subscribed, unchanged and small bodies are cached."""
+    cache = ResourceCache(max_entry_bytes=10)
+    body = [{"uri": "a://x", "text": "v1"}]
+
+    assert not cache.put("a://x", body, cache.version("a://x"))
+    cache.mark_subscribed("a://x")
+    version = cache.version("a://x")
+    cache.invalidate("a://x")  # update arrived during the read
+    assert not cache.put("a://x", body, version)
+    assert cache.put("a://x", body, cache.version("a://x"))
+    assert cache.get("a://x") is body
+    assert not cache.put("a://x", [{"uri": "a://x", "text": "x" * 11}], cache.version("a://x"))
+
+    cache.clear()
+    assert cache.get("a://x") is None
+    assert not cache.is_subscribed("a://x")
+
+
+@pytest.mark.asyncio
+async def test_read_resource_is_cached_until_updated():
+    """Test subscription-backed caching against the stub server."""
+    client = _stub_client()
+    try:
+        assert (await client.read_resource("stub://counter"))[0]["text"] == "1"
+        assert (await client.read_resource("stub://counter"))[0]["text"] == "1"
+
+        # The server notifies an update; the next read fetches it again
+        await client.call_tool("echo", {"updated_uri": "stub://counter"})
+        await asyncio.sleep(0.05)
+        assert (await client.read_resource("stub://counter"))[0]["text"] == "2"
+        assert (await client.read_resource("stub://counter", refresh=True))[0]["text"] == "3"
+
+        metrics = client.metrics()
+        assert metrics["counters"]["resources.cache_hit"] == 1
+        assert metrics["counters"]["resources.cache_miss"] == 3
+        assert metrics["counters"]["resources.updated"] == 1
+        assert metrics["resources"]["subscriptions"] == 1
+    finally:
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_list_resources_and_iter_blob():
+    """Test listing resources and iterating a binary body."""
+    client = _stub_client(resource_cache_max_bytes=1024)
+    try:
+        resources = await client.list_resources()
+        assert [resource["uri"] for resource in resources] == ["stub://text", "stub://blob", "stub://counter"]
+        assert await client.list_resources() is resources
+        await client._handle_message(_notification(types.ResourceListChangedNotification()))
+        assert await client.list_resources() is not resources
+
+        chunks = [chunk async for chunk in client.iter_resource("stub://blob", chunk_size=1000)]
+        assert all(isinstance(chunk, bytes) and len(chunk) <= 1000 for chunk in chunks)
+        assert b"".join(chunks) == STUB_BLOB
+        # Larger than the cache limit: not cached
+        assert client.metrics()["resources"]["bodies"] == 0
+    finally:
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_prompts_are_cached_until_list_changes():
+    """Test prompt listing and rendering with cache invalidation."""
+    client = _stub_client()
+    try:
+        prompts = await client.list_prompts()
+        assert prompts[0]["name"] == "greet"
+
+        rendered = await client.get_prompt("greet", {"name": "Ada"})
+        assert rendered["messages"][0]["content"]["text"] == "Hello Ada"
+        assert await client.get_prompt("greet", {"name": "Ada"}) is rendered
+        assert (await client.get_prompt("greet", {"name": "Bob"}))["messages"][0]["content"]["text"] == "Hello Bob"
+
+        await client._handle_message(_notification(types.PromptListChangedNotification()))
+        assert await client.get_prompt("greet", {"name": "Ada"}) is not rendered
+    finally:
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_restart_drops_cache_and_subscriptions():
+    """Test that a new session starts from an empty cache."""
+    client = _stub_client()
+    try:
+        await client.read_resource("stub://text")
+        assert client.metrics()["resources"]["bodies"] == 1
+        await client.stop()
+        assert client.metrics()["resources"] == {"bodies": 0, "bytes": 0, "subscriptions": 0, "prompts": 0}
+        assert (await client.read_resource("stub://text"))[0]["text"] == "stub resource"
+    finally:
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_updated_notification_normalizes_uri():
+    """Test that updates match cached entries whatever the URI spelling."""
+    client = _stub_client()
+    client._resources.mark_subscribed("stub://text")
+    client._resources.put("stub://text", [{"uri": "stub://text", "text": "x"}], 0)
+    await client._handle_message(_notification(types.ResourceUpdatedNotification(
+        params=types.ResourceUpdatedNotificationParams(uri=AnyUrl("stub://text"))
+    )))
+    assert client._resources.get("stub://text") is None
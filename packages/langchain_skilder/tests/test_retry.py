@@ -0,0 +1,146 @@
+from contextlib import contextmanager
+from types import SimpleNamespace
+import pytest
+from unittest.mock import AsyncMock, patch
+import mcp.types as types
+from mcp.shared.exceptions import McpError
+
+from langchain_skilder.errors import SkilderDrainingError, SkilderRuntimeError
+from langchain_skilder.mcp_only import MCPClient
+from langchain_skilder.retry import RetryBudget, RetryPolicy
+
+# The mocked transport never holds the stderr pipe, so a failed call may be
+# reported as a runtime exit (SkilderRuntimeError) instead of the raw McpError.
+OK = SimpleNamespace(content=[{"type": "text", "text": "ok"}], isError=False)
+CATALOG = [
+    types.Tool(name="read", inputSchema={"type": "object"}, annotations=types.ToolAnnotations(readOnlyHint=True)),
+    types.Tool(name="upsert", inputSchema={"type": "object"}, annotations=types.ToolAnnotations(idempotentHint=True)),
+    types.Tool(name="send", inputSchema={"type": "object"}),
+]
+
+
+def _error(code, message="boom"):
+    return McpError(types.ErrorData(code=code, message=message))
+
+
+@contextmanager
+def _session(call_tool_side_effect):
+    session = AsyncMock()
+    session.initialize = AsyncMock()
+    session.list_tools = AsyncMock(return_value=SimpleNamespace(tools=CATALOG))
+    session.call_tool = AsyncMock(side_effect=call_tool_side_effect)
+    stdio_ctx = AsyncMock()
+    stdio_ctx.__aenter__.return_value = (AsyncMock(), AsyncMock())
+    stdio_ctx.__aexit__.return_value = None
+    client_ctx = AsyncMock()
+    client_ctx.__aenter__.return_value = session
+    client_ctx.__aexit__.return_value = None
+    with patch("langchain_skilder.mcp_only.stdio_client", return_value=stdio_ctx) as stdio_mock, \
+         patch("langchain_skilder.mcp_only.ClientSession", return_value=client_ctx), \
+         patch("langchain_skilder.retry.random.uniform", return_value=0.0):
+        yield session, stdio_mock
+
+
+class TestRetryPolicy:
+    """Test the retry decisions."""
+
+    def test_retryable_tools(self):
+        """Test annotation based eligibility and the allow and deny lists."""
+        policy = RetryPolicy(retry_tools=["send"], never_retry_tools=["read"])
+        assert policy.is_retryable_tool("upsert", {"idempotentHint": True})
+        assert policy.is_retryable_tool("lookup", {"readOnlyHint": True})
+        assert not policy.is_retryable_tool("write", {"destructiveHint": True})
+        assert not policy.is_retryable_tool("unknown", None)
+        assert policy.is_retryable_tool("send", None)
+        assert not policy.is_retryable_tool("read", {"readOnlyHint": True})
+
+    def test_transient_errors(self):
+        """Test which failures are retried."""
+        policy = RetryPolicy()
+        assert policy.is_transient(_error(types.CONNECTION_CLOSED))
+        assert policy.is_transient(_error(408))
+        assert not policy.is_transient(_error(types.INVALID_PARAMS))
+        assert policy.is_transient(SkilderRuntimeError("exited"))
+        assert not policy.is_transient(SkilderDrainingError("stopping"))
+        assert not policy.is_transient(ValueError("bug"))
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Test exponential growth of the jitter window up to the cap."""
+        policy = RetryPolicy(base_delay_seconds=0.1, max_delay_seconds=0.5)
+        with patch("langchain_skilder.retry.random.uniform", side_effect=lambda low, high: high):
+            assert [policy.backoff(attempt) for attempt in (1, 2, 3, 4)] == [0.1, 0.2, 0.4, 0.5]
+        assert all(0.0 <= policy.backoff(2) <= 0.2 for _ in range(100))
+
+    def test_budget(self):
+        """Test that retries are limited to the earned ratio."""
+        budget = RetryBudget(ratio=0.5, max_tokens=2)
+        assert budget.withdraw() and budget.withdraw()
+        assert not budget.withdraw()
+        budget.deposit()
+        budget.deposit()
+        assert budget.withdraw()
+
+
+@pytest.mark.asyncio
+async def test_read_only_tool_is_retried_on_timeout():
+    """Test that a transient failure of a read-only tool is retried transparently."""
+    with _session([_error(408), OK]) as (session, _):
+        async with MCPClient.with_skill_key(skill_key="SKL_test") as client:
+            await client.get_langchain_tools()
+            assert await client.call_tool("read", {}) == {"content": OK.content, "isError": False}
+            assert session.call_tool.await_count == 2
+            assert client.metrics()["counters"]["calls.retried"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unannotated_tool_is_not_retried_unless_allow_listed():
+    """Test that non-idempotent tools fail at once unless allow-listed."""
+    with _session([_error(408), _error(408), OK]) as (session, _):
+        async with MCPClient.with_skill_key(skill_key="SKL_test") as client:
+            await client.get_langchain_tools()
+            with pytest.raises((McpError, SkilderRuntimeError)):
+                await client.call_tool("send", {})
+            assert session.call_tool.await_count == 1
+            client.retry_policy = RetryPolicy(retry_tools=["send"])
+            assert (await client.call_tool("send", {}))["isError"] is False
+            assert session.call_tool.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_attempts_and_budget_are_bounded():
+    """Test that retries stop at max_attempts and when the budget runs out."""
+    with _session(_error(408)) as (session, _):
+        policy = RetryPolicy(max_attempts=3, budget=RetryBudget(ratio=0.0, max_tokens=3))
+        async with MCPClient.with_skill_key(skill_key="SKL_test", retry_policy=policy) as client:
+            await client.get_langchain_tools()
+            with pytest.raises((McpError, SkilderRuntimeError)):
+                await client.call_tool("read", {})
+            assert session.call_tool.await_count == 3
+            with pytest.raises((McpError, SkilderRuntimeError)):
+                await client.call_tool("read", {})
+            assert session.call_tool.await_count == 5
+            assert client.metrics()["counters"]["calls.retry_budget_exhausted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lost_session_is_restarted_before_retry():
+    """Test that a closed connection restarts the runtime and the call succeeds."""
+    with _session([_error(types.CONNECTION_CLOSED, "Connection closed"), OK]) as (session, stdio_mock):
+        async with MCPClient.with_skill_key(skill_key="SKL_test") as client:
+            await client.get_langchain_tools()
+            assert (await client.call_tool("upsert", {}))["isError"] is False
+            assert stdio_mock.call_count == 2
+            assert client.metrics()["counters"]["runtime.restarts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_error_results_only_retried_when_enabled():
+    """Test opt-in retries of isError results."""
+    failed = SimpleNamespace(content=[{"type": "text", "text": "downstream timeout"}], isError=True)
+    with _session([failed, failed, OK]) as (session, _):
+        async with MCPClient.with_skill_key(skill_key="SKL_test") as client:
+            await client.get_langchain_tools()
+            assert (await client.call_tool("read", {}))["isError"] is True
+            client.retry_policy = RetryPolicy(retry_error_results=True)
+            assert (await client.call_tool("read", {}))["isError"] is False
+            assert session.call_tool.await_count == 3
@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+import pytest
+
+from langchain_skilder.errors import RuntimeNotFoundError
+from langchain_skilder import runtime
+from langchain_skilder.mcp_only import MCPClient
+from langchain_skilder.runtime import RUNTIME_PATH_ENV, RuntimeLocator
+
+
+def _package(directory, entry="dist/index.js"):
+    os.makedirs(os.path.join(directory, os.path.dirname(entry)), exist_ok=True)
+    with open(os.path.join(directory, entry), "w") as script:
+        script.write("// runtime\n")
+    with open(os.path.join(directory, "package.json"), "w") as manifest:
+        json.dump({"name": "@skilder-ai/runtime", "bin": {"runtime": entry}}, manifest)
+    return os.path.join(directory, entry)
+
+
+@pytest.fixture(autouse=True)
+def no_runtime_env(monkeypatch):
+    monkeypatch.delenv(RUNTIME_PATH_ENV, raising=False)
+
+
+class TestRuntimeLocator:
+    """Test runtime resolution."""
+
+    def test_missing_runtime_is_not_spawned_through_npx(self, tmp_path):
+        """Test that a missing runtime raises unless the npx fallback is allowed."""
+        with pytest.raises(RuntimeNotFoundError, match=r"install_runtime\('1.2.3'\)"):
+            RuntimeLocator(cache_dir=str(tmp_path)).resolve("1.2.3")
+        locator = RuntimeLocator(cache_dir=str(tmp_path), allow_npx=True)
+        assert locator.resolve("1.2.3") == ("npx", ["@skilder-ai/runtime@1.2.3"])
+
+    def test_override_file_runs_node_directly(self, tmp_path):
+        """Test that an explicit entry script is spawned with node."""
+        entry = _package(str(tmp_path / "pkg"))
+        locator = RuntimeLocator(runtime_path=entry, cache_dir=str(tmp_path), node=sys.executable)
+        assert locator.resolve() == (sys.executable, [entry])
+
+    def test_override_directory_reads_package_json(self, tmp_path):
+        """Test that a package directory resolves to its bin entry."""
+        entry = _package(str(tmp_path / "pkg"))
+        locator = RuntimeLocator(runtime_path=str(tmp_path / "pkg"), node=sys.executable)
+        assert locator.resolve()[1] == [entry]
+
+    def test_env_var_override(self, tmp_path, monkeypatch):
+        """Test that SKILDER_RUNTIME_PATH is honored."""
+        entry = _package(str(tmp_path / "pkg"))
+        monkeypatch.setenv(RUNTIME_PATH_ENV, entry)
+        assert RuntimeLocator(cache_dir=str(tmp_path), node=sys.executable).resolve()[1] == [entry]
+
+    def test_missing_override_fails_fast(self, tmp_path, monkeypatch):
+        """Test that a missing override raises instead of failing at spawn time."""
+        with pytest.raises(RuntimeNotFoundError, match="does not exist"):
+            RuntimeLocator(runtime_path=str(tmp_path / "missing.js")).resolve()
+        monkeypatch.setenv(RUNTIME_PATH_ENV, str(tmp_path))
+        with pytest.raises(RuntimeNotFoundError, match=RUNTIME_PATH_ENV):
+            RuntimeLocator().resolve()
+
+    def test_missing_node_fails_fast(self, tmp_path):
+        """Test that a resolved entry without node raises a clear error."""
+        entry = _package(str(tmp_path / "pkg"))
+        with pytest.raises(RuntimeNotFoundError, match="Node.js"):
+            RuntimeLocator(runtime_path=entry, node="definitely-not-node").resolve()
+
+    def test_cached_install_per_version(self, tmp_path):
+        """Test that a cached install is used for its version only."""
+        locator = RuntimeLocator(cache_dir=str(tmp_path), node=sys.executable)
+        entry = _package(os.path.join(locator.install_dir("1.0.0"), "node_modules", "@skilder-ai", "runtime"))
+        assert locator.resolve("1.0.0") == (sys.executable, [entry])
+        with pytest.raises(RuntimeNotFoundError, match="2.0.0"):
+            locator.resolve("2.0.0")
+
+    def test_resolution_is_memoized(self, tmp_path):
+        """Test that a version is resolved once until cleared."""
+        locator = RuntimeLocator(cache_dir=str(tmp_path), node=sys.executable, allow_npx=True)
+        assert locator.resolve("1.0.0")[0] == "npx"
+        _package(os.path.join(locator.install_dir("1.0.0"), "node_modules", "@skilder-ai", "runtime"))
+        assert locator.resolve("1.0.0")[0] == "npx"
+        locator.clear()
+        assert locator.resolve("1.0.0")[0] == sys.executable
+
+    def test_client_without_runtime_fails_fast(self, tmp_path, monkeypatch):
+        """Test that a client without an installed runtime raises when created."""
+        monkeypatch.setattr(runtime, "_default_locator", RuntimeLocator(cache_dir=str(tmp_path)))
+        with pytest.raises(RuntimeNotFoundError, match="install_runtime"):
+            MCPClient.with_skill_key(skill_key="SKL_test")
+
+
+def test_client_uses_locator(tmp_path):
+    """Test that MCPClient spawns the resolved entry point."""
+    entry = _package(str(tmp_path / "pkg"))
+    locator = RuntimeLocator(runtime_path=entry, node=sys.executable)
+    instance = MCPClient.with_skill_key(skill_key="SKL_test", runtime_locator=locator)
+    assert instance.serverParams.command == sys.executable
+    assert instance.serverParams.args == [entry]
+    assert instance.serverParams.env["SKILL_KEY"] == "SKL_test"
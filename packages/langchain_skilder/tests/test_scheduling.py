@@ -0,0 +1,155 @@
+import asyncio
+import time
+import pytest
+
+from langchain_skilder.loadtest import stub_server_parameters
+from langchain_skilder.mcp_only import MCPClient
+from langchain_skilder.scheduling import CallScheduler
+
+
+async def _admission_order(scheduler, priorities, hold=0.0):
+    """Queue one call per priority behind a held slot and return the admission order."""
+    order = []
+
+    async def call(index, priority):
+        async with scheduler.slot(priority):
+            order.append((index, priority))
+            await asyncio.sleep(hold)
+
+    async with scheduler.slot("default"):
+        tasks = [asyncio.create_task(call(index, priority)) for index, priority in enumerate(priorities)]
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    return order
+
+
+@pytest.mark.asyncio
+async def test_weighted_lanes_share_slots_by_weight():
+    """Test that a busy interactive lane gets 8 slots per background slot."""
+    scheduler = CallScheduler()
+    order = await _admission_order(scheduler, ["background"] * 10 + ["interactive"] * 16)
+
+    priorities = [priority for _, priority in order]
+    assert priorities[:9].count("interactive") == 8
+    assert priorities[:18].count("background") == 2
+    # FIFO within a lane
+    assert [index for index, priority in order if priority == "background"] == list(range(10))
+
+
+@pytest.mark.asyncio
+async def test_lone_lane_gets_all_the_capacity():
+    """Test that a background-only burst is not throttled by idle lanes."""
+    scheduler = CallScheduler(max_concurrent=3)
+    running = []
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        async with scheduler.slot("background"):
+            running.append(1)
+            peak = max(peak, len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+
+    await asyncio.gather(*(call() for _ in range(6)))
+    assert peak == 3
+    assert scheduler.stats()["background"] == {"waiting": 0, "running": 0, "admitted": 6}
+
+
+@pytest.mark.asyncio
+async def test_lane_cap_leaves_slots_to_other_lanes():
+    """Test that a capped lane never holds more than its share of the slots."""
+    scheduler = CallScheduler(max_concurrent=4, lanes={"bulk": {"weight": 8, "max_concurrent": 1}, "chat": {}})
+    seen = {"bulk": 0, "chat": 0}
+    running = {"bulk": 0, "chat": 0}
+
+    async def call(priority):
+        async with scheduler.slot(priority):
+            running[priority] += 1
+            seen[priority] = max(seen[priority], running[priority])
+            await asyncio.sleep(0.01)
+            running[priority] -= 1
+
+    await asyncio.gather(*(call("bulk") for _ in range(5)), *(call("chat") for _ in range(5)))
+    assert seen == {"bulk": 1, "chat": 3}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_its_slot():
+    """Test that cancelling a queued call removes it and frees capacity."""
+    scheduler = CallScheduler()
+    held = scheduler.slot("default")
+    await held.__aenter__()
+    waiter = asyncio.create_task(_enter(scheduler, "interactive"))
+    await asyncio.sleep(0)
+    assert scheduler.stats()["interactive"]["waiting"] == 1
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    await held.__aexit__(None, None, None)
+
+    assert scheduler.stats()["interactive"] == {"waiting": 0, "running": 0, "admitted": 0}
+    await asyncio.wait_for(_enter(scheduler, "background"), 1)
+
+
+async def _enter(scheduler, priority):
+    async with scheduler.slot(priority):
+        pass
+
+
+def test_invalid_configuration_is_rejected():
+    """Test lane and priority validation."""
+    with pytest.raises(ValueError):
+        CallScheduler(max_concurrent=0)
+    with pytest.raises(ValueError):
+        CallScheduler(lanes={"zero": {"weight": 0}})
+    with pytest.raises(ValueError, match="Unknown priority 'urgent'"):
+        CallScheduler().check_priority("urgent")
+    with pytest.raises(ValueError, match="tool_priority"):
+        MCPClient.with_skill_key(skill_key="SKL_test", tool_priority="urgent")
+
+
+@pytest.mark.asyncio
+async def test_client_calls_run_concurrently_and_report_lanes():
+    """Test priority calls against the stub server with two session slots."""
+    client = MCPClient.with_skill_key(skill_key="SKL_test", max_concurrent_calls=2)
+    client.serverParams = stub_server_parameters({"tools": 3})
+    try:
+        await client.start()
+        with pytest.raises(ValueError):
+            await client.call_tool("echo", {}, priority="urgent")
+
+        started = time.monotonic()
+        results = await asyncio.gather(
+            client.call_tool("sleep", {"seconds": 0.3}, priority="background"),
+            client.call_tool("sleep", {"seconds": 0.3}, priority="interactive"),
+        )
+        assert time.monotonic() - started < 0.55
+        assert all(not result["isError"] for result in results)
+
+        lanes = client.metrics()["lanes"]
+        assert lanes["background"]["admitted"] == 1
+        assert lanes["interactive"]["admitted"] == 1
+    finally:
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_tool_priority_comes_from_run_config():
+    """Test that LangChain tools pick their lane from the run config."""
+    client = MCPClient.with_skill_key(skill_key="SKL_test", tool_priority="background")
+    client.serverParams = stub_server_parameters({"tools": 3})
+    try:
+        tools = {tool.name: tool for tool in await client.get_langchain_tools()}
+        echo = tools["echo"]
+
+        assert "hi" in await echo.ainvoke({"message": "hi"})
+        assert "hi" in await echo.ainvoke({"message": "hi"}, config={"configurable": {"skilder_priority": "interactive"}})
+        assert "hi" in await echo.ainvoke({"message": "hi"}, config={"metadata": {"skilder_priority": "interactive"}})
+
+        lanes = client.metrics()["lanes"]
+        assert lanes["background"]["admitted"] == 1
+        assert lanes["interactive"]["admitted"] == 2
+    finally:
+        await client.stop()
@@ -0,0 +1,152 @@
+import os
+import sys
+import time
+import pytest
+from mcp import StdioServerParameters
+
+from langchain_skilder.errors import SkilderRuntimeError
+from langchain_skilder.mcp_only import MCPClient
+from langchain_skilder.startup import StartupProbe, StartupTrace
+
+BOOT_LINES = [
+    "INFO (skilder): [main] Starting with PID 42",
+    "INFO (skilder): [nats] Starting",
+    "INFO (skilder): [auth] Starting",
+    "INFO (skilder): [auth] Handshake response received",
+    "INFO (skilder): [health] Heartbeat started for skill s1",
+    "INFO (skilder): [skill] Starting skill service for s1",
+]
+
+
+def _fake_runtime(lines, then="serve"):
+    """Server parameters for a process writing runtime-like stderr lines.
+
+    `then` is "serve" (continue as the stub MCP server) or "hang".
+    """
+    script = "import sys, time\n"
+    for line in lines:
+        script += f"sys.stderr.write({line!r} + '\\n'); sys.stderr.flush()\n"
+    if then == "serve":
+        script += "from langchain_skilder.loadtest.stub_server import main\nmain(['--tools', '2'])\n"
+    else:
+        script += "time.sleep(60)\n"
+    env = {"PYTHONPATH": os.pathsep.join(sys.path)}
+    return StdioServerParameters(command=sys.executable, args=["-c", script], env=env)
+
+
+def _client(timeout=10.0, **options):
+    return MCPClient.with_skill_key(skill_key="SKL_test", startup_timeout_seconds=timeout, **options)
+
+
+class TestStartupProbe:
+    """Test classification of runtime log lines."""
+
+    def test_phases(self):
+        """Test that boot messages map to phases in order."""
+        probe = StartupProbe()
+        assert [probe.phase(line) for line in BOOT_LINES] == [
+            "runtime_boot", "nats_connecting", "nats_connected", "authenticated", "healthy", "skill_resolving"
+        ]
+        assert probe.phase("INFO (skilder): [skill] Received 3 mcp tools") == "skill_resolved"
+        assert probe.phase("DEBUG (skilder): [tool] something else") is None
+
+    def test_fatal_and_retry(self):
+        """Test fatal error and reconnect detection."""
+        probe = StartupProbe()
+        assert probe.is_fatal("ERROR (skilder): [main] Permanent authentication failure: invalid key")
+        assert not probe.is_fatal("ERROR (skilder): [nats] Error connecting to NATS: refused")
+        assert probe.retry_delay("INFO (skilder): [main] Connection failed. Attempt 1. Waiting 5234.5ms before reconnecting...") == 5.2345
+        assert probe.retry_delay("INFO (skilder): [main] Connection failed. Attempt 2. Waiting 10000ms before reconnecting...") == 10.0
+
+    def test_custom_patterns(self):
+        """Test that patterns are configurable."""
+        probe = StartupProbe(phase_patterns=[(r"booted", "boot")], fatal_patterns=[r"boom"], retry_pattern=None)
+        assert probe.phase("app booted") == "boot"
+        assert probe.is_fatal("boom")
+        assert probe.retry_delay("Connection failed. Attempt 1. Waiting 10ms before reconnecting") is None
+
+
+class TestStartupTrace:
+    """Test the startup trace."""
+
+    def test_marks_durations_and_dict(self):
+        """Test that phases keep their first timestamp and durations chain."""
+        trace = StartupTrace()
+        trace.mark("a", trace.origin + 0.5)
+        trace.mark("b", trace.origin + 1.25)
+        trace.mark("a", trace.origin + 2.0)
+        trace.finish("ready")
+        assert trace.durations() == {"spawn": 0.0, "a": 0.5, "b": 0.75}
+        assert trace.last_phase == "b"
+        data = trace.to_dict()
+        assert data["outcome"] == "ready"
+        assert [phase["name"] for phase in data["phases"]] == ["spawn", "a", "b"]
+        assert data["phases"][2]["at_seconds"] == 1.25
+
+
+@pytest.mark.asyncio
+async def test_successful_startup_is_traced_and_in_metrics():
+    """Test that runtime and client phases are recorded for a healthy start."""
+    instance = _client()
+    instance.serverParams = _fake_runtime(BOOT_LINES)
+    try:
+        await instance.start()
+        trace = instance.startup_trace
+        assert trace.outcome == "ready"
+        names = [name for name, _ in sorted(trace.phases, key=lambda phase: phase[1])]
+        assert names[0] == "spawn" and names[-1] == "ready"
+        assert {"process_spawned", "session_initialized", "runtime_boot", "authenticated", "healthy"} <= set(names)
+        metrics = instance.metrics()
+        assert metrics["counters"]["startup.ready"] == 1
+        assert metrics["timings"]["startup.total"]["count"] == 1
+        assert "startup.phase.session_initialized" in metrics["timings"]
+        assert metrics["startup"]["outcome"] == "ready"
+    finally:
+        await instance.stop()
+
+
+@pytest.mark.asyncio
+async def test_fatal_error_fails_before_timeout():
+    """Test that a permanent auth failure is reported immediately."""
+    instance = _client(timeout=30.0)
+    instance.serverParams = _fake_runtime(
+        BOOT_LINES[:3] + ["ERROR (skilder): [main] Permanent authentication failure: invalid skill key"], then="hang"
+    )
+    started = time.monotonic()
+    with pytest.raises(SkilderRuntimeError) as info:
+        await instance.start()
+    assert time.monotonic() - started < 10.0
+    assert "Permanent authentication failure" in str(info.value)
+    assert instance.startup_trace.outcome == "failed"
+    assert "nats_connected" in dict(instance.startup_trace.phases)
+    assert instance.metrics()["counters"]["startup.failed"] == 1
+    assert instance._runner_task is None
+
+
+@pytest.mark.asyncio
+async def test_reconnect_beyond_budget_fails_fast():
+    """Test that a retry scheduled after the timeout aborts startup early."""
+    instance = _client(timeout=30.0)
+    instance.serverParams = _fake_runtime([
+        "ERROR (skilder): [nats] Error connecting to NATS: ECONNREFUSED",
+        "INFO (skilder): [main] Connection failed. Attempt 1. Waiting 40000ms before reconnecting...",
+    ], then="hang")
+    started = time.monotonic()
+    with pytest.raises(SkilderRuntimeError) as info:
+        await instance.start()
+    assert time.monotonic() - started < 10.0
+    assert "retries in 40.0s" in str(info.value)
+    assert "ECONNREFUSED" in str(info.value)
+    assert "reconnecting" in dict(instance.startup_trace.phases)
+
+
+@pytest.mark.asyncio
+async def test_timeout_reports_last_phase():
+    """Test that a timeout names the phase the runtime was stuck in."""
+    instance = _client(timeout=1.5)
+    instance.serverParams = _fake_runtime(BOOT_LINES[:2], then="hang")
+    with pytest.raises(SkilderRuntimeError) as info:
+        await instance.start()
+    assert "Last startup phase: nats_connecting" in str(info.value)
+    assert instance.startup_trace.outcome == "timeout"
+    assert instance.metrics()["counters"]["startup.timeout"] == 1
@@ -0,0 +1,79 @@
+import logging
+import subprocess
+import sys
+import time
+import pytest
+from mcp import StdioServerParameters
+
+from langchain_skilder.errors import SkilderRuntimeError
+from langchain_skilder.mcp_only import MCPClient
+from langchain_skilder.stderr import StderrCapture
+
+
+def _wait_eof(capture, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not capture.eof and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert capture.eof
+
+
+class TestStderrCapture:
+    """Test draining a child process stderr."""
+
+    def test_heavy_output_never_blocks_child_and_keeps_bounded_tail(self):
+        """Test that a child writing far more than a pipe buffer exits promptly."""
+        capture = StderrCapture(max_lines=5, forward_to=None)
+        errlog = capture.open()
+        process = subprocess.Popen(
+            [sys.executable, "-c", "import sys\nfor i in range(20000): sys.stderr.write(f'line {i} ' + 'x' * 100 + '\\n')"],
+            stderr=errlog,
+        )
+        capture.attached()
+        assert process.wait(timeout=20) == 0
+        _wait_eof(capture)
+        assert capture.lines_total == 20000
+        tail = capture.tail()
+        assert len(tail) == 5
+        assert tail[-1].startswith("line 19999 ")
+        capture.close()
+
+    def test_strips_ansi_and_forwards_with_level(self, caplog):
+        """Test ANSI removal and level detection of forwarded lines."""
+        capture = StderrCapture(forward_to="test.runtime")
+        with caplog.at_level(logging.DEBUG, logger="test.runtime"):
+            capture.feed("\x1b[32mINFO\x1b[39m (skilder): [nats] Starting")
+            capture.feed("[12:00] ERROR (skilder): [auth] Failed to handshake")
+            capture.feed("   ")
+        assert capture.tail() == ["INFO (skilder): [nats] Starting", "[12:00] ERROR (skilder): [auth] Failed to handshake"]
+        assert [r.levelno for r in caplog.records] == [logging.INFO, logging.ERROR]
+
+    def test_forwarding_is_rate_limited(self, caplog):
+        """Test that a log storm is suppressed and reported."""
+        capture = StderrCapture(forward_to="test.storm", max_log_lines_per_second=10)
+        with caplog.at_level(logging.INFO, logger="test.storm"):
+            for i in range(1000):
+                capture.feed(f"line {i}")
+        assert capture.lines_total == 1000
+        assert len(caplog.records) <= 12
+        assert capture.lines_suppressed >= 980
+
+    def test_truncates_long_lines(self):
+        """Test that oversized lines are truncated."""
+        capture = StderrCapture(forward_to=None, max_line_length=10)
+        capture.feed("y" * 50)
+        assert capture.tail() == ["y" * 10 + "..."]
+
+
+@pytest.mark.asyncio
+async def test_startup_failure_includes_stderr_tail():
+    """Test that a runtime crashing at startup reports its last stderr lines."""
+    instance = MCPClient.with_skill_key(skill_key="SKL_test", startup_timeout_seconds=10)
+    instance.serverParams = StdioServerParameters(
+        command=sys.executable,
+        args=["-c", "import sys; sys.stderr.write('ERROR (skilder): [nats] connection refused\\n'); sys.exit(1)"],
+    )
+    with pytest.raises(SkilderRuntimeError) as info:
+        await instance.start()
+    assert "connection refused" in str(info.value)
+    assert info.value.stderr_tail == ["ERROR (skilder): [nats] connection refused"]
+    assert instance._started is False
@@ -0,0 +1,112 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, List
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+
+from langchain_skilder.coalescing import CallCoalescer
+from langchain_skilder.loadtest import stub_server_parameters
+from langchain_skilder.mcp_only import MCPClient
+from langchain_skilder.streaming import EarlyToolDispatcher
+from langchain_skilder.tool_node import SkilderToolNode
+
+
+class _StreamingModel(BaseChatModel):
+    """Chat model streaming scripted tool call chunks, with a pause between them."""
+
+    chunks: List[Any]
+    pause_seconds: float = 0.0
+    fail_at_end: bool = False
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        raise NotImplementedError
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        for piece in self.chunks:
+            await asyncio.sleep(self.pause_seconds)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=[piece]))
+            if run_manager is not None:
+                await run_manager.on_llm_new_token("", chunk=chunk)
+            yield chunk
+        if self.fail_at_end:
+            raise RuntimeError("model failed")
+
+
+def _call_chunks(index, call_id, name, args):
+    """Split a call into a first chunk (id and name) and argument fragments."""
+    head = {"index": index, "id": call_id, "name": name, "args": args[:5], "type": "tool_call_chunk"}
+    rest = [{"index": index, "id": None, "name": None, "args": args[i:i + 5], "type": "tool_call_chunk"} for i in range(5, len(args), 5)]
+    return [head] + rest
+
+
+def _stub_client():
+    client = MCPClient.with_skill_key(skill_key="SKL_test", max_concurrent_calls=4)
+    client.serverParams = stub_server_parameters({"tools": 3})
+    return client
+
+
+@pytest.mark.asyncio
+async def test_calls_start_while_the_model_streams():
+    """Test that complete calls run during generation and are claimed by the tool node."""
+    client = _stub_client()
+    dispatcher = EarlyToolDispatcher(client)
+    chunks = (
+        _call_chunks(0, "call_0", "sleep", '{"seconds": 0.4}')
+        + _call_chunks(1, "call_1", "echo", '{"message": "early"}')
+        + _call_chunks(2, "call_2", "fail", "{}")  # not annotated: not started early
+    )
+    model = _StreamingModel(chunks=chunks, pause_seconds=0.05)
+    try:
+        await client.get_langchain_tools()
+        started = time.monotonic()
+        message = await model.ainvoke("list", config={"callbacks": [dispatcher]})
+        assert [call["id"] for call in message.tool_calls] == ["call_0", "call_1", "call_2"]
+        assert dispatcher.stats()["dispatched"] == 2
+
+        results = await SkilderToolNode(client).ainvoke(message)
+        elapsed = time.monotonic() - started
+        assert [result.status for result in results] == ["success", "success", "error"]
+        assert '{"seconds": 0.4}' in results[0].content and '{"message": "early"}' in results[1].content
+        # The sleep overlapped the rest of the stream (about 0.45 s)
+        assert elapsed < 0.4 + len(chunks) * 0.05
+        assert len(client.tracer.spans()) == 3
+        assert client.metrics()["early_dispatch"] == {
+            "dispatched": 2, "claimed": 2, "discarded": 0, "expired": 0, "pending": 0,
+        }
+    finally:
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_unconfirmed_and_unclaimed_calls_are_cancelled():
+    """Test reconciliation with a failed model run and the claim deadline."""
+    client = _stub_client()
+    dispatcher = EarlyToolDispatcher(client, dispatch="all", ttl_seconds=0.3)
+    try:
+        await client.get_langchain_tools()
+        failing = _StreamingModel(chunks=_call_chunks(0, "call_0", "sleep", '{"seconds": 5}'), fail_at_end=True)
+        with pytest.raises(RuntimeError):
+            await failing.ainvoke("list", config={"callbacks": [dispatcher]})
+        assert dispatcher.stats()["discarded"] == 1
+
+        model = _StreamingModel(chunks=_call_chunks(0, "call_1", "sleep", '{"seconds": 5}'))
+        await model.ainvoke("list", config={"callbacks": [dispatcher]})
+        assert dispatcher.stats()["pending"] == 1
+        early = dispatcher._pending[CallCoalescer.key("sleep", {"seconds": 5})][0].task
+        # Expired by its own timer, with no further dispatch or claim
+        await asyncio.sleep(0.5)
+        assert early.cancelled()
+        assert dispatcher.stats()["expired"] == 1 and dispatcher.stats()["pending"] == 0
+        assert dispatcher.claim("sleep", {"seconds": 5}) is None
+
+        with pytest.raises(ValueError):
+            EarlyToolDispatcher(client, dispatch="never")
+    finally:
+        await client.stop()
@@ -0,0 +1,131 @@
+import time
+from types import SimpleNamespace
+import pytest
+from unittest.mock import AsyncMock, patch
+import mcp.types as types
+
+from langchain_skilder.mcp_only import MCPClient
+from langchain_skilder.tool_index import ToolIndex, tool_signature
+
+
+def _tool(name, description="", properties=None):
+    schema = {"type": "object", "properties": properties or {}}
+    return SimpleNamespace(name=name, description=description, inputSchema=schema)
+
+
+CATALOG = [
+    _tool("create_issue", "Create a new issue in a GitHub repository", {"title": {"type": "string"}, "body": {"type": "string"}}),
+    _tool("list_directory", "List the files of a directory", {"path": {"type": "string", "description": "Directory path"}}),
+    _tool("readFile", "Read the complete contents of a file", {"path": {"type": "string"}}),
+    _tool("send_email", "Send an email message", {"recipient": {"type": "string"}, "subject": {"type": "string"}}),
+]
+
+
+class TestToolIndexBM25:
+    """Test BM25 ranking over tool metadata."""
+
+    def test_search_ranks_by_relevance(self):
+        """Test that the best matching tool comes first."""
+        index = ToolIndex()
+        index.update(CATALOG)
+        assert index.search("open a github issue", k=2)[0] == "create_issue"
+        assert index.search("read file", k=1) == ["readFile"]
+
+    def test_search_matches_schema_fields(self):
+        """Test that schema property names are searchable."""
+        index = ToolIndex()
+        index.update(CATALOG)
+        assert index.search("recipient", k=3) == ["send_email"]
+
+    def test_search_respects_k_and_skips_unrelated(self):
+        """Test top-k truncation and that unrelated tools are not returned."""
+        index = ToolIndex()
+        index.update(CATALOG)
+        assert len(index.search("file directory path", k=1)) == 1
+        assert index.search("zebra", k=5) == []
+        assert index.search("file", k=0) == []
+
+    def test_update_is_incremental(self):
+        """Test that only added, changed and removed tools are reported."""
+        index = ToolIndex()
+        assert index.update(CATALOG)["added"] == [t.name for t in CATALOG]
+
+        changed = _tool("send_email", "Send an email with attachments", {"recipient": {"type": "string"}})
+        delta = index.update([CATALOG[0], CATALOG[1], changed, _tool("search_web", "Search the web")])
+        assert delta == {"added": ["search_web"], "changed": ["send_email"], "removed": ["readFile"]}
+        assert "readFile" not in index
+        assert len(index) == 4
+        assert index.search("attachments", k=1) == ["send_email"]
+        assert index.search("contents", k=5) == []
+
+    def test_signature_ignores_key_order(self):
+        """Test that schema key order does not change the signature."""
+        a = SimpleNamespace(name="t", description="d", inputSchema={"a": 1, "b": 2})
+        b = SimpleNamespace(name="t", description="d", inputSchema={"b": 2, "a": 1})
+        assert tool_signature(a) == tool_signature(b)
+
+    def test_search_is_sub_millisecond_for_large_catalogs(self):
+        """Test query latency over a few hundred tools."""
+        index = ToolIndex()
+        index.update([
+            _tool(f"tool_{i}", f"Operation number {i} on resource kind{i % 17}", {f"field{i % 7}": {"type": "string"}})
+            for i in range(500)
+        ])
+        timings = []
+        for _ in range(5):
+            started = time.perf_counter()
+            for _ in range(100):
+                index.search("resource kind3 field2", k=10)
+            timings.append((time.perf_counter() - started) / 100)
+        assert min(timings) < 0.001
+
+
+class TestToolIndexEmbeddings:
+    """Test ranking with a pluggable embedding function."""
+
+    def test_embed_fn_ranks_by_cosine_and_only_embeds_changes(self):
+        """Test cosine ranking and incremental embedding."""
+        vocabulary = ["issue", "file", "email"]
+        calls = []
+
+        def embed(texts):
+            calls.append(list(texts))
+            return [[float(word in text.lower()) for word in vocabulary] for text in texts]
+
+        index = ToolIndex(embed_fn=embed)
+        index.update(CATALOG)
+        assert len(calls[0]) == len(CATALOG)
+        assert index.search("email", k=1) == ["send_email"]
+
+        index.update(CATALOG + [_tool("archive_email", "Archive an email")])
+        assert calls[-1] == ["archive_email\nArchive an email"]
+
+
+@pytest.mark.asyncio
+async def test_get_relevant_tools_uses_cached_catalog_and_refreshes_on_list_changed():
+    """Test top-k selection on MCPClient and invalidation via notification."""
+    mock_session = AsyncMock()
+    mock_session.initialize = AsyncMock()
+    mock_session.list_tools = AsyncMock(return_value=SimpleNamespace(tools=list(CATALOG)))
+
+    stdio_ctx = AsyncMock()
+    stdio_ctx.__aenter__.return_value = (AsyncMock(), AsyncMock())
+    stdio_ctx.__aexit__.return_value = None
+    client_ctx = AsyncMock()
+    client_ctx.__aenter__.return_value = mock_session
+    client_ctx.__aexit__.return_value = None
+
+    with patch("langchain_skilder.mcp_only.stdio_client", return_value=stdio_ctx), \
+         patch("langchain_skilder.mcp_only.ClientSession", return_value=client_ctx):
+        instance = MCPClient.with_skill_key(skill_key="SKL_test")
+        tools = await instance.get_relevant_tools("send an email", k=1)
+        assert [t.name for t in tools] == ["send_email"]
+        await instance.get_langchain_tools()
+        assert mock_session.list_tools.await_count == 1
+
+        mock_session.list_tools.return_value = SimpleNamespace(tools=CATALOG + [_tool("email_digest", "Summarize email inbox")])
+        await instance._handle_message(types.ServerNotification(types.ToolListChangedNotification()))
+        tools = await instance.get_relevant_tools("email inbox", k=1)
+        assert [t.name for t in tools] == ["email_digest"]
+        assert mock_session.list_tools.await_count == 2
+        await instance.stop()
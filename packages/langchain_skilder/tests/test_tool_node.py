@@ -0,0 +1,129 @@
+import time
+import pytest
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from langchain_skilder.coalescing import CallCoalescer
+from langchain_skilder.loadtest import stub_server_parameters
+from langchain_skilder.mcp_only import MCPClient
+from langchain_skilder.tool_node import SkilderToolNode
+
+
+def _stub_client(**options):
+    client = MCPClient.with_skill_key(skill_key="SKL_test", **options)
+    client.serverParams = stub_server_parameters({"tools": 4})
+    return client
+
+
+def _ai(*calls):
+    return AIMessage(content="", tool_calls=[
+        {"name": name, "args": args, "id": f"call_{index}", "type": "tool_call"}
+        for index, (name, args) in enumerate(calls)
+    ])
+
+
+@pytest.mark.asyncio
+async def test_calls_run_concurrently_and_answer_in_order():
+    """Test that a step costs about its slowest call on a default client and keeps the call order."""
+    client = _stub_client()
+    node = SkilderToolNode(client)
+    try:
+        await client.start()
+        started = time.monotonic()
+        state = {"messages": [HumanMessage("go"), _ai(
+            ("sleep", {"seconds": 0.3}),
+            ("sleep", {"seconds": 0.2}),
+            ("echo", {"message": "hi"}),
+        )]}
+        result = await node.ainvoke(state)
+        elapsed = time.monotonic() - started
+
+        messages = result["messages"]
+        assert [message.tool_call_id for message in messages] == ["call_0", "call_1", "call_2"]
+        assert all(message.status == "success" for message in messages)
+        assert '"message": "hi"' in messages[2].content
+        assert elapsed < 0.45
+
+        # A larger batch still costs about one call
+        started = time.monotonic()
+        await node.ainvoke([_ai(*[("sleep", {"seconds": 0.2, "n": n}) for n in range(8)])])
+        assert time.monotonic() - started < 0.35
+    finally:
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_invalid_calls_are_answered_without_dispatch():
+    """Test up-front validation of tool names and arguments."""
+    client = _stub_client()
+    node = SkilderToolNode(client)
+    try:
+        messages = await node.ainvoke([_ai(
+            ("missing", {}),
+            ("echo", {"message": 42}),
+            ("fail", {}),
+        )])
+        assert [message.status for message in messages] == ["error", "error", "error"]
+        assert "not a valid tool" in messages[0].content
+        assert "invalid arguments for echo" in messages[1].content
+        assert messages[2].content.startswith("Error executing fail")
+        # Only the valid call reached the runtime
+        assert [span.tool_name for span in client.tracer.spans()] == ["fail"]
+
+        with pytest.raises(ValueError, match="not a valid tool"):
+            await SkilderToolNode(client, handle_errors=False).ainvoke(_ai(("missing", {})))
+    finally:
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_identical_calls_are_coalesced_by_the_client():
+    """Test that identical calls of read-only tools share one request through the client's coalescer."""
+    client = _stub_client(coalescer=CallCoalescer())
+    try:
+        calls = _ai(
+            ("echo", {"message": "a"}),
+            ("echo", {"message": "a"}),
+            ("echo", {"message": "b"}),
+            ("tool_0", {"value": "x"}),
+            ("tool_0", {"value": "x"}),
+        )
+        messages = await SkilderToolNode(client).ainvoke(calls)
+        assert [message.tool_call_id for message in messages] == [f"call_{index}" for index in range(5)]
+        assert messages[0].content == messages[1].content
+        # echo is read-only (coalesced); tool_0 is not annotated (both sent)
+        assert len(client.tracer.spans()) == 4
+        assert client.metrics()["coalescing"]["coalesced"] == 1
+        assert "tool_node.coalesced" not in client.metrics()["counters"]
+    finally:
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_identical_calls_are_coalesced_without_a_client_coalescer():
+    """Test that the node shares identical read-only calls when the client has no coalescer."""
+    client = _stub_client()
+    assert client.coalescer is None
+    node = SkilderToolNode(client)
+    try:
+        calls = _ai(
+            ("echo", {"message": "a"}),
+            ("echo", {"message": "a"}),
+            ("tool_0", {"value": "x"}),
+            ("tool_0", {"value": "x"}),
+        )
+        messages = await node.ainvoke(calls)
+        assert messages[0].content == messages[1].content
+        assert [message.status for message in messages] == ["success"] * 4
+        # echo is read-only (one request); tool_0 is not annotated (both sent)
+        assert len(client.tracer.spans()) == 3
+        assert node.coalescer.stats()["coalesced"] == 1
+    finally:
+        await client.stop()
+
+
+def test_invalid_configuration():
+    """Test input without an AIMessage."""
+    client = _stub_client()
+    with pytest.raises(ValueError, match="No AIMessage"):
+        SkilderToolNode(client)._tool_calls({"messages": [HumanMessage("hi")]})
@@ -0,0 +1,120 @@
+import pytest
+
+from langchain_skilder.loadtest import stub_server_parameters
+from langchain_skilder.mcp_only import MCPClient
+from langchain_skilder.replay import SessionRecorder, load_session
+from langchain_skilder.tracing import (
+    REQUEST_ID_META_KEY,
+    CallTracer,
+    parse_traceparent,
+    trace_context,
+)
+
+PARENT = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+
+def _stub_client(**options):
+    client = MCPClient.with_skill_key(skill_key="SKL_test", **options)
+    client.serverParams = stub_server_parameters({"tools": 3})
+    return client
+
+
+def _sent_calls(path):
+    return [
+        message["params"] for _, direction, message in load_session(path)
+        if direction == "c" and message.get("method") == "tools/call"
+    ]
+
+
+def test_parse_traceparent():
+    """Test W3C traceparent validation."""
+    assert parse_traceparent(PARENT) == ("0af7651916cd43dd8448eb211c80319c", "b7ad6b7169203331", "01")
+    assert parse_traceparent("00-" + "0" * 32 + "-b7ad6b7169203331-01") is None
+    assert parse_traceparent("ff-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01") is None
+    assert parse_traceparent("not a traceparent") is None
+    with pytest.raises(ValueError):
+        with trace_context("00-xyz"):
+            pass
+
+
+def test_span_parent_resolution():
+    """Test explicit, ambient and missing parent contexts."""
+    tracer = CallTracer()
+
+    root = tracer.start_span("echo")
+    assert root.parent_span_id is None
+    assert parse_traceparent(root.traceparent)[0] == root.trace_id
+
+    with trace_context(PARENT, "vendor=1"):
+        child = tracer.start_span("echo", request_id="req-1")
+    assert child.trace_id == "0af7651916cd43dd8448eb211c80319c"
+    assert child.parent_span_id == "b7ad6b7169203331"
+    assert child.meta() == {"traceparent": child.traceparent, "tracestate": "vendor=1", REQUEST_ID_META_KEY: "req-1"}
+
+    explicit = tracer.start_span("echo", traceparent="00-0af7651916cd43dd8448eb211c80319c-00f067aa0ba902b7-00")
+    assert explicit.parent_span_id == "00f067aa0ba902b7"
+    assert explicit.traceparent.endswith("-00")
+    with pytest.raises(ValueError):
+        tracer.start_span("echo", traceparent="00-bad")
+
+
+def test_exporter_receives_finished_spans():
+    """Test span buffering and that exporter failures are contained."""
+    exported = []
+    tracer = CallTracer(exporter=exported.append, max_spans=2)
+    for _ in range(3):
+        tracer.end_span(tracer.start_span("echo"), "ok")
+    assert len(exported) == 3
+    assert tracer.spans() == exported[1:]
+    assert exported[0].to_dict()["duration_seconds"] >= 0
+
+    def broken(span):
+        raise RuntimeError("exporter down")
+
+    CallTracer(exporter=broken).end_span(CallTracer().start_span("echo"), "ok")
+
+
+@pytest.mark.asyncio
+async def test_call_tool_propagates_trace_context_in_meta(tmp_path):
+    """Test that the request `_meta` carries the call span and request id."""
+    path = str(tmp_path / "session.jsonl")
+    client = _stub_client(recorder=SessionRecorder(path))
+    try:
+        await client.call_tool("echo", {"message": "hi"}, traceparent=PARENT, request_id="req-42")
+        with trace_context(PARENT):
+            await client.call_tool("fail", {})
+        with pytest.raises(ValueError):
+            await client.call_tool("echo", {}, traceparent="garbage")
+    finally:
+        await client.stop()
+
+    first, second = client.tracer.spans()
+    meta = _sent_calls(path)[0]["_meta"]
+    assert meta["traceparent"] == first.traceparent
+    assert meta[REQUEST_ID_META_KEY] == "req-42"
+    assert first.parent_span_id == "b7ad6b7169203331"
+    assert first.status == "ok"
+    assert first.start_time_ns <= first.sent_time_ns <= first.end_time_ns
+    assert first.attributes["priority"] == "default"
+
+    assert _sent_calls(path)[1]["_meta"] == {"traceparent": second.traceparent}
+    assert second.trace_id == first.trace_id
+    assert second.status == "tool_error"
+
+
+@pytest.mark.asyncio
+async def test_tool_run_config_sets_parent_and_request_id():
+    """Test that LangChain tools read `traceparent` and `skilder_request_id` from the run config."""
+    client = _stub_client()
+    try:
+        tools = {tool.name: tool for tool in await client.get_langchain_tools()}
+        await tools["echo"].ainvoke(
+            {"message": "hi"},
+            config={"configurable": {"traceparent": PARENT}, "metadata": {"skilder_request_id": "req-7"}},
+        )
+    finally:
+        await client.stop()
+
+    span = client.tracer.spans()[-1]
+    assert span.parent_span_id == "b7ad6b7169203331"
+    assert span.request_id == "req-7"